@@ -1 +1,7 @@
 from .design_agent import DesignAgent
+from .session_store import SessionStore, InMemorySessionStore, RedisSessionStore, create_session_store
+from .history import HistoryCompactor
+from .metrics import UsageMetrics
+from .tool_cache import ToolResultCache, get_tool_cache
+from .intent_router import IntentRouter
+from .response_cache import ResponseCache
@@ -4,29 +4,89 @@ AI 설계 에이전트 - Claude 기반 가구 설계 어시스턴트
 import os
 import json
 import uuid
-from typing import Dict, Any, List, Optional
-from anthropic import Anthropic
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple, AsyncIterator
+
+import httpx
+from anthropic import AsyncAnthropic
 
 from tools.dimension_calc import DimensionCalculator
+from tools.distribution_table import get_distribution_table
+from tools.calc_cache import get_calc_cache
 from tools.fridge_lookup import FridgeLookup
 from tools.module_optimizer import ModuleOptimizer
 from data.fridge_data import CATEGORIES
+from agents.session_store import SessionStore, create_session_store
+from agents.history import HistoryCompactor, CONTEXT_HEADER, QUESTION_HEADER
+from agents.metrics import UsageMetrics
+from agents.tool_cache import get_tool_cache
+from agents.intent_router import IntentRouter
+from agents.response_cache import ResponseCache
+
+CACHE_CONTROL = {"type": "ephemeral"}
+FRIDGE_TOOLS = frozenset({"search_fridge", "recommend_fridge", "calculate_fridge_layout"})
+RESPONSE_CACHE_MAX_MESSAGE = 200  # 이보다 긴 질문은 응답 캐시 대상 아님
 
 
 class DesignAgent:
     """AI 기반 가구 설계 에이전트"""
 
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, session_store: SessionStore = None):
         self.api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
-        self.client = Anthropic(api_key=self.api_key) if self.api_key else None
+        self.model = os.getenv("ANTHROPIC_MODEL", "claude-sonnet-4-20250514")
+
+        # 비동기 클라이언트 + 공유 커넥션 풀 (동시 대화가 이벤트 루프를 막지 않도록)
+        self.http_client: Optional[httpx.AsyncClient] = None
+        self.client: Optional[AsyncAnthropic] = None
+        if self.api_key:
+            max_connections = int(os.getenv("ANTHROPIC_MAX_CONNECTIONS", "100"))
+            self.http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections
+                ),
+                timeout=httpx.Timeout(float(os.getenv("ANTHROPIC_TIMEOUT", "120")), connect=10.0)
+            )
+            self.client = AsyncAnthropic(api_key=self.api_key, http_client=self.http_client)
+
+        # 도구 루프 최대 라운드 수 / 도구 동시 실행 워커 수
+        self.max_tool_rounds = int(os.getenv("AGENT_MAX_TOOL_ROUNDS", "5"))
+        self.tool_executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv("AGENT_TOOL_WORKERS", "8")),
+            thread_name_prefix="design-tool"
+        )
 
         # 도구 초기화
-        self.calculator = DimensionCalculator()
+        self.calculator = DimensionCalculator(
+            lookup_table=get_distribution_table(),
+            cache=get_calc_cache()
+        )
         self.fridge_lookup = FridgeLookup()
         self.optimizer = ModuleOptimizer()
+        self.tool_cache = get_tool_cache()
+
+        # 로컬 의도 라우터 (확실한 요청은 LLM 호출 생략)
+        use_router = os.getenv("INTENT_ROUTER", "true").lower() in ("1", "true", "yes")
+        self.intent_router: Optional[IntentRouter] = IntentRouter() if use_router else None
 
-        # 세션 저장소
-        self.sessions: Dict[str, Dict] = {}
+        # 응답 캐시 (새 세션의 반복 질문은 LLM 호출 생략, 유사도 0이면 정확 일치만)
+        use_response_cache = os.getenv("RESPONSE_CACHE", "true").lower() in ("1", "true", "yes")
+        self.response_cache: Optional[ResponseCache] = ResponseCache(
+            maxsize=int(os.getenv("RESPONSE_CACHE_SIZE", "512")),
+            ttl=float(os.getenv("RESPONSE_CACHE_TTL_SEC", "3600")),
+            similarity=float(os.getenv("RESPONSE_CACHE_SIMILARITY", "0"))
+        ) if use_response_cache else None
+
+        # 세션 저장소 (메모리 / Redis)
+        self.session_store = session_store or create_session_store()
+
+        # 히스토리 압축 (전송 토큰 예산 / 원문 유지할 최근 턴 수)
+        self.history = HistoryCompactor(
+            budget=int(os.getenv("HISTORY_TOKEN_BUDGET", "8000")),
+            keep_turns=int(os.getenv("HISTORY_KEEP_TURNS", "3"))
+        )
 
         # 시스템 프롬프트
         self.system_prompt = """당신은 '다담 AI'입니다. 한국의 맞춤 가구 설계 전문 AI 어시스턴트입니다.
@@ -86,7 +146,7 @@ class DesignAgent:
                         },
                         "query": {
                             "type": "string",
-                            "description": "검색어 (모델명, 카테고리 등)"
+                            "description": "검색어 (모델명, 카테고리 등, 띄어쓰기/오타 허용)"
                         },
                         "max_width": {
                             "type": "number",
@@ -117,6 +177,10 @@ class DesignAgent:
                         "include_tall": {
                             "type": "boolean",
                             "description": "키큰장 포함 여부"
+                        },
+                        "top_k": {
+                            "type": "integer",
+                            "description": "추천 개수 (기본 5)"
                         }
                     },
                     "required": ["total_width"]
@@ -174,6 +238,44 @@ class DesignAgent:
             }
         ]
 
+        # 프롬프트 캐시: 고정 접두어(도구 정의 → 시스템 프롬프트) 끝에 캐시 중단점
+        self.prompt_cache = os.getenv("PROMPT_CACHE", "true").lower() in ("1", "true", "yes")
+        if self.prompt_cache:
+            self.request_tools = self.tools[:-1] + [{**self.tools[-1], "cache_control": CACHE_CONTROL}]
+            self.request_system = [{"type": "text", "text": self.system_prompt, "cache_control": CACHE_CONTROL}]
+        else:
+            self.request_tools = self.tools
+            self.request_system = self.system_prompt
+
+        # 토큰 사용량 / 캐시 적중 지표
+        self.metrics = UsageMetrics()
+
+    async def _run_tool(self, tool_name: str, tool_input: Dict) -> Tuple[Dict, str]:
+        """도구 비동기 실행 (계산은 도구 워커 풀에서 수행해 이벤트 루프를 막지 않음)"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.tool_executor, self._execute_tool_cached, tool_name, tool_input)
+
+    async def _run_tools(self, blocks: List[Dict]) -> List[Tuple[Dict, str]]:
+        """한 턴의 도구 호출들을 동시에 실행 (결과는 블록 순서대로)"""
+        return list(await asyncio.gather(*(self._run_tool(b["name"], b["input"]) for b in blocks)))
+
+    def _execute_tool_cached(self, tool_name: str, tool_input: Dict) -> Tuple[Dict, str]:
+        """
+        도구 실행 (공유 결과 캐시 경유)
+
+        Returns:
+            (결과 dict, tool_result용 JSON 문자열)
+        """
+        # 냉장고 도구는 카탈로그가, 치수 도구는 계산 상수가 바뀌면 다시 계산
+        if tool_name in FRIDGE_TOOLS:
+            version = self.fridge_lookup.snapshot.checksum
+        else:
+            version = self.calculator.fingerprint
+        return self.tool_cache.get_or_compute(
+            tool_name, tool_input, version,
+            lambda: self._execute_tool(tool_name, tool_input)
+        )
+
     def _execute_tool(self, tool_name: str, tool_input: Dict) -> Dict:
         """도구 실행"""
         if tool_name == "calculate_modules":
@@ -215,7 +317,8 @@ class DesignAgent:
                 total_width=tool_input["total_width"],
                 total_height=tool_input.get("total_height", 2300),
                 brand=tool_input.get("brand"),
-                include_tall=tool_input.get("include_tall", False)
+                include_tall=tool_input.get("include_tall", False),
+                top_k=tool_input.get("top_k", 5)
             )
             return {
                 "recommendations": [
@@ -255,34 +358,26 @@ class DesignAgent:
 
         return {"error": f"알 수 없는 도구: {tool_name}"}
 
-    def chat(
+    async def _prepare_session(
         self,
         message: str,
         session_id: str = None,
         context: Dict = None
-    ) -> Dict[str, Any]:
+    ) -> Tuple[str, Dict, int]:
         """
-        사용자 메시지 처리
-
-        Args:
-            message: 사용자 메시지
-            session_id: 세션 ID (없으면 생성)
-            context: 현재 설계 상태 (치수, 모듈 등)
+        세션 준비 (조회/생성, 컨텍스트 갱신) 후 사용자 메시지를 히스토리에 추가
 
         Returns:
-            AI 응답 및 액션
+            (세션 ID, 세션, 저장소에 이미 있는 메시지 수)
         """
         # 세션 관리
         if not session_id:
             session_id = str(uuid.uuid4())
 
-        if session_id not in self.sessions:
-            self.sessions[session_id] = {
-                "messages": [],
-                "context": context or {}
-            }
-
-        session = self.sessions[session_id]
+        session = await self.session_store.load(session_id)
+        if session is None:
+            session = await self.session_store.create(session_id, context)
+        saved = len(session["messages"])
 
         # 컨텍스트 업데이트
         if context:
@@ -293,82 +388,110 @@ class DesignAgent:
         if session["context"]:
             ctx_info = self._format_context(session["context"])
             if ctx_info:
-                user_message = f"[현재 설계 상태]\n{ctx_info}\n\n[사용자 질문]\n{message}"
+                user_message = f"{CONTEXT_HEADER}{ctx_info}{QUESTION_HEADER}{message}"
 
         # 메시지 히스토리에 추가
         session["messages"].append({
             "role": "user",
             "content": user_message
         })
+        return session_id, session, saved
+
+    async def _save_session(self, session_id: str, session: Dict, saved: int):
+        """이번 턴에 추가된 메시지만 저장소에 기록"""
+        await self.session_store.append(session_id, session["messages"][saved:], session["context"])
+
+    async def chat(
+        self,
+        message: str,
+        session_id: str = None,
+        context: Dict = None
+    ) -> Dict[str, Any]:
+        """
+        사용자 메시지 처리
+
+        Args:
+            message: 사용자 메시지
+            session_id: 세션 ID (없으면 생성)
+            context: 현재 설계 상태 (치수, 모듈 등)
+
+        Returns:
+            AI 응답 및 액션 (rounds: 라운드별 LLM/도구 소요 시간, cached: 응답 캐시 적중 종류)
+        """
+        session_id, session, saved = await self._prepare_session(message, session_id, context)
+        try:
+            cache_context = self._response_cache_context(message, session, saved)
+            cached = self.response_cache.get(message, cache_context) if cache_context is not None else None
+            if cached:
+                return self._answer_cached(cached, session_id, session)
+
+            started = time.perf_counter()
+            result = await self._chat(message, session_id, session, context)
+            if cache_context is not None:
+                self._store_response(message, cache_context, result, session, saved, started)
+            return result
+        finally:
+            await self._save_session(session_id, session, saved)
+
+    async def _chat(self, message: str, session_id: str, session: Dict, context: Dict = None) -> Dict[str, Any]:
+        """chat() 본문 (세션 준비/저장 제외)"""
+        # 확실한 요청은 LLM 없이 로컬 도구로 바로 응답
+        intent = self.intent_router.route(message) if self.intent_router else None
+        if intent:
+            return await self._answer_intent(intent, session_id, session)
 
         # API 키가 없으면 시뮬레이션 모드
         if not self.client:
             return self._simulate_response(message, session_id, context)
 
-        # Claude API 호출 (도구 사용)
+        # Claude API 호출 (도구 루프: 도구 호출이 없을 때까지 최대 max_tool_rounds 라운드)
         try:
-            response = self.client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=4096,
-                system=self.system_prompt,
-                tools=self.tools,
-                messages=session["messages"]
-            )
-
-            # 도구 호출 처리
             assistant_message = ""
             actions = []
-            tool_results = []
-
-            for block in response.content:
-                if block.type == "text":
-                    assistant_message += block.text
-                elif block.type == "tool_use":
-                    # 도구 실행
-                    tool_result = self._execute_tool(block.name, block.input)
-                    tool_results.append({
-                        "tool": block.name,
-                        "input": block.input,
-                        "result": tool_result
-                    })
-                    actions.append({
-                        "type": "tool_result",
-                        "tool": block.name,
-                        "data": tool_result
-                    })
-
-            # 도구 결과가 있으면 후속 호출
-            if tool_results and response.stop_reason == "tool_use":
-                # 도구 결과를 포함하여 재호출
-                tool_result_messages = []
-                for i, block in enumerate(response.content):
-                    if block.type == "tool_use":
-                        tool_result_messages.append({
-                            "type": "tool_result",
-                            "tool_use_id": block.id,
-                            "content": json.dumps(tool_results[i]["result"], ensure_ascii=False)
-                        })
-
-                session["messages"].append({
-                    "role": "assistant",
-                    "content": response.content
-                })
-                session["messages"].append({
-                    "role": "user",
-                    "content": tool_result_messages
-                })
-
-                # 최종 응답 생성
-                final_response = self.client.messages.create(
-                    model="claude-sonnet-4-20250514",
+            rounds = []
+            history_report = None
+
+            for round_no in range(1, self.max_tool_rounds + 2):
+                # 토큰 예산 내로 압축한 히스토리 전송 (저장본은 그대로)
+                messages, history = self.history.compact(session["messages"])
+                if round_no == 1:
+                    history_report = history
+
+                started = time.perf_counter()
+                response = await self.client.messages.create(
+                    model=self.model,
                     max_tokens=4096,
-                    system=self.system_prompt,
-                    messages=session["messages"]
+                    system=self.request_system,
+                    tools=self.request_tools,
+                    messages=self._with_cache_breakpoints(messages)
                 )
-
-                for block in final_response.content:
-                    if block.type == "text":
-                        assistant_message = block.text
+                llm_ms = round((time.perf_counter() - started) * 1000, 1)
+                timing = {
+                    "round": round_no,
+                    "llm_ms": llm_ms,
+                    "history_tokens": history["tokens_after"],
+                    "usage": self.metrics.record(response.usage, llm_ms)
+                }
+                rounds.append(timing)
+
+                content = [self._block_to_dict(block) for block in response.content]
+                assistant_message = "".join(b["text"] for b in content if b["type"] == "text")
+                tool_blocks = [b for b in content if b["type"] == "tool_use"]
+
+                if not tool_blocks or response.stop_reason != "tool_use":
+                    break
+                if round_no > self.max_tool_rounds:
+                    # 한도 초과: 남은 도구 호출은 실행하지 않음
+                    timing["truncated"] = True
+                    assistant_message = assistant_message or self._round_limit_message()
+                    break
+
+                # 같은 턴의 도구 호출은 동시에 실행
+                started = time.perf_counter()
+                results = await self._run_tools(tool_blocks)
+                timing["tools"] = [b["name"] for b in tool_blocks]
+                timing["tool_ms"] = round((time.perf_counter() - started) * 1000, 1)
+                actions.extend(self._append_tool_round(session, content, tool_blocks, results))
 
             # 응답 저장
             session["messages"].append({
@@ -380,7 +503,9 @@ class DesignAgent:
                 "message": assistant_message,
                 "session_id": session_id,
                 "actions": actions,
-                "suggestions": self._extract_suggestions(assistant_message)
+                "suggestions": self._extract_suggestions(assistant_message),
+                "rounds": rounds,
+                "history": history_report
             }
 
         except Exception as e:
@@ -390,6 +515,361 @@ class DesignAgent:
                 "error": str(e)
             }
 
+    async def chat_stream(
+        self,
+        message: str,
+        session_id: str = None,
+        context: Dict = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        사용자 메시지 처리 (스트리밍)
+
+        텍스트는 토큰 단위로 바로 내보내고, tool_use 블록은 완성되는 즉시
+        실행을 시작해 다음 라운드 생성 전에 tool_result 이벤트로 전달한다.
+
+        Yields:
+            이벤트 dict
+            - {"type": "session", "session_id"}
+            - {"type": "text", "text"}: 텍스트 조각
+            - {"type": "tool_use", "id", "tool", "input"}: 도구 호출 시작
+            - {"type": "tool_result", "tool", "data"}: 도구 실행 결과 (액션)
+            - {"type": "done", "message", "session_id", "actions", "suggestions", "rounds"}
+            - {"type": "error", "message", "session_id", "error"}
+        """
+        session_id, session, saved = await self._prepare_session(message, session_id, context)
+        try:
+            cache_context = self._response_cache_context(message, session, saved)
+            cached = self.response_cache.get(message, cache_context) if cache_context is not None else None
+            if cached:
+                # 캐시 적중은 한 번에 전송
+                result = self._answer_cached(cached, session_id, session)
+                yield {"type": "session", "session_id": session_id}
+                for action in result["actions"]:
+                    yield action
+                yield {"type": "text", "text": result["message"]}
+                yield {"type": "done", **result}
+                return
+
+            started = time.perf_counter()
+            events = self._chat_stream(message, session_id, session, context)
+            try:
+                async for event in events:
+                    if event["type"] == "done" and cache_context is not None:
+                        self._store_response(message, cache_context, event, session, saved, started)
+                    yield event
+            finally:
+                # 연결이 끊겨도 본문 정리(실행 중인 도구 태스크 취소)를 바로 실행
+                await events.aclose()
+        finally:
+            await self._save_session(session_id, session, saved)
+
+    async def _chat_stream(
+        self,
+        message: str,
+        session_id: str,
+        session: Dict,
+        context: Dict = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """chat_stream() 본문 (세션 준비/저장 제외)"""
+        yield {"type": "session", "session_id": session_id}
+
+        # 확실한 요청은 LLM 없이 로컬 도구로 바로 응답 (한 번에 전송)
+        intent = self.intent_router.route(message) if self.intent_router else None
+        if intent:
+            result = await self._answer_intent(intent, session_id, session)
+            for action in result["actions"]:
+                yield action
+            yield {"type": "text", "text": result["message"]}
+            yield {"type": "done", **result}
+            return
+
+        # API 키가 없으면 시뮬레이션 모드 (한 번에 전송)
+        if not self.client:
+            result = self._simulate_response(message, session_id, context)
+            yield {"type": "text", "text": result["message"]}
+            yield {"type": "done", **result}
+            return
+
+        pending = []  # 현재 라운드의 (tool_use 블록, 실행 태스크)
+        try:
+            assistant_message = ""
+            actions = []
+            rounds = []
+            history_report = None
+
+            for round_no in range(1, self.max_tool_rounds + 2):
+                can_use_tools = round_no <= self.max_tool_rounds
+                pending = []
+                assistant_message = ""
+
+                # 토큰 예산 내로 압축한 히스토리 전송 (저장본은 그대로)
+                messages, history = self.history.compact(session["messages"])
+                if round_no == 1:
+                    history_report = history
+
+                started = time.perf_counter()
+                async with self.client.messages.stream(
+                    model=self.model,
+                    max_tokens=4096,
+                    system=self.request_system,
+                    tools=self.request_tools,
+                    messages=self._with_cache_breakpoints(messages)
+                ) as stream:
+                    async for event in stream:
+                        if event.type == "text":
+                            assistant_message += event.text
+                            yield {"type": "text", "text": event.text}
+                        elif event.type == "content_block_stop" and event.content_block.type == "tool_use" and can_use_tools:
+                            # 블록이 완성되면 나머지 스트림을 기다리지 않고 바로 실행
+                            block = self._block_to_dict(event.content_block)
+                            task = asyncio.ensure_future(self._run_tool(block["name"], block["input"]))
+                            pending.append((block, task))
+                            yield {"type": "tool_use", "id": block["id"], "tool": block["name"], "input": block["input"]}
+                    response = await stream.get_final_message()
+                llm_ms = round((time.perf_counter() - started) * 1000, 1)
+                timing = {
+                    "round": round_no,
+                    "llm_ms": llm_ms,
+                    "history_tokens": history["tokens_after"],
+                    "usage": self.metrics.record(response.usage, llm_ms)
+                }
+                rounds.append(timing)
+
+                if response.stop_reason == "tool_use" and not can_use_tools:
+                    timing["truncated"] = True
+                    if not assistant_message:
+                        assistant_message = self._round_limit_message()
+                        yield {"type": "text", "text": assistant_message}
+                    break
+                if not pending:
+                    break
+
+                # 도구 결과를 다음 라운드 생성 전에 먼저 전달
+                started = time.perf_counter()
+                tool_blocks = [block for block, _ in pending]
+                results = await asyncio.gather(*(task for _, task in pending))
+                timing["tools"] = [b["name"] for b in tool_blocks]
+                timing["tool_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+                content = [self._block_to_dict(block) for block in response.content]
+                round_actions = self._append_tool_round(session, content, tool_blocks, results)
+                actions.extend(round_actions)
+                for action in round_actions:
+                    yield action
+
+                if response.stop_reason != "tool_use":
+                    break
+
+            # 응답 저장
+            session["messages"].append({
+                "role": "assistant",
+                "content": assistant_message
+            })
+
+            yield {
+                "type": "done",
+                "message": assistant_message,
+                "session_id": session_id,
+                "actions": actions,
+                "suggestions": self._extract_suggestions(assistant_message),
+                "rounds": rounds,
+                "history": history_report
+            }
+
+        except Exception as e:
+            yield {
+                "type": "error",
+                "message": f"오류가 발생했습니다: {str(e)}",
+                "session_id": session_id,
+                "error": str(e)
+            }
+        finally:
+            # 스트림 오류/클라이언트 연결 끊김으로 끝나면 남은 도구 태스크를 취소하고 정리
+            tasks = [task for _, task in pending]
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _with_cache_breakpoints(self, messages: List[Dict]) -> List[Dict]:
+        """
+        히스토리 캐시 중단점 추가 (이전 턴 끝 + 마지막 메시지)
+
+        이전 턴까지는 다음 턴에서, 마지막 메시지까지는 같은 턴의 다음 라운드에서
+        접두어로 재사용된다. 표시할 메시지만 복사하므로 저장본은 바뀌지 않음.
+        """
+        if not self.prompt_cache or not messages:
+            return messages
+
+        # 현재 턴 시작 = 마지막 사용자 텍스트 메시지
+        turn_start = max(
+            (i for i, m in enumerate(messages) if m["role"] == "user" and isinstance(m["content"], str)),
+            default=0
+        )
+        marked = list(messages)
+        for i in {turn_start - 1, len(messages) - 1}:
+            if i < 0:
+                continue
+            content = marked[i]["content"]
+            blocks = [{"type": "text", "text": content}] if isinstance(content, str) else list(content)
+            blocks[-1] = {**blocks[-1], "cache_control": CACHE_CONTROL}
+            marked[i] = {**marked[i], "content": blocks}
+        return marked
+
+    @staticmethod
+    def _block_to_dict(block) -> Dict:
+        """응답 콘텐츠 블록 → 세션 저장용 dict"""
+        if block.type == "text":
+            return {"type": "text", "text": block.text}
+        if block.type == "tool_use":
+            return {"type": "tool_use", "id": block.id, "name": block.name, "input": block.input}
+        return block.model_dump(exclude_none=True)
+
+    def _append_tool_round(
+        self,
+        session: Dict,
+        content: List[Dict],
+        tool_blocks: List[Dict],
+        results: List[Tuple[Dict, str]]
+    ) -> List[Dict]:
+        """assistant tool_use 턴 + tool_result 턴을 히스토리에 추가하고 액션 반환"""
+        session["messages"].append({
+            "role": "assistant",
+            "content": content
+        })
+        # tool_result는 tool_use id로 짝지음 (텍스트 블록 위치와 무관)
+        session["messages"].append({
+            "role": "user",
+            "content": [
+                {
+                    "type": "tool_result",
+                    "tool_use_id": block["id"],
+                    "content": text
+                }
+                for block, (_, text) in zip(tool_blocks, results)
+            ]
+        })
+        return [
+            {"type": "tool_result", "tool": block["name"], "data": data}
+            for block, (data, _) in zip(tool_blocks, results)
+        ]
+
+    async def _answer_intent(self, intent: Dict, session_id: str, session: Dict) -> Dict[str, Any]:
+        """로컬 의도 응답 (도구 결과 + 템플릿 문장, 히스토리에도 기록)"""
+        started = time.perf_counter()
+        data, _ = await self._run_tool(intent["tool"], intent["input"])
+
+        if intent["intent"] == "distribute":
+            response_text = self._format_distribution(intent["input"]["total_space"], data)
+        else:
+            response_text = self._format_fridge_recommendations(intent["input"]["total_width"], data)
+
+        session["messages"].append({
+            "role": "assistant",
+            "content": response_text
+        })
+        return {
+            "message": response_text,
+            "session_id": session_id,
+            "actions": [{"type": "tool_result", "tool": intent["tool"], "data": data}],
+            "suggestions": self._extract_suggestions(response_text),
+            "intent": intent["intent"],
+            "rounds": [{"round": 0, "tools": [intent["tool"]], "tool_ms": round((time.perf_counter() - started) * 1000, 1)}]
+        }
+
+    def _response_cache_context(self, message: str, session: Dict, saved: int) -> Optional[str]:
+        """
+        응답 캐시 키용 설계 상태 문자열
+
+        이전 대화가 없는 새 세션의 짧은 질문만 대상 (히스토리에 따라 답이 달라지므로).
+        도구 결과 캐시와 같은 카탈로그/계산 상수 버전을 앞에 붙여, 다시 불러오면 이전 응답은 적중하지 않는다.
+        대상이 아니면 None
+        """
+        if not self.response_cache or saved or len(message) > RESPONSE_CACHE_MAX_MESSAGE:
+            return None
+        version = f"{self.fridge_lookup.snapshot.checksum}:{self.calculator.fingerprint}"
+        return f"{version}\n{self._format_context(session['context'])}"
+
+    def _store_response(
+        self,
+        message: str,
+        cache_context: str,
+        result: Dict[str, Any],
+        session: Dict,
+        saved: int,
+        started: float
+    ):
+        """LLM 응답을 캐시에 저장 (오류/로컬 처리/시뮬레이션/라운드 한도 초과 응답 제외)"""
+        rounds = result.get("rounds")
+        if "error" in result or result.get("intent") or not rounds:
+            return
+        if any(r.get("truncated") for r in rounds):
+            return
+        self.response_cache.put(
+            message,
+            cache_context,
+            response={
+                "message": result["message"],
+                "actions": result["actions"],
+                "suggestions": result["suggestions"]
+            },
+            # 사용자 메시지 다음부터 (도구 호출/결과 + 최종 응답)
+            messages=session["messages"][saved + 1:],
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 1)
+        )
+
+    def _answer_cached(self, cached: Dict, session_id: str, session: Dict) -> Dict[str, Any]:
+        """캐시된 응답 (이번 턴 메시지를 히스토리에 그대로 이어 붙임)"""
+        session["messages"].extend(cached["messages"])
+        return {
+            **cached["response"],
+            "session_id": session_id,
+            "cached": cached["match"],
+            "rounds": []
+        }
+
+    def _format_distribution(self, space: float, data: Dict) -> str:
+        """calculate_modules 결과 응답 문장"""
+        return f"""**{space:.0f}mm 공간 분배 결과:**
+
+- 도어 너비: **{data['door_width']}mm**
+- 도어 개수: **{data['door_count']}개**
+- 모듈 구성: {', '.join(data['modules'])}
+- 잔여 공간: **{data['remaining']:.0f}mm** {'✅ 최적' if data['is_optimal'] else '⚠️ 조정 필요'}
+
+{'잔여 공간이 4~10mm 사이로 최적입니다!' if data['is_optimal'] else '잔여 공간을 조정하시겠어요?'}
+"""
+
+    def _format_fridge_recommendations(self, width: float, data: Dict) -> str:
+        """recommend_fridge 결과 응답 문장"""
+        recommendations = data["recommendations"]
+        if not recommendations:
+            return f"{width:.0f}mm 공간에 들어가는 냉장고 모델이 없습니다. 너비나 브랜드 조건을 바꿔서 다시 요청해주세요."
+
+        response_text = f"""{width:.0f}mm 공간에 적합한 냉장고를 찾았습니다!
+
+**추천 모델 TOP {min(3, len(recommendations))}:**
+"""
+        for i, rec in enumerate(recommendations[:3], 1):
+            response_text += f"""
+{i}. **{rec['brand']} {rec['name']}**
+   - 크기: {rec['size']}
+   - 잔여 공간: {rec['remaining']}
+   - 키큰장 추가: {'가능' if rec['can_add_tall'] else '불가'}
+"""
+        response_text += "\n어떤 모델로 진행하시겠어요?"
+        return response_text
+
+    def _round_limit_message(self) -> str:
+        return f"도구 호출 한도({self.max_tool_rounds}회)에 도달했습니다. 요청을 나눠서 다시 질문해주세요."
+
+    async def aclose(self):
+        """HTTP 커넥션 풀 / 도구 워커 풀 / 세션 저장소 연결 정리 (서버 종료 시)"""
+        if self.http_client:
+            await self.http_client.aclose()
+        self.tool_executor.shutdown(wait=False)
+        await self.session_store.aclose()
+
     def _format_context(self, context: Dict) -> str:
         """컨텍스트를 문자열로 포맷"""
         parts = []
@@ -534,13 +1014,14 @@ class DesignAgent:
             "suggestions": []
         }
 
-    def get_session(self, session_id: str) -> Optional[Dict]:
+    async def get_session(self, session_id: str) -> Optional[Dict]:
         """세션 조회"""
-        return self.sessions.get(session_id)
+        return await self.session_store.load(session_id)
+
+    async def session_stats(self) -> Dict[str, Any]:
+        """세션 저장소 현황"""
+        return await self.session_store.stats()
 
-    def clear_session(self, session_id: str) -> bool:
+    async def clear_session(self, session_id: str) -> bool:
         """세션 초기화"""
-        if session_id in self.sessions:
-            del self.sessions[session_id]
-            return True
-        return False
+        return await self.session_store.delete(session_id)
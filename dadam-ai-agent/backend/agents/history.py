@@ -0,0 +1,181 @@
+"""
+대화 히스토리 압축 - 토큰 예산 안에서 API 전송용 메시지 구성
+
+저장된 히스토리는 그대로 두고 호출마다 보낼 사본만 줄인다.
+- 최근 keep_turns 턴(현재 턴 포함) 이상은 원문 유지
+- 오래된 턴의 [현재 설계 상태] 블록은 직전과 같으면 제거
+- 오래된 턴의 도구 결과 JSON은 요약(digest)으로 교체
+- 그래도 예산을 넘으면 오래된 턴부터 빼고 질문 목록 요약으로 대체
+"""
+import json
+from typing import Dict, Any, List, Optional, Tuple
+
+CONTEXT_HEADER = "[현재 설계 상태]\n"
+QUESTION_HEADER = "\n\n[사용자 질문]\n"
+SUMMARY_HEADER = "[이전 대화 요약]\n"
+
+
+def estimate_tokens(text: str) -> int:
+    """토큰 수 근사치 (영문/숫자 4자 ≈ 1토큰, 한글 등 1자 ≈ 1토큰)"""
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+def message_tokens(message: Dict[str, Any]) -> int:
+    """메시지 하나의 토큰 수 근사치"""
+    content = message["content"]
+    if isinstance(content, str):
+        return estimate_tokens(content)
+
+    total = 0
+    for block in content:
+        kind = block.get("type")
+        if kind == "text":
+            total += estimate_tokens(block["text"])
+        elif kind == "tool_use":
+            total += estimate_tokens(block["name"]) + estimate_tokens(json.dumps(block["input"], ensure_ascii=False))
+        elif kind == "tool_result":
+            result = block.get("content", "")
+            total += estimate_tokens(result if isinstance(result, str) else json.dumps(result, ensure_ascii=False))
+    return total
+
+
+def split_context(content: str) -> Tuple[Optional[str], str]:
+    """사용자 메시지 → (설계 상태 블록, 질문). 블록이 없으면 (None, 원문)"""
+    if content.startswith(CONTEXT_HEADER) and QUESTION_HEADER in content:
+        context, question = content[len(CONTEXT_HEADER):].split(QUESTION_HEADER, 1)
+        return context, question
+    return None, content
+
+
+def digest_tool_result(content: str, limit: int = 300) -> str:
+    """도구 결과 JSON 요약 (스칼라 값만 남기고 목록/객체는 개수로 표시)"""
+    try:
+        data = json.loads(content)
+    except ValueError:
+        return content[:limit]
+
+    if isinstance(data, dict):
+        summary = {}
+        for key, value in data.items():
+            if isinstance(value, list):
+                summary[key] = f"[{len(value)}개 항목]"
+            elif isinstance(value, dict):
+                summary[key] = "{...}"
+            elif isinstance(value, str) and len(value) > 80:
+                summary[key] = value[:80] + "…"
+            else:
+                summary[key] = value
+    elif isinstance(data, list):
+        summary = f"[{len(data)}개 항목]"
+    else:
+        summary = data
+
+    return "[요약] " + json.dumps(summary, ensure_ascii=False, separators=(",", ":"))[:limit]
+
+
+def split_turns(messages: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """턴 단위 분할 (사용자 텍스트 메시지에서 새 턴 시작, 도구 결과 메시지는 같은 턴)"""
+    turns: List[List[Dict[str, Any]]] = []
+    for message in messages:
+        if not turns or (message["role"] == "user" and isinstance(message["content"], str)):
+            turns.append([])
+        turns[-1].append(message)
+    return turns
+
+
+class HistoryCompactor:
+    """
+    토큰 예산 기반 히스토리 압축기
+
+    압축 결정은 앞쪽 메시지만 보고 내리고, 원문 구간/제외 구간의 경계는
+    keep_turns 턴 단위로만 이동한다. 따라서 압축된 접두어는 몇 턴 동안
+    그대로 유지되어 프롬프트 캐시가 계속 적중한다.
+    """
+
+    def __init__(self, budget: int = 8000, keep_turns: int = 3):
+        self.budget = budget
+        self.keep_turns = max(1, keep_turns)
+
+    def compact(self, messages: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Returns:
+            (전송용 메시지, 리포트 {"tokens_before", "tokens_after", "dropped_turns",
+             "digested_results", "deduped_contexts"})
+        """
+        turns = split_turns(messages)
+        step = self.keep_turns
+        # 원문 유지 구간 시작 (keep_turns 단위로 이동 → 최근 keep_turns ~ 2*keep_turns-1 턴 원문)
+        recent_start = max(0, (len(turns) - step) // step * step)
+        last_context = None
+        deduped = digested = 0
+        tokens_before = 0
+
+        compacted_turns = []
+        turn_tokens = []
+        for i, turn in enumerate(turns):
+            old = i < recent_start
+            compacted = []
+            for message in turn:
+                tokens_before += message_tokens(message)
+                content = message["content"]
+
+                if message["role"] == "user" and isinstance(content, str):
+                    context, question = split_context(content)
+                    if context is not None:
+                        if old and context == last_context:
+                            message = {**message, "content": question}
+                            deduped += 1
+                        last_context = context
+
+                elif old and message["role"] == "user":
+                    blocks = []
+                    for block in content:
+                        result = block.get("content")
+                        if block.get("type") == "tool_result" and isinstance(result, str):
+                            digest = digest_tool_result(result)
+                            if len(digest) < len(result):
+                                block = {**block, "content": digest}
+                                digested += 1
+                        blocks.append(block)
+                    message = {**message, "content": blocks}
+
+                compacted.append(message)
+            compacted_turns.append(compacted)
+            turn_tokens.append(sum(message_tokens(m) for m in compacted))
+
+        # 예산 초과 시 오래된 턴부터 keep_turns 턴씩 제외 (원문 구간은 유지)
+        total = sum(turn_tokens)
+        dropped = 0
+        while total > self.budget and dropped < recent_start:
+            chunk = min(step, recent_start - dropped)
+            total -= sum(turn_tokens[dropped:dropped + chunk])
+            dropped += chunk
+
+        result = [m for turn in compacted_turns[dropped:] for m in turn]
+        if dropped and result and isinstance(result[0]["content"], str):
+            summary = self._summarize(turns[:dropped])
+            result[0] = {**result[0], "content": f"{summary}\n\n{result[0]['content']}"}
+            total += estimate_tokens(summary) + 1
+
+        return result, {
+            "tokens_before": tokens_before,
+            "tokens_after": total,
+            "dropped_turns": dropped,
+            "digested_results": digested,
+            "deduped_contexts": deduped
+        }
+
+    def _summarize(self, turns: List[List[Dict[str, Any]]], max_items: int = 10) -> str:
+        """제외된 턴의 질문 목록 요약"""
+        questions = []
+        for turn in turns:
+            first = turn[0]["content"]
+            if isinstance(first, str):
+                question = split_context(first)[1].strip().replace("\n", " ")
+                questions.append(question[:60] + ("…" if len(question) > 60 else ""))
+
+        lines = [f"- {q}" for q in questions[-max_items:]]
+        if len(questions) > max_items:
+            lines.insert(0, f"- (그 이전 질문 {len(questions) - max_items}건 생략)")
+        return SUMMARY_HEADER + "\n".join(lines)
@@ -0,0 +1,255 @@
+"""
+로컬 의도 라우터 - LLM 없이 바로 답할 수 있는 확실한 요청 판별
+
+- 길이 파싱: 2400, 2,400mm, 240cm, 3m, 2.4미터, 삼천, 이천사백, 3천5백
+- 치수 역할: 숫자 바로 앞 키워드로 결정 (높이 2300 / 폭 2400), 키워드가 없으면 "가로×높이" 표기만 인정
+- 브랜드 (LG/엘지, 삼성/Samsung), 키큰장 여부
+- 의도: distribute (모듈 분배), fridge_recommend (냉장고 추천)
+
+확실하지 않으면 None을 돌려 Claude로 넘긴다 (역할을 모르는 길이 여러 개, 단위 없는 작은 수,
+부정/비교 표현, 마감 조건, 의도가 둘 이상인 문장, 긴 문장 등).
+"""
+import re
+import logging
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+KOREAN_DIGITS = {"일": 1, "이": 2, "삼": 3, "사": 4, "오": 5, "육": 6, "칠": 7, "팔": 8, "구": 9}
+KOREAN_UNITS = {"십": 10, "백": 100, "천": 1000}
+
+_DIGIT = r"[일이삼사오육칠팔구1-9]"
+# 한글 수사 (천/백 단위 필수, 앞뒤가 다른 한글 단어에 붙어 있으면 제외: "천장" 등)
+_KOREAN_NUMBER = re.compile(
+    rf"(?<![가-힣0-9])((?:{_DIGIT}?천)(?:{_DIGIT}?백)?(?:{_DIGIT}?십)?{_DIGIT}?"
+    rf"|(?:{_DIGIT}?백)(?:{_DIGIT}?십)?{_DIGIT}?)"
+    r"(?=$|[^가-힣]|미터|밀리|미리|센티|짜리|정도|쯤|으로|로|에|의|은|는|을|를|공간|폭|너비|높이)"
+)
+_ARABIC_NUMBER = re.compile(
+    r"(?<![\d.,])(\d{1,3}(?:,\d{3})+|\d+(?:\.\d+)?)\s*"
+    r"(mm|밀리|미리|cm|센티|m(?![a-z])|미터)?"
+)
+# 개수 표현 (5개, 3도어, 2D 등): 길이가 아니고, 있으면 사용자 지정 조건이라 LLM으로
+_COUNT = re.compile(r"\d+\s*(?:개|도어|칸|층|[Dd](?![a-z]))")
+# 한글 수사 뒤 단위 (공백 허용: "칠백 센티")
+_UNIT_AFTER = re.compile(r"\s*(mm|밀리|미리|cm|센티|m(?![a-z])|미터)", re.IGNORECASE)
+# 부정 표현 ("키큰장 없이", "빼고", "안 해도", "않게") - 조건을 뒤집으므로 LLM으로
+_NEGATION = re.compile(r"없|빼|제외|말고|않|(?<![가-힣])안(?=\s|해|하|돼|되|$)")
+
+# 숫자 바로 앞의 치수 키워드 ("높이 2300", "폭은 2400", "너비: 3m")
+_LABEL = re.compile(r"(높이|폭|너비|가로)\s*(?:은|는|이|가|:)?\s*$")
+WIDTH_LABELS = ("폭", "너비", "가로")
+HEIGHT_LABEL = "높이"
+
+UNIT_SCALE = {"mm": 1, "밀리": 1, "미리": 1, "cm": 10, "센티": 10, "m": 1000, "미터": 1000}
+
+BRANDS = {"lg": "LG", "엘지": "LG", "삼성": "Samsung", "samsung": "Samsung"}
+
+DISTRIBUTE_WORDS = ("분배", "나눠", "나누", "계산", "도어", "모듈", "배치")
+FRIDGE_WORDS = ("추천", "맞는", "들어가", "들어갈", "넣", "찾아", "골라", "설계")
+# 문맥/비교/부정이 필요한 표현은 LLM으로
+AMBIGUOUS_WORDS = ("왜", "어떻게", "차이", "비교", "대신", "아니", "다시", "바꿔", "변경", "취소", "마감")
+
+MIN_WIDTH = 300
+MAX_WIDTH = 10000
+MAX_MESSAGE_LENGTH = 80
+
+
+def parse_korean_number(text: str) -> int:
+    """한글/혼합 수사 → 정수 (예: 이천사백 → 2400, 3천5백 → 3500)"""
+    total = 0
+    digit = None
+    for ch in text:
+        if ch in KOREAN_UNITS:
+            total += (digit or 1) * KOREAN_UNITS[ch]
+            digit = None
+        elif ch in KOREAN_DIGITS:
+            digit = KOREAN_DIGITS[ch]
+        else:
+            digit = int(ch)
+    return total + (digit or 0)
+
+
+def _label_before(text: str, pos: int) -> Optional[str]:
+    """숫자 바로 앞의 치수 키워드 (없으면 None)"""
+    match = _LABEL.search(text[max(0, pos - 8):pos])
+    return match.group(1) if match else None
+
+
+def _scan_lengths(text: str) -> Tuple[List[Tuple[int, float]], bool]:
+    """
+    문장 속 길이 값 (mm) 스캔
+
+    Returns:
+        ([(위치, 값)...] 등장 순서대로, 단위 없는 작은 수(100 미만/소수) 존재 여부)
+    """
+    found = []
+    ambiguous = False
+    counts = {m.start() for m in _COUNT.finditer(text)}
+
+    # 한글/혼합 수사 (3천5백처럼 섞인 아라비아 숫자는 수사의 일부)
+    spans = []
+    for match in _KOREAN_NUMBER.finditer(text):
+        value = parse_korean_number(match.group(1))
+        unit = _UNIT_AFTER.match(text, match.end())
+        if unit:
+            value *= UNIT_SCALE[unit.group(1).lower()]
+        found.append((match.start(), float(value)))
+        spans.append((match.start(), match.end()))
+
+    for match in _ARABIC_NUMBER.finditer(text):
+        if any(start <= match.start() < end for start, end in spans):
+            continue
+        raw, unit = match.group(1), (match.group(2) or "").lower()
+        value = float(raw.replace(",", ""))
+        if unit:
+            found.append((match.start(), value * UNIT_SCALE[unit]))
+        elif match.start() in counts:
+            continue
+        elif value >= 100 and "." not in raw:
+            # 단위 없는 수는 100 이상 정수만 mm로 간주
+            found.append((match.start(), value))
+        else:
+            # 3, 2.4, 마감 30 등은 단위/의미가 모호
+            ambiguous = True
+
+    return sorted(found), ambiguous
+
+
+def parse_lengths(text: str) -> List[float]:
+    """문장 속 길이 값 (mm) 목록, 등장 순서대로"""
+    return [value for _, value in _scan_lengths(text)[0]]
+
+
+def parse_dimensions(text: str) -> Optional[Tuple[float, Optional[float]]]:
+    """
+    냉장고 공간 (너비, 높이) 결정
+
+    - 키워드가 붙은 값은 키워드대로 (폭/너비/가로 → 너비, 높이 → 높이)
+    - 키워드 없는 값은 하나 남은 역할에 배정, 둘 다 키워드가 없으면 "가로×높이" 표기만 인정
+    - 역할을 정할 수 없으면 None
+    """
+    lengths, _ = _scan_lengths(text)
+    if not lengths or len(lengths) > 2:
+        return None
+
+    widths, heights, unlabeled = [], [], []
+    for pos, value in lengths:
+        label = _label_before(text, pos)
+        if label in WIDTH_LABELS:
+            widths.append(value)
+        elif label == HEIGHT_LABEL:
+            heights.append(value)
+        else:
+            unlabeled.append(value)
+
+    if len(widths) > 1 or len(heights) > 1:
+        return None
+    if not widths and not heights:
+        if len(unlabeled) == 1:
+            # 높이만 언급했는데 키워드와 숫자가 떨어져 있으면 모호
+            return None if HEIGHT_LABEL in text else (unlabeled[0], None)
+        if "×" in text or "x" in text.lower() or "*" in text:
+            return unlabeled[0], unlabeled[1]
+        return None
+
+    if not widths:
+        if not unlabeled:
+            return None
+        widths.append(unlabeled.pop())
+    elif not heights and unlabeled:
+        heights.append(unlabeled.pop())
+    return widths[0], (heights[0] if heights else None)
+
+
+def parse_brand(text: str) -> Optional[str]:
+    """브랜드 (LG / Samsung), 둘 다 있거나 없으면 None"""
+    lowered = text.lower()
+    brands = {brand for word, brand in BRANDS.items() if word in lowered}
+    return brands.pop() if len(brands) == 1 else None
+
+
+class IntentRouter:
+    """확실한 요청만 로컬 도구 호출로 연결 (라우팅 결과/적중률 집계)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.routed: Dict[str, int] = {}
+        self.fallthrough = 0
+
+    def route(self, message: str) -> Optional[Dict[str, Any]]:
+        """
+        메시지 → 의도
+
+        Returns:
+            {"intent", "tool", "input"} 또는 None (LLM으로 넘김)
+        """
+        intent = self._classify(message.strip())
+        with self._lock:
+            if intent:
+                self.routed[intent["intent"]] = self.routed.get(intent["intent"], 0) + 1
+            else:
+                self.fallthrough += 1
+            routed = sum(self.routed.values())
+            hit_rate = routed / (routed + self.fallthrough)
+
+        if intent:
+            logger.info("intent route: %s %s (적중률 %.1f%%)", intent["intent"], intent["input"], hit_rate * 100)
+        else:
+            logger.info("intent fallthrough → LLM (적중률 %.1f%%)", hit_rate * 100)
+        logger.debug("intent message: %r", message)
+        return intent
+
+    def _classify(self, text: str) -> Optional[Dict[str, Any]]:
+        if not text or len(text) > MAX_MESSAGE_LENGTH or "\n" in text:
+            return None
+        if any(word in text for word in AMBIGUOUS_WORDS) or _COUNT.search(text) or _NEGATION.search(text):
+            return None
+        # 의도가 하나인 문장만 (분배 + 냉장고 추천을 함께 요청하면 LLM으로)
+        wants_fridge = "냉장고" in text
+        wants_distribute = any(word in text for word in DISTRIBUTE_WORDS)
+        if wants_fridge == wants_distribute:
+            return None
+
+        lengths, ambiguous = _scan_lengths(text)
+        if not lengths or ambiguous:
+            return None
+
+        if wants_fridge:
+            if not any(word in text for word in FRIDGE_WORDS):
+                return None
+            dimensions = parse_dimensions(text)
+            if not dimensions or not MIN_WIDTH <= dimensions[0] <= MAX_WIDTH:
+                return None
+            width, height = dimensions
+            tool_input: Dict[str, Any] = {"total_width": width}
+            if height is not None:
+                tool_input["total_height"] = height
+            brand = parse_brand(text)
+            if brand:
+                tool_input["brand"] = brand
+            if "키큰장" in text:
+                tool_input["include_tall"] = True
+            return {"intent": "fridge_recommend", "tool": "recommend_fridge", "input": tool_input}
+
+        # 분배는 길이 하나만 (높이 언급이 있으면 너비인지 모호)
+        if len(lengths) != 1 or HEIGHT_LABEL in text:
+            return None
+        space = lengths[0][1]
+        if MIN_WIDTH <= space <= MAX_WIDTH and not any(word in text for word in FRIDGE_WORDS):
+            return {"intent": "distribute", "tool": "calculate_modules", "input": {"total_space": space}}
+
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        """라우팅 통계 (적중률 = 로컬 처리 / 전체)"""
+        with self._lock:
+            routed = dict(self.routed)
+            fallthrough = self.fallthrough
+        total = sum(routed.values()) + fallthrough
+        return {
+            "routed": routed,
+            "fallthrough": fallthrough,
+            "hit_rate": round(sum(routed.values()) / total, 4) if total else 0.0
+        }
@@ -0,0 +1,67 @@
+"""
+LLM 호출 지표 - 토큰 사용량 / 프롬프트 캐시 적중 집계
+"""
+import threading
+from typing import Dict, Any
+
+USAGE_FIELDS = (
+    "input_tokens",
+    "output_tokens",
+    "cache_read_input_tokens",
+    "cache_creation_input_tokens"
+)
+
+
+def usage_to_dict(usage) -> Dict[str, int]:
+    """API 응답 usage → dict (없는 필드는 0)"""
+    return {field: getattr(usage, field, None) or 0 for field in USAGE_FIELDS}
+
+
+class UsageMetrics:
+    """호출별 토큰 사용량 누적 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """누적값 초기화"""
+        with self._lock:
+            self.calls = 0
+            self.cache_hits = 0  # 캐시 읽기가 있었던 호출 수
+            self.llm_ms = 0.0
+            self.totals = {field: 0 for field in USAGE_FIELDS}
+
+    def record(self, usage, llm_ms: float = 0.0) -> Dict[str, int]:
+        """호출 1회 기록 후 해당 호출의 사용량 반환"""
+        values = usage_to_dict(usage)
+        with self._lock:
+            self.calls += 1
+            self.llm_ms += llm_ms
+            if values["cache_read_input_tokens"]:
+                self.cache_hits += 1
+            for field, value in values.items():
+                self.totals[field] += value
+        return values
+
+    def snapshot(self) -> Dict[str, Any]:
+        """누적 지표 (캐시 적중률 = 캐시 읽기 토큰 / 전체 입력 토큰)"""
+        with self._lock:
+            totals = dict(self.totals)
+            calls = self.calls
+            cache_hits = self.cache_hits
+            llm_ms = self.llm_ms
+
+        prompt_tokens = (
+            totals["input_tokens"]
+            + totals["cache_read_input_tokens"]
+            + totals["cache_creation_input_tokens"]
+        )
+        return {
+            "calls": calls,
+            "calls_with_cache_read": cache_hits,
+            **totals,
+            "prompt_tokens": prompt_tokens,
+            "cache_read_ratio": round(totals["cache_read_input_tokens"] / prompt_tokens, 4) if prompt_tokens else 0.0,
+            "avg_llm_ms": round(llm_ms / calls, 1) if calls else 0.0
+        }
@@ -0,0 +1,227 @@
+"""
+채팅 응답 캐시 - 반복되는 첫 질문("냉장고장 설계하고 싶어요", "싱크대 견적")의 LLM 호출 생략
+
+키: (카탈로그/계산 상수 버전 + 설계 상태 문자열 해시, 정규화된 질문)
+1. 정확 일치: 정규화(NFKC, 소문자, 문장부호/공백 정리)한 질문이 같으면 적중
+2. 유사 일치 (선택, 기본 꺼짐): 문자 2·3-gram 벡터 코사인 유사도가 임계값 이상이고 숫자가 모두 같으면 적중
+   - n-gram 역색인으로 후보만 비교 (전체 순회 없음), 외부 서비스 없음
+   - 서로 다른 어절에 부정/방향/한글 수사가 있으면 뜻이 달라지므로 제외 (있는↔없는, 왼쪽↔오른쪽, 이천↔삼천)
+
+값: 응답(message/actions/suggestions) + 이번 턴에 히스토리에 추가된 메시지 목록
+    → 적중 시에도 세션 히스토리가 LLM 호출 때와 같은 모양으로 이어진다.
+항목 수(LRU)와 TTL로 크기를 제한한다.
+"""
+import re
+import math
+import time
+import hashlib
+import threading
+import unicodedata
+from collections import OrderedDict, Counter
+from typing import Dict, Any, List, Optional, Callable, Tuple
+
+_PUNCTUATION = re.compile(r"[^\w]+")
+_DIGITS = re.compile(r"\d+")
+# 한 글자만 달라도 뜻이 바뀌는 표현 (부정, 방향, 한글 수사)
+_MEANING_WORDS = re.compile(
+    r"없|안|않|말고|아니|못|빼|제외|왼|오른|좌|우측|위|아래|앞|뒤|[일이삼사오육칠팔구]?[십백천만]"
+)
+NGRAM_SIZES = (2, 3)
+
+
+def normalize_message(text: str) -> str:
+    """질문 정규화 (NFKC, 소문자, 문장부호/이모지 → 공백, 공백 정리)"""
+    text = unicodedata.normalize("NFKC", text).lower()
+    return " ".join(_PUNCTUATION.sub(" ", text).split())
+
+
+def context_hash(context_text: str) -> str:
+    """설계 상태 문자열 해시 (상태가 없으면 빈 문자열)"""
+    if not context_text:
+        return ""
+    return hashlib.sha1(context_text.encode("utf-8")).hexdigest()[:16]
+
+
+def meaning_differs(a: str, b: str) -> bool:
+    """두 질문의 다른 어절에 부정/방향/수사 표현이 있으면 True"""
+    changed = set(a.split()) ^ set(b.split())
+    return any(_MEANING_WORDS.search(token) for token in changed)
+
+
+def ngram_vector(text: str) -> Counter:
+    """문자 n-gram 빈도 벡터 (공백 제거 후 2·3-gram, 짧은 문장은 문장 전체)"""
+    compact = text.replace(" ", "")
+    grams = Counter()
+    for n in NGRAM_SIZES:
+        grams.update(compact[i:i + n] for i in range(len(compact) - n + 1))
+    if not grams and compact:
+        grams[compact] = 1
+    return grams
+
+
+class ResponseCache:
+    """
+    응답 LRU 캐시 (TTL, 정확/유사 일치, 적중률·절약 시간 집계)
+
+    similarity가 0이면 유사 일치를 쓰지 않는다.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 512,
+        ttl: float = 3600,
+        similarity: float = 0.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.similarity = similarity
+        self._clock = clock
+        self._lock = threading.Lock()
+        # (컨텍스트 해시, 정규화 질문) → 항목 (앞쪽일수록 오래 안 씀)
+        self._entries: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        # (컨텍스트 해시, n-gram) → 키 집합 (유사 일치 후보 조회용)
+        self._index: Dict[Tuple[str, str], set] = {}
+        self.hits = {"exact": 0, "similar": 0}
+        self.misses = 0
+        self.evictions = {"ttl": 0, "lru": 0}
+        self.saved_ms = 0.0
+
+    def get(self, message: str, context_text: str = "") -> Optional[Dict[str, Any]]:
+        """
+        캐시 조회
+
+        Returns:
+            {"match": "exact"|"similar", "response", "messages", "elapsed_ms"} 또는 None
+        """
+        ctx = context_hash(context_text)
+        text = normalize_message(message)
+        now = self._clock()
+        with self._lock:
+            key = (ctx, text)
+            match = "exact"
+            entry = self._live(key, now)
+            if entry is None and self.similarity > 0:
+                key = self._nearest(ctx, text, now)
+                entry = self._entries.get(key) if key else None
+                match = "similar"
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits[match] += 1
+            self.saved_ms += entry["elapsed_ms"]
+            return {
+                "match": match,
+                "response": entry["response"],
+                "messages": entry["messages"],
+                "elapsed_ms": entry["elapsed_ms"]
+            }
+
+    def put(
+        self,
+        message: str,
+        context_text: str,
+        response: Dict[str, Any],
+        messages: List[Dict[str, Any]],
+        elapsed_ms: float
+    ):
+        """응답 저장 (응답/메시지는 공유되므로 읽기 전용으로 다룬다)"""
+        if self.maxsize <= 0:
+            return
+        ctx = context_hash(context_text)
+        text = normalize_message(message)
+        if not text:
+            return
+
+        key = (ctx, text)
+        vector = ngram_vector(text)
+        entry = {
+            "response": response,
+            "messages": list(messages),
+            "elapsed_ms": elapsed_ms,
+            "vector": vector,
+            "norm": math.sqrt(sum(v * v for v in vector.values())),
+            "digits": _DIGITS.findall(text),
+            "stored": self._clock()
+        }
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            for gram in vector:
+                self._index.setdefault((ctx, gram), set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)), "lru")
+
+    def _live(self, key: Tuple[str, str], now: float) -> Optional[Dict[str, Any]]:
+        """만료되지 않은 항목 (만료됐으면 제거)"""
+        entry = self._entries.get(key)
+        if entry is not None and now - entry["stored"] >= self.ttl:
+            self._remove(key, "ttl")
+            return None
+        return entry
+
+    def _nearest(self, ctx: str, text: str, now: float) -> Optional[Tuple[str, str]]:
+        """같은 설계 상태에서 가장 비슷한 질문 키 (임계값 미만/숫자·부정·방향 표현 불일치면 None)"""
+        vector = ngram_vector(text)
+        norm = math.sqrt(sum(v * v for v in vector.values()))
+        if not norm:
+            return None
+
+        # 겹치는 n-gram이 있는 후보만 내적 계산
+        dots: Dict[Tuple[str, str], int] = {}
+        for gram, count in vector.items():
+            for key in self._index.get((ctx, gram), ()):
+                dots[key] = dots.get(key, 0) + count * self._entries[key]["vector"][gram]
+
+        digits = _DIGITS.findall(text)
+        best, best_score = None, self.similarity
+        for key, dot in dots.items():
+            entry = self._entries[key]
+            score = dot / (norm * entry["norm"])
+            # 숫자(치수 등)나 부정/방향 표현이 다르면 다른 질문
+            if score >= best_score and entry["digits"] == digits and not meaning_differs(text, key[1]):
+                best, best_score = key, score
+
+        if best is not None and self._live(best, now) is None:
+            return None
+        return best
+
+    def _remove(self, key: Tuple[str, str], reason: str = None):
+        entry = self._entries.pop(key)
+        for gram in entry["vector"]:
+            keys = self._index.get((key[0], gram))
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._index[(key[0], gram)]
+        if reason:
+            self.evictions[reason] += 1
+
+    def invalidate(self) -> int:
+        """전체 삭제, 삭제된 항목 수 반환"""
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            self._index.clear()
+            return count
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 통계 (적중률 = 적중 / 조회, saved_ms = 적중 항목의 원래 응답 시간 합)"""
+        with self._lock:
+            hits = sum(self.hits.values())
+            total = hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "similarity": self.similarity,
+                "hits": dict(self.hits),
+                "misses": self.misses,
+                "evictions": dict(self.evictions),
+                "hit_rate": round(hits / total, 4) if total else 0.0,
+                "saved_ms": round(self.saved_ms, 1)
+            }
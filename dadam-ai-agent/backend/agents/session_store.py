@@ -0,0 +1,286 @@
+"""
+대화 세션 저장소 - 메모리(LRU) / Redis(TTL, 압축 인코딩) 백엔드
+
+세션 구조: {"messages": [메시지 dict...], "context": {설계 상태}}
+턴이 끝나면 새로 추가된 메시지만 append()로 저장한다 (히스토리 전체 재직렬화 없음).
+"""
+import os
+import json
+import time
+import zlib
+import heapq
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Callable
+
+COMPRESS_MIN_BYTES = 256  # 이보다 짧은 JSON은 압축하지 않음
+
+
+def encode(value: Any) -> bytes:
+    """JSON 직렬화 후 길면 zlib 압축 (첫 바이트로 형식 구분: j=JSON, z=zlib)"""
+    raw = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    if len(raw) < COMPRESS_MIN_BYTES:
+        return b"j" + raw
+    return b"z" + zlib.compress(raw)
+
+
+def estimate_bytes(value: Any) -> int:
+    """메모리 사용량 근사치 (UTF-8 JSON 직렬화 크기)"""
+    return len(json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+
+def decode(data: bytes) -> Any:
+    """encode() 역변환"""
+    body = data[1:]
+    if data[:1] == b"z":
+        body = zlib.decompress(body)
+    return json.loads(body)
+
+
+class SessionStore:
+    """세션 저장소 인터페이스"""
+
+    async def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """세션 조회 (없으면 None). 반환값을 수정해도 저장본은 바뀌지 않음"""
+        raise NotImplementedError
+
+    async def create(self, session_id: str, context: Dict = None) -> Dict[str, Any]:
+        """빈 세션 생성"""
+        raise NotImplementedError
+
+    async def append(self, session_id: str, messages: List[Dict], context: Dict):
+        """새 메시지 추가 + 컨텍스트 갱신"""
+        raise NotImplementedError
+
+    async def delete(self, session_id: str) -> bool:
+        """세션 삭제 (없었으면 False)"""
+        raise NotImplementedError
+
+    async def stats(self) -> Dict[str, Any]:
+        """저장소 현황"""
+        raise NotImplementedError
+
+    async def aclose(self):
+        """연결 정리"""
+
+
+class InMemorySessionStore(SessionStore):
+    """
+    프로세스 메모리 세션 저장소 (크기 제한)
+
+    - 최대 세션 수 / 최대 바이트(직렬화 크기 기준 근사치) 초과 시 오래 안 쓴 순(LRU)으로 제거
+    - 마지막 사용 후 ttl초가 지난 세션은 만료
+    - 정리는 요청마다 목록 앞쪽(가장 오래 안 쓴 세션)부터 조금씩 진행 (전체 순회 없음)
+    """
+
+    EXPIRE_BATCH = 32  # 요청 한 번에 확인하는 만료 후보 수
+
+    def __init__(
+        self,
+        max_sessions: int = 1000,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: float = 86400,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = clock
+        # 세션 ID → {"messages", "context", "bytes", "context_bytes", "touched"} (앞쪽일수록 오래 안 씀)
+        self._sessions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = {"ttl": 0, "lru": 0, "bytes": 0}
+
+    def _touch(self, session_id: str, entry: Dict[str, Any]):
+        entry["touched"] = self._clock()
+        self._sessions.move_to_end(session_id)
+
+    def _remove(self, session_id: str, reason: str = None):
+        entry = self._sessions.pop(session_id)
+        self.total_bytes -= entry["bytes"]
+        if reason:
+            self.evictions[reason] += 1
+
+    def _evict(self):
+        """만료/초과 세션 정리 (앞쪽에서부터, 만료 확인은 최대 EXPIRE_BATCH개)"""
+        now = self._clock()
+        for _ in range(self.EXPIRE_BATCH):
+            if not self._sessions:
+                break
+            session_id, entry = next(iter(self._sessions.items()))
+            if now - entry["touched"] < self.ttl:
+                break
+            self._remove(session_id, "ttl")
+
+        while len(self._sessions) > self.max_sessions:
+            self._remove(next(iter(self._sessions)), "lru")
+
+        # 방금 사용한 세션(맨 뒤) 하나는 남김
+        while self.total_bytes > self.max_bytes and len(self._sessions) > 1:
+            self._remove(next(iter(self._sessions)), "bytes")
+
+    def _new_entry(self, session_id: str, context: Dict) -> Dict[str, Any]:
+        context_bytes = estimate_bytes(context)
+        entry = {"messages": [], "context": context, "bytes": context_bytes, "context_bytes": context_bytes}
+        if session_id in self._sessions:
+            self._remove(session_id)
+        self._sessions[session_id] = entry
+        self.total_bytes += context_bytes
+        self._touch(session_id, entry)
+        return entry
+
+    async def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._sessions.get(session_id)
+        if entry is not None and self._clock() - entry["touched"] >= self.ttl:
+            self._remove(session_id, "ttl")
+            entry = None
+        if entry is None:
+            self.misses += 1
+            self._evict()
+            return None
+
+        self.hits += 1
+        self._touch(session_id, entry)
+        self._evict()
+        # 메시지 dict는 공유, 목록만 복사 (호출 측 append가 저장본에 섞이지 않도록)
+        return {"messages": list(entry["messages"]), "context": dict(entry["context"])}
+
+    async def create(self, session_id: str, context: Dict = None) -> Dict[str, Any]:
+        self._new_entry(session_id, dict(context or {}))
+        self._evict()
+        return {"messages": [], "context": dict(context or {})}
+
+    async def append(self, session_id: str, messages: List[Dict], context: Dict):
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            # 턴 도중 제거된 세션은 다시 생성
+            entry = self._new_entry(session_id, {})
+
+        context_bytes = estimate_bytes(context)
+        added = sum(estimate_bytes(m) for m in messages) + context_bytes - entry["context_bytes"]
+        entry["messages"].extend(messages)
+        entry["context"] = dict(context)
+        entry["context_bytes"] = context_bytes
+        entry["bytes"] += added
+        self.total_bytes += added
+        self._touch(session_id, entry)
+        self._evict()
+
+    async def delete(self, session_id: str) -> bool:
+        if session_id not in self._sessions:
+            return False
+        self._remove(session_id)
+        return True
+
+    async def stats(self) -> Dict[str, Any]:
+        now = self._clock()
+        oldest = next(iter(self._sessions.values()), None)
+        largest = heapq.nlargest(5, self._sessions.items(), key=lambda item: item[1]["bytes"])
+        return {
+            "backend": "memory",
+            "sessions": len(self._sessions),
+            "bytes": self.total_bytes,
+            "max_sessions": self.max_sessions,
+            "max_bytes": self.max_bytes,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": dict(self.evictions),
+            "oldest_idle_sec": round(now - oldest["touched"], 1) if oldest else 0,
+            "largest": [
+                {"session_id": sid, "bytes": entry["bytes"], "messages": len(entry["messages"])}
+                for sid, entry in largest
+            ]
+        }
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Redis 세션 저장소
+
+    - {prefix}{id}:ctx  : 컨텍스트 (세션 존재 표시 겸용)
+    - {prefix}{id}:msgs : 메시지 리스트 (메시지 하나당 항목 하나, RPUSH로 추가만)
+    - 읽기/쓰기마다 두 키의 TTL 갱신 (마지막 사용 후 ttl초 뒤 만료)
+    - 명령은 파이프라인으로 묶어 턴당 왕복 1회
+
+    client에 redis.asyncio 호환 객체(예: fakeredis.FakeAsyncRedis)를 주입할 수 있다.
+    """
+
+    def __init__(
+        self,
+        client=None,
+        url: str = "redis://localhost:6379",
+        ttl: int = 86400,
+        prefix: str = "dadam:session:"
+    ):
+        if client is None:
+            import redis.asyncio as aioredis
+            client = aioredis.from_url(url)
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _keys(self, session_id: str):
+        base = f"{self.prefix}{session_id}"
+        return f"{base}:ctx", f"{base}:msgs"
+
+    async def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        ctx_key, msgs_key = self._keys(session_id)
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.get(ctx_key)
+            pipe.lrange(msgs_key, 0, -1)
+            pipe.expire(ctx_key, self.ttl)
+            pipe.expire(msgs_key, self.ttl)
+            context, messages, _, _ = await pipe.execute()
+
+        if context is None:
+            return None
+        return {"messages": [decode(m) for m in messages], "context": decode(context)}
+
+    async def create(self, session_id: str, context: Dict = None) -> Dict[str, Any]:
+        ctx_key, msgs_key = self._keys(session_id)
+        context = dict(context or {})
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.delete(msgs_key)  # 컨텍스트만 먼저 만료된 경우 남은 메시지 정리
+            pipe.set(ctx_key, encode(context), ex=self.ttl)
+            await pipe.execute()
+        return {"messages": [], "context": context}
+
+    async def append(self, session_id: str, messages: List[Dict], context: Dict):
+        ctx_key, msgs_key = self._keys(session_id)
+        async with self.client.pipeline(transaction=True) as pipe:
+            if messages:
+                pipe.rpush(msgs_key, *(encode(m) for m in messages))
+                pipe.expire(msgs_key, self.ttl)
+            pipe.set(ctx_key, encode(context), ex=self.ttl)
+            await pipe.execute()
+
+    async def delete(self, session_id: str) -> bool:
+        return await self.client.delete(*self._keys(session_id)) > 0
+
+    async def stats(self) -> Dict[str, Any]:
+        # 세션 수/메모리 집계는 키 전체 순회가 필요해 생략 (만료/제거는 Redis TTL·maxmemory가 처리)
+        return {
+            "backend": "redis",
+            "ttl": self.ttl,
+            "prefix": self.prefix
+        }
+
+    async def aclose(self):
+        await self.client.aclose()
+
+
+def create_session_store() -> SessionStore:
+    """환경 설정에 따른 세션 저장소 (SESSION_STORE=memory|redis)"""
+    backend = os.getenv("SESSION_STORE", "memory").lower()
+    if backend == "redis":
+        return RedisSessionStore(
+            url=os.getenv("REDIS_URL", "redis://localhost:6379"),
+            ttl=int(os.getenv("SESSION_TTL_SEC", "86400"))
+        )
+    return InMemorySessionStore(
+        max_sessions=int(os.getenv("SESSION_MAX", "1000")),
+        max_bytes=int(os.getenv("SESSION_MAX_BYTES", str(64 * 1024 * 1024))),
+        ttl=float(os.getenv("SESSION_TTL_SEC", "86400"))
+    )
@@ -0,0 +1,104 @@
+"""
+에이전트 도구 결과 캐시 - 결정적 도구의 결과를 세션 간 공유
+
+키: (도구명, 정규화된 입력 JSON, 버전)
+    버전 = 냉장고 도구는 카탈로그 체크섬, 치수 도구는 계산 상수 지문
+값: (결과 dict, tool_result용 JSON 문자열) → 적중 시 계산과 json.dumps 모두 생략
+
+결과 dict는 여러 요청이 공유하므로 읽기 전용으로 다룬다.
+"""
+import os
+import json
+from typing import Dict, Any, Callable, Optional, Tuple
+
+from tools.calc_cache import CalculationCache
+
+# 입력에서 빠진 값은 기본값으로 채워 같은 키가 되도록 (_execute_tool 기본값과 동일)
+TOOL_DEFAULTS: Dict[str, Dict[str, Any]] = {
+    "search_fridge": {"query": None, "brand": None, "max_width": None},
+    "recommend_fridge": {"total_height": 2300, "brand": None, "include_tall": False, "top_k": 5},
+    "calculate_fridge_layout": {"include_tall": False},
+    "get_effective_space": {"finish_left": 60, "finish_right": 60},
+}
+
+CACHEABLE_TOOLS = frozenset({
+    "calculate_modules",
+    "search_fridge",
+    "recommend_fridge",
+    "calculate_fridge_layout",
+    "get_effective_space",
+})
+
+
+def _normalize(value: Any) -> Any:
+    """정수/실수를 같은 값으로, 중첩 구조는 재귀 정규화"""
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, int):
+        return float(value)
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def canonical_input(tool_name: str, tool_input: Dict[str, Any]) -> str:
+    """도구 입력 정규화 JSON (기본값 채움, 키 정렬)"""
+    values = {**TOOL_DEFAULTS.get(tool_name, {}), **tool_input}
+    return json.dumps(_normalize(values), sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+
+
+class ToolResultCache:
+    """도구 결과 LRU 캐시 (스레드 안전, 도구 워커 풀에서 동시 호출)"""
+
+    def __init__(self, maxsize: int = 2048):
+        self._cache = CalculationCache(maxsize=maxsize)
+
+    def get_or_compute(
+        self,
+        tool_name: str,
+        tool_input: Dict[str, Any],
+        version: str,
+        compute: Callable[[], Dict[str, Any]]
+    ) -> Tuple[Dict[str, Any], str]:
+        """
+        캐시 조회 후 없으면 계산해 저장
+
+        Returns:
+            (결과 dict, JSON 문자열). 오류 결과와 캐시 대상이 아닌 도구는 저장하지 않음
+        """
+        if tool_name not in CACHEABLE_TOOLS:
+            result = compute()
+            return result, json.dumps(result, ensure_ascii=False)
+
+        key = (tool_name, canonical_input(tool_name, tool_input), version)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        result = compute()
+        entry = (result, json.dumps(result, ensure_ascii=False))
+        if "error" not in result:
+            self._cache.put(key, entry)
+        return entry
+
+    def invalidate(self) -> int:
+        """전체 삭제, 삭제된 항목 수 반환"""
+        return self._cache.invalidate()
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 통계"""
+        return self._cache.stats()
+
+
+# 공유 캐시 (에이전트 인스턴스 간 공유)
+_shared_cache: Optional[ToolResultCache] = None
+
+
+def get_tool_cache() -> ToolResultCache:
+    """프로세스 공유 도구 결과 캐시 (크기: TOOL_CACHE_SIZE 환경 변수)"""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = ToolResultCache(maxsize=int(os.getenv("TOOL_CACHE_SIZE", "2048")))
+    return _shared_cache
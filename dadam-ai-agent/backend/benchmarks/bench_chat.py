@@ -0,0 +1,130 @@
+"""
+채팅 동시성 벤치마크 - 로컬 LLM 대역 서버 상대로 동시 대화 처리량/헬스 체크 지연 측정
+(스트리밍 엔드포인트는 첫 텍스트 토큰까지 시간도 측정)
+
+실행: python -m benchmarks.bench_chat
+"""
+import asyncio
+import json
+import os
+import statistics
+import time
+
+import httpx
+
+from benchmarks.fake_llm import BackgroundServer, FakeLLMServer
+
+LATENCY = 0.3                        # LLM 호출 1회 지연 (초), 대화 1건 = 2회 호출
+CONCURRENCY = (1, 10, 50, 100)
+
+
+def percentile(values, p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+async def probe_health(client: httpx.AsyncClient, stop: asyncio.Event, latencies: list):
+    """부하 중 /api/health 응답 지연 측정 (이벤트 루프가 막히면 커짐)"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get("/api/health")
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(0.02)
+
+
+async def one_chat(client: httpx.AsyncClient, n: int) -> float:
+    start = time.perf_counter()
+    response = await client.post("/api/chat/", json={
+        "message": "2400mm 싱크대 하부장 분배해줘",
+        "session_id": f"bench-{n}-{time.time_ns()}"
+    })
+    response.raise_for_status()
+    return time.perf_counter() - start
+
+
+async def one_stream(client: httpx.AsyncClient, n: int):
+    """(첫 바이트, 첫 텍스트, 전체) 시간"""
+    start = time.perf_counter()
+    first_byte = first_text = None
+    async with client.stream("POST", "/api/chat/stream", json={
+        "message": "2400mm 싱크대 하부장 분배해줘",
+        "session_id": f"bench-stream-{n}-{time.time_ns()}"
+    }) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            now = time.perf_counter() - start
+            if first_byte is None:
+                first_byte = now
+            if not line.startswith("data: ") or line == "data: [DONE]":
+                continue
+            event = json.loads(line[6:])
+            if event["type"] == "error":
+                raise RuntimeError(event["error"])
+            if event["type"] == "text" and first_text is None:
+                first_text = now
+    return first_byte, first_text, time.perf_counter() - start
+
+
+def make_client(base_url: str) -> httpx.AsyncClient:
+    limits = httpx.Limits(max_connections=max(CONCURRENCY) + 10)
+    return httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits)
+
+
+async def run_stream(base_url: str, concurrency: int):
+    async with make_client(base_url) as client:
+        results = await asyncio.gather(*(one_stream(client, n) for n in range(concurrency)))
+
+    first_bytes, first_texts, totals = zip(*results)
+    print(
+        f"스트림 {concurrency:>4} | 첫 바이트 p50 {statistics.median(first_bytes) * 1000:6.1f}ms | "
+        f"첫 텍스트 p50 {statistics.median(first_texts):5.2f}s p95 {percentile(first_texts, 0.95):5.2f}s | "
+        f"전체 p50 {statistics.median(totals):5.2f}s"
+    )
+
+
+async def run(base_url: str, concurrency: int):
+    async with make_client(base_url) as client:
+        stop = asyncio.Event()
+        health: list = []
+        prober = asyncio.create_task(probe_health(client, stop, health))
+
+        start = time.perf_counter()
+        latencies = await asyncio.gather(*(one_chat(client, n) for n in range(concurrency)))
+        wall = time.perf_counter() - start
+
+        stop.set()
+        await prober
+
+    print(
+        f"동시 {concurrency:>4} | 전체 {wall:6.2f}s | 처리량 {concurrency / wall:6.1f} 대화/s | "
+        f"대화 p50 {statistics.median(latencies):5.2f}s p95 {percentile(latencies, 0.95):5.2f}s | "
+        f"health 최대 {max(health) * 1000:7.1f}ms"
+    )
+
+
+async def run_all(base_url: str):
+    for concurrency in CONCURRENCY:
+        await run(base_url, concurrency)
+    for concurrency in CONCURRENCY:
+        await run_stream(base_url, concurrency)
+
+
+def main():
+    with FakeLLMServer(latency=LATENCY) as llm:
+        # 에이전트가 대역 서버를 보도록 설정한 뒤 앱 로드
+        os.environ["ANTHROPIC_BASE_URL"] = llm.base_url
+        os.environ.setdefault("ANTHROPIC_API_KEY", "bench")
+        # 측정 대상은 LLM 경로 (분배 요청이 로컬 의도 라우터/응답 캐시에서 끝나지 않도록)
+        os.environ["INTENT_ROUTER"] = "false"
+        os.environ["RESPONSE_CACHE"] = "false"
+        from main import app
+
+        # 실제 HTTP 서버로 띄워야 스트리밍 응답이 버퍼링 없이 측정됨
+        with BackgroundServer(app) as server:
+            print(f"LLM 대역 지연 {LATENCY * 1000:.0f}ms × 2회/대화 (순차 처리 시 대화당 {2 * LATENCY:.1f}s)")
+            asyncio.run(run_all(server.base_url))
+        print(f"대역 서버 요청 수: {llm.requests}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+모듈 최적화 벤치마크 - 기존 greedy 방식 vs 전역 최적(exact) 방식
+
+실행: python -m benchmarks.bench_optimizer
+"""
+import random
+import time
+
+from tools.module_optimizer import ModuleOptimizer
+
+
+def random_layout(rng: random.Random, fixed_count: int):
+    """임의의 고정 모듈 배치 생성"""
+    modules = []
+    x = 0
+    for _ in range(fixed_count):
+        x += rng.randint(300, 2200)
+        width = rng.choice([600, 800, 900, 1000])
+        modules.append({"x": x, "width": width, "name": "고정"})
+        x += width
+    effective_width = x + rng.randint(300, 2200)
+    return effective_width, modules
+
+
+def run(solver: str, layouts):
+    """레이아웃 목록 최적화 → (호출당 ms, 결과 목록)"""
+    optimizer = ModuleOptimizer()
+    start = time.perf_counter()
+    results = [
+        optimizer.optimize_layout(w, fixed, solver=solver)
+        for w, fixed in layouts
+    ]
+    elapsed = (time.perf_counter() - start) / len(layouts) * 1000
+    return elapsed, results
+
+
+def overlap(result, effective_width: float) -> float:
+    """모듈이 다음 모듈/벽을 침범한 총 길이 (mm) - 0이어야 시공 가능"""
+    modules = sorted(result["modules"], key=lambda m: m["x"])
+    total = 0
+    for cur, nxt in zip(modules, modules[1:]):
+        total += max(0, cur["x"] + cur["width"] - nxt["x"])
+    if modules:
+        total += max(0, modules[-1]["x"] + modules[-1]["width"] - effective_width)
+    return total
+
+
+def summarize(name: str, elapsed: float, layouts, results):
+    """품질 요약 출력"""
+    n = len(results)
+    overlaps = [overlap(r, w) for r, (w, _) in zip(results, layouts)]
+    feasible = [r for r, o in zip(results, overlaps) if o == 0]
+    optimal = sum(1 for r in feasible if r["is_optimal"])
+    mean_left = sum(r["remaining"] for r in feasible) / len(feasible) if feasible else float("nan")
+    print(
+        f"{name:>7} | {elapsed:7.3f} ms/call | 침범 {1 - len(feasible) / n:6.1%} | "
+        f"최적(침범 없음) {optimal / n:6.1%} | 평균 잔여(침범 없음) {mean_left:8.1f}mm"
+    )
+
+
+def main():
+    rng = random.Random(42)
+    for fixed_count in (1, 3, 6, 10, 15):
+        layouts = [random_layout(rng, fixed_count) for _ in range(500)]
+        print(f"\n고정 모듈 {fixed_count}개 (레이아웃 {len(layouts)}개)")
+        for solver in ("greedy", "exact"):
+            elapsed, results = run(solver, layouts)
+            summarize(solver, elapsed, layouts, results)
+
+
+if __name__ == "__main__":
+    main()
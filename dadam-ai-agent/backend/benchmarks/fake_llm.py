@@ -0,0 +1,199 @@
+"""
+벤치마크용 로컬 LLM 대역 서버 - Anthropic Messages API 형식 응답
+
+- 도구 라운드가 tool_rounds번 끝나기 전: 텍스트 + calculate_modules tool_use 2개 (병렬 호출)
+- 그 이후 호출: 텍스트 응답
+- 응답마다 latency 초만큼 대기 (실제 LLM 왕복 시간 흉내)
+- "stream": true 요청은 SSE 이벤트로 응답 (첫 토큰까지 latency의 1/4, 나머지는 조각별로 나눠 전송)
+- cache_control 중단점까지의 접두어를 기억해 usage에 캐시 읽기/쓰기 토큰 수를 돌려줌 (4자 ≈ 1토큰)
+"""
+import asyncio
+import hashlib
+import json
+import re
+import socket
+import threading
+import time
+import uuid
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+ANSWER = "2400mm 공간은 도어 너비 480mm로 5개 도어를 추천합니다."
+WALLS = (2400, 1800)
+
+
+def _chunks(text: str):
+    return re.findall(r"\S+\s*", text)
+
+
+def _usage(body: dict, cache: set) -> dict:
+    """프롬프트 캐시 흉내: 요청 블록 순서(도구 → 시스템 → 메시지)대로 접두어 해시 비교"""
+    system = body.get("system") or []
+    if isinstance(system, str):
+        system = [{"type": "text", "text": system}]
+    blocks = list(body.get("tools") or []) + list(system)
+    for message in body["messages"]:
+        content = message["content"]
+        blocks += [{"type": "text", "text": content}] if isinstance(content, str) else content
+
+    digest = hashlib.sha1()
+    prefixes = []  # 블록 위치별 (접두어 해시, 누적 토큰)
+    written = []
+    tokens = read = last_breakpoint = 0
+    last_hit = False
+    for block in blocks:
+        raw = json.dumps({k: v for k, v in block.items() if k != "cache_control"}, sort_keys=True, ensure_ascii=False)
+        digest.update(raw.encode("utf-8"))
+        tokens += len(raw) // 4
+        prefixes.append((digest.hexdigest(), tokens))
+        if "cache_control" in block:
+            # 실제 API처럼 중단점에서 최대 20블록 앞까지 캐시된 접두어 탐색
+            hits = [size for key, size in prefixes[-20:] if key in cache]
+            if hits:
+                read = max(read, max(hits))
+            last_hit = prefixes[-1][0] in cache
+            written.append(prefixes[-1][0])
+            last_breakpoint = tokens
+    cache.update(written)
+
+    return {
+        "input_tokens": tokens - last_breakpoint,
+        "output_tokens": 80,
+        "cache_read_input_tokens": read,
+        "cache_creation_input_tokens": 0 if last_hit else last_breakpoint - read,
+    }
+
+
+def _message(content, stop_reason: str, model: str, usage: dict = None):
+    return {
+        "id": f"msg_{uuid.uuid4().hex[:24]}",
+        "type": "message",
+        "role": "assistant",
+        "model": model,
+        "content": content,
+        "stop_reason": stop_reason,
+        "stop_sequence": None,
+        "usage": usage or {"input_tokens": 1200, "output_tokens": 80},
+    }
+
+
+def _sse(event: dict) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+
+async def _stream(content, stop_reason: str, model: str, latency: float, usage: dict):
+    """Messages API 스트리밍 이벤트 순서대로 전송"""
+    chunk_delay = latency * 0.75 / max(1, sum(len(_chunks(b["text"])) if b["type"] == "text" else 1 for b in content))
+    await asyncio.sleep(latency * 0.25)
+
+    message = _message([], None, model, {**usage, "output_tokens": 1})
+    yield _sse({"type": "message_start", "message": message})
+
+    for index, block in enumerate(content):
+        if block["type"] == "text":
+            yield _sse({"type": "content_block_start", "index": index, "content_block": {"type": "text", "text": ""}})
+            for chunk in _chunks(block["text"]):
+                yield _sse({"type": "content_block_delta", "index": index, "delta": {"type": "text_delta", "text": chunk}})
+                await asyncio.sleep(chunk_delay)
+        else:
+            yield _sse({"type": "content_block_start", "index": index, "content_block": {**block, "input": {}}})
+            yield _sse({
+                "type": "content_block_delta",
+                "index": index,
+                "delta": {"type": "input_json_delta", "partial_json": json.dumps(block["input"])}
+            })
+            await asyncio.sleep(chunk_delay)
+        yield _sse({"type": "content_block_stop", "index": index})
+
+    yield _sse({
+        "type": "message_delta",
+        "delta": {"stop_reason": stop_reason, "stop_sequence": None},
+        "usage": {"output_tokens": 80}
+    })
+    yield _sse({"type": "message_stop"})
+
+
+def create_app(latency: float = 0.3, tool_rounds: int = 1) -> FastAPI:
+    """대역 서버 앱 (tool_rounds: 텍스트 응답 전까지 도구 호출 라운드 수)"""
+    app = FastAPI()
+    app.state.requests = 0
+    app.state.cache = set()
+
+    @app.post("/v1/messages")
+    async def messages(request: Request):
+        body = await request.json()
+        app.state.requests += 1
+
+        done_rounds = sum(
+            1 for m in body["messages"]
+            if m["role"] == "user" and isinstance(m["content"], list)
+            and any(block.get("type") == "tool_result" for block in m["content"])
+        )
+
+        if done_rounds >= tool_rounds or not body.get("tools"):
+            content = [{"type": "text", "text": ANSWER}]
+            stop_reason = "end_turn"
+        else:
+            content = [{"type": "text", "text": "벽별로 계산해 볼게요."}] + [
+                {
+                    "type": "tool_use",
+                    "id": f"toolu_{uuid.uuid4().hex[:24]}",
+                    "name": "calculate_modules",
+                    "input": {"total_space": wall},
+                }
+                for wall in WALLS
+            ]
+            stop_reason = "tool_use"
+
+        usage = _usage(body, app.state.cache)
+        if body.get("stream"):
+            return StreamingResponse(
+                _stream(content, stop_reason, body["model"], latency, usage),
+                media_type="text/event-stream"
+            )
+
+        await asyncio.sleep(latency)
+        return _message(content, stop_reason, body["model"], usage)
+
+    return app
+
+
+class BackgroundServer:
+    """별도 스레드에서 도는 uvicorn 서버 (with 문으로 시작/종료)"""
+
+    def __init__(self, app):
+        self.app = app
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            self.port = sock.getsockname()[1]
+        self.server = uvicorn.Server(
+            uvicorn.Config(self.app, host="127.0.0.1", port=self.port, log_level="warning")
+        )
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self):
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self.thread.join(timeout=5)
+
+
+class FakeLLMServer(BackgroundServer):
+    """LLM 대역 서버"""
+
+    def __init__(self, latency: float = 0.3, tool_rounds: int = 1):
+        super().__init__(create_app(latency, tool_rounds))
+
+    @property
+    def requests(self) -> int:
+        return self.app.state.requests
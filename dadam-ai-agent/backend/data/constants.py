@@ -9,6 +9,10 @@ DOOR_MIN_WIDTH = 350      # 최소 도어 너비
 MIN_REMAINDER = 4         # 최소 잔여 공간
 MAX_REMAINDER = 10        # 최대 잔여 공간
 
+# 분배 사전 계산 테이블 범위 (정수 mm)
+DISTRIBUTION_TABLE_MIN = 100     # 분배 최소 공간 (distribute_modules 기준)
+DISTRIBUTION_TABLE_MAX = 15000   # 사전 계산 상한
+
 # 도어 간격 (2도어 사이 공간)
 DOOR_GAP = 3              # 2도어 사이 간격 (mm)
 
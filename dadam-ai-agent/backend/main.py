@@ -4,17 +4,31 @@ Vibe Cabinet Agent - AI 기반 가구 설계 백엔드 서버
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import logging
+import os
 import uvicorn
 
 from routers import chat, design, calculate
 from models.schemas import HealthCheck
+from tools.fridge_catalog import get_fridge_catalog
+
+# 앱 로그 (의도 라우팅 등), uvicorn 로그와 별도
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """앱 시작/종료 시 실행"""
     print("🚀 Vibe Cabinet AI Agent 서버 시작...")
+    # 냉장고 카탈로그 파일 감시 (FRIDGE_CATALOG_PATH 설정 시)
+    catalog = get_fridge_catalog()
+    catalog.start()
     yield
+    catalog.stop()
+    await chat.close_agent()
     print("👋 서버 종료")
 
 
@@ -2,7 +2,7 @@
 Pydantic 모델 정의
 """
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any, Literal
+from typing import Optional, List, Dict, Any, Literal, Annotated
 from enum import Enum
 
 
@@ -31,6 +31,10 @@ class ChatResponse(BaseModel):
     suggestions: Optional[List[Dict[str, Any]]] = None
     actions: Optional[List[Dict[str, Any]]] = None  # UI 업데이트 액션
     session_id: str
+    rounds: Optional[List[Dict[str, Any]]] = None  # 도구 루프 라운드별 소요 시간 (ms)
+    history: Optional[Dict[str, Any]] = None  # 히스토리 압축 전후 토큰 수 (근사치)
+    intent: Optional[str] = None  # LLM 없이 로컬 처리한 경우 의도 (distribute, fridge_recommend)
+    cached: Optional[str] = None  # 응답 캐시 적중 종류 (exact, similar)
 
 
 # ============================================================
@@ -116,6 +120,15 @@ class DesignResult(BaseModel):
     summary: str
 
 
+# ============================================================
+# 입력 한도 (계산 메모리가 개수 × 공간 너비에 비례)
+# ============================================================
+
+MAX_BATCH_SPACES = 5000
+MAX_BATCH_WALLS = 1000  # 냉장고 일괄 추천 (벽 × 카탈로그 모델 수)
+MAX_SPACE_WIDTH = 20000  # mm
+
+
 # ============================================================
 # 냉장고 모델
 # ============================================================
@@ -147,6 +160,30 @@ class FridgeDesignRequest(BaseModel):
     model_id: Optional[str] = None
     include_tall: bool = False
     include_homecafe: bool = False
+    top_k: int = Field(5, ge=1, le=50, description="추천 개수")
+
+
+class FridgeWall(BaseModel):
+    total_width: float
+    total_height: float = 2300
+
+
+class FridgeBatchRecommendRequest(BaseModel):
+    walls: List[FridgeWall] = Field(..., max_length=MAX_BATCH_WALLS)
+    brand: Optional[str] = None  # 카탈로그 브랜드 (재로드로 추가될 수 있어 라우터에서 확인)
+    include_tall: bool = False
+    top_k: int = Field(5, ge=1, le=50, description="벽별 추천 개수")
+
+
+class FridgeComboRequest(BaseModel):
+    total_width: float
+    total_height: float = 2300
+    brand: Optional[str] = None  # 카탈로그 브랜드 (재로드로 추가될 수 있어 라우터에서 확인)
+    include_tall: bool = False
+    include_homecafe: bool = False
+    max_appliances: int = Field(3, ge=1, le=3, description="최대 냉장고 수")
+    max_cabinets: int = Field(2, ge=0, le=4, description="최대 키큰장/홈카페장 수")
+    top_k: int = Field(5, ge=1, le=50, description="추천 개수")
 
 
 class FridgeDesignResult(BaseModel):
@@ -160,6 +197,37 @@ class FridgeDesignResult(BaseModel):
     summary: str
 
 
+class PositionRange(BaseModel):
+    start: float = Field(..., description="시작 위치 (mm)")
+    end: float = Field(..., description="끝 위치 (mm)")
+    step: float = Field(1, gt=0, description="간격 (mm)")
+
+
+class SinkUpperSweepRequest(BaseModel):
+    effective_width: float
+    upper_height: float = 720
+    vent_position: Optional[float] = None          # 고정 환풍구 위치
+    distributor_start: Optional[float] = None      # 고정 분배기 시작 위치
+    vent_range: Optional[PositionRange] = None     # 환풍구 스윕 범위
+    distributor_range: Optional[PositionRange] = None  # 분배기 스윕 범위
+
+
+class LayoutCreateRequest(BaseModel):
+    effective_width: float = Field(..., gt=0, le=MAX_SPACE_WIDTH, allow_inf_nan=False)
+    fixed_modules: List[Dict[str, Any]] = []
+    section: Literal["upper", "lower"] = "lower"
+    # 없으면 최적 공통 너비 계산 (도어 최소~최대 범위 밖이면 400)
+    door_width: Optional[float] = Field(None, gt=0, allow_inf_nan=False)
+
+
+class LayoutDeltaRequest(BaseModel):
+    op: Literal["insert", "move", "remove", "reoptimize"]
+    module_id: Optional[str] = None
+    x: Optional[float] = None
+    width: Optional[float] = None
+    module: Optional[Dict[str, Any]] = None  # insert용 고정 모듈
+
+
 # ============================================================
 # 계산 요청/응답
 # ============================================================
@@ -177,3 +245,20 @@ class CalculateResponse(BaseModel):
     remaining: float
     is_optimal: bool
     message: str
+
+
+BatchSpace = Annotated[float, Field(gt=0, le=MAX_SPACE_WIDTH, allow_inf_nan=False)]
+
+
+class BatchDistributeRequest(BaseModel):
+    total_spaces: List[BatchSpace] = Field(
+        ..., max_length=MAX_BATCH_SPACES, description="전체 유효 공간 목록 (mm, 0 초과 20000 이하)"
+    )
+
+
+class BatchDistributeResponse(BaseModel):
+    door_width: List[float]
+    door_count: List[int]
+    remaining: List[float]
+    is_optimal: List[bool]
+    count: int
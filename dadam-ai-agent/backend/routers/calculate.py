@@ -2,31 +2,52 @@
 계산 API 라우터
 """
 from fastapi import APIRouter, Query
+from fastapi.concurrency import run_in_threadpool
 from typing import Optional
 
-from models.schemas import CalculateRequest, CalculateResponse
-from tools.dimension_calc import DimensionCalculator
-from data.constants import (
-    DOOR_TARGET_WIDTH, DOOR_MAX_WIDTH, DOOR_MIN_WIDTH,
-    MIN_REMAINDER, MAX_REMAINDER
+from models.schemas import (
+    CalculateRequest, CalculateResponse,
+    BatchDistributeRequest, BatchDistributeResponse
 )
+from tools.dimension_calc import DimensionCalculator, get_constants as get_calc_constants, reload_constants
+from tools.batch_calc import BatchCalculator
+from tools.distribution_table import get_distribution_table
+from tools.calc_cache import get_calc_cache
 
 router = APIRouter()
-calculator = DimensionCalculator()
+calculator = DimensionCalculator(
+    lookup_table=get_distribution_table(),
+    cache=get_calc_cache()
+)
+batch_calculator = BatchCalculator(calculator)
 
 
 @router.get("/constants")
 async def get_constants():
-    """계산 상수 조회"""
+    """계산 상수 조회 (현재 적용 중인 값)"""
+    return get_calc_constants().to_dict()
+
+
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """계산 캐시 통계 (적중/실패/제거 횟수)"""
     return {
-        "door_target_width": DOOR_TARGET_WIDTH,
-        "door_max_width": DOOR_MAX_WIDTH,
-        "door_min_width": DOOR_MIN_WIDTH,
-        "min_remainder": MIN_REMAINDER,
-        "max_remainder": MAX_REMAINDER
+        **get_calc_cache().stats(),
+        "constants_fingerprint": calculator.fingerprint
     }
 
 
+@router.delete("/cache")
+async def clear_cache():
+    """
+    계산 캐시 초기화 (상수 변경 시)
+
+    data/constants.py를 다시 읽어 모든 계산기에 반영하고, 캐시를 비운 뒤 분배 테이블을 다시 만든다
+    """
+    result = await run_in_threadpool(reload_constants, True)
+    return {"message": "계산 상수를 다시 읽고 캐시를 초기화했습니다", **result}
+
+
 @router.get("/distribute")
 async def distribute_modules(
     total_space: float = Query(..., description="전체 공간 (mm)"),
@@ -50,6 +71,22 @@ async def distribute_modules(
     )
 
 
+@router.post("/distribute/batch", response_model=BatchDistributeResponse)
+async def distribute_modules_batch(request: BatchDistributeRequest):
+    """
+    모듈 균등 분배 일괄 계산
+
+    - total_spaces: 전체 유효 공간 목록 (mm)
+    - 결과는 컬럼형 (door_width[], door_count[], remaining[], is_optimal[])
+    """
+    result = batch_calculator.distribute(request.total_spaces)
+
+    return BatchDistributeResponse(
+        **result,
+        count=len(request.total_spaces)
+    )
+
+
 @router.get("/effective-space")
 async def calculate_effective_space(
     total_width: float = Query(..., description="전체 너비 (mm)"),
@@ -102,7 +139,7 @@ async def find_door_width(
         "door_count": door_count,
         "total_used": used,
         "remaining": remaining,
-        "is_optimal": MIN_REMAINDER <= remaining <= MAX_REMAINDER,
+        "is_optimal": calculator.min_remainder <= remaining <= calculator.max_remainder,
         "status": calculator.get_remain_color(remaining)
     }
 
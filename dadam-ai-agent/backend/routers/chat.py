@@ -8,6 +8,7 @@ import json
 
 from models.schemas import ChatRequest, ChatResponse
 from agents.design_agent import DesignAgent
+from tools.single_flight import get_single_flight, canonical_key
 
 router = APIRouter()
 
@@ -22,6 +23,14 @@ def get_agent() -> DesignAgent:
     return _agent
 
 
+async def close_agent():
+    """에이전트 HTTP 커넥션 풀 정리"""
+    global _agent
+    if _agent is not None:
+        await _agent.aclose()
+        _agent = None
+
+
 @router.post("/", response_model=ChatResponse)
 async def chat(request: ChatRequest):
     """
@@ -33,49 +42,90 @@ async def chat(request: ChatRequest):
     """
     agent = get_agent()
 
-    result = agent.chat(
-        message=request.message,
-        session_id=request.session_id,
-        context=request.context
-    )
+    def run():
+        return agent.chat(
+            message=request.message,
+            session_id=request.session_id,
+            context=request.context
+        )
+
+    # 같은 세션의 같은 메시지가 처리 중이면 (모바일 재시도 등) 그 결과를 함께 받음
+    # 세션 ID가 없으면 요청마다 새 세션이므로 병합하지 않음
+    if request.session_id:
+        result = await get_single_flight().do(
+            "chat",
+            canonical_key([request.session_id, request.message, request.context]),
+            run
+        )
+    else:
+        result = await run()
 
     return ChatResponse(
         message=result["message"],
         session_id=result["session_id"],
         suggestions=result.get("suggestions"),
-        actions=result.get("actions")
+        actions=result.get("actions"),
+        rounds=result.get("rounds"),
+        history=result.get("history"),
+        intent=result.get("intent"),
+        cached=result.get("cached")
     )
 
 
 @router.post("/stream")
 async def chat_stream(request: ChatRequest):
     """
-    스트리밍 채팅 엔드포인트 (향후 구현)
+    스트리밍 채팅 엔드포인트 (SSE)
+
+    이벤트 순서: session → text* → (tool_use → tool_result → text*) → done
+    각 이벤트는 `data: {"type": ...}` 한 줄, 마지막은 `data: [DONE]`
     """
-    # TODO: 스트리밍 응답 구현
     agent = get_agent()
-    result = agent.chat(
-        message=request.message,
-        session_id=request.session_id,
-        context=request.context
-    )
 
     async def generate():
-        # 현재는 단순 응답, 향후 토큰별 스트리밍
-        yield f"data: {json.dumps(result, ensure_ascii=False)}\n\n"
+        async for event in agent.chat_stream(
+            message=request.message,
+            session_id=request.session_id,
+            context=request.context
+        ):
+            yield f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
         yield "data: [DONE]\n\n"
 
     return StreamingResponse(
         generate(),
-        media_type="text/event-stream"
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"  # 프록시 버퍼링 방지
+        }
     )
 
 
+@router.get("/metrics")
+async def chat_metrics():
+    """LLM 호출 지표 (토큰 사용량, 프롬프트 캐시 읽기/쓰기 토큰, 적중률) + 도구 결과 캐시 / 의도 라우터 / 응답 캐시 / 요청 병합 통계"""
+    agent = get_agent()
+    return {
+        **agent.metrics.snapshot(),
+        "tool_cache": agent.tool_cache.stats(),
+        "intent_router": agent.intent_router.stats() if agent.intent_router else None,
+        "response_cache": agent.response_cache.stats() if agent.response_cache else None,
+        "single_flight": get_single_flight().stats()
+    }
+
+
+@router.get("/sessions/stats")
+async def session_stats():
+    """세션 저장소 현황 (세션 수, 메모리 근사치, 제거 횟수 등)"""
+    agent = get_agent()
+    return await agent.session_stats()
+
+
 @router.delete("/session/{session_id}")
 async def clear_session(session_id: str):
     """세션 초기화"""
     agent = get_agent()
-    success = agent.clear_session(session_id)
+    success = await agent.clear_session(session_id)
 
     if not success:
         raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다")
@@ -87,7 +137,7 @@ async def clear_session(session_id: str):
 async def get_session(session_id: str):
     """세션 조회"""
     agent = get_agent()
-    session = agent.get_session(session_id)
+    session = await agent.get_session(session_id)
 
     if not session:
         raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다")
@@ -2,24 +2,46 @@
 설계 API 라우터
 """
 from fastapi import APIRouter, HTTPException, Query
-from typing import Optional, List
+from fastapi.concurrency import run_in_threadpool
+from typing import Optional, List, Literal
+from collections import OrderedDict
+import uuid
 
 from models.schemas import (
-    FridgeDesignRequest, FridgeDesignResult,
-    DesignSpecs, DesignResult
+    FridgeDesignRequest, FridgeDesignResult, FridgeBatchRecommendRequest, FridgeComboRequest,
+    DesignSpecs, DesignResult,
+    PositionRange, SinkUpperSweepRequest,
+    LayoutCreateRequest, LayoutDeltaRequest
 )
 from tools.fridge_lookup import FridgeLookup
 from tools.dimension_calc import DimensionCalculator
+from tools.distribution_table import get_distribution_table
+from tools.calc_cache import get_calc_cache
 from tools.module_optimizer import ModuleOptimizer
-from data.fridge_data import FRIDGE_DATA, CATEGORIES
+from tools.layout_index import IncrementalLayout
+from tools.single_flight import get_single_flight, canonical_key
+from data.fridge_data import CATEGORIES
 
 router = APIRouter()
 
 # 도구 인스턴스
 fridge_lookup = FridgeLookup()
-calculator = DimensionCalculator()
+calculator = DimensionCalculator(
+    lookup_table=get_distribution_table(),
+    cache=get_calc_cache()
+)
 optimizer = ModuleOptimizer()
 
+# 동시에 들어온 동일 요청은 한 번만 계산 (페이지 로드 시 여러 컴포넌트가 같은 요청)
+single_flight = get_single_flight()
+
+# 스윕 최대 위치 조합 수
+MAX_SWEEP_POSITIONS = 20000
+
+# 편집 중인 레이아웃 (오래된 것부터 정리)
+MAX_LAYOUTS = 1000
+layouts: "OrderedDict[str, IncrementalLayout]" = OrderedDict()
+
 
 @router.get("/categories")
 async def get_categories():
@@ -32,12 +54,33 @@ async def get_fridge_brands():
     """냉장고 브랜드 목록"""
     return {
         "brands": [
-            {"id": "LG", "name": "LG"},
-            {"id": "Samsung", "name": "삼성"}
+            {"id": brand, "name": brand_data.get("name", brand)}
+            for brand, brand_data in fridge_lookup.data.items()
         ]
     }
 
 
+@router.get("/fridge/catalog")
+async def get_fridge_catalog_status():
+    """냉장고 카탈로그 상태 (스냅샷 버전, 로드 시각)"""
+    return fridge_lookup.catalog.status()
+
+
+@router.post("/fridge/catalog/reload")
+async def reload_fridge_catalog():
+    """카탈로그 파일 즉시 재로드 (실패 시 기존 스냅샷 유지)"""
+    catalog = fridge_lookup.catalog
+    if not catalog.path:
+        raise HTTPException(status_code=400, detail="카탈로그 파일이 설정되지 않았습니다 (FRIDGE_CATALOG_PATH)")
+
+    try:
+        reloaded = await run_in_threadpool(catalog.reload, True)
+    except (OSError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"카탈로그 로드 실패: {e}")
+
+    return {"reloaded": reloaded, **catalog.status()}
+
+
 @router.get("/fridge/models")
 async def get_fridge_models(
     brand: Optional[str] = Query(None, description="브랜드 필터"),
@@ -45,19 +88,36 @@ async def get_fridge_models(
     max_width: Optional[float] = Query(None, description="최대 너비")
 ):
     """냉장고 모델 목록"""
-    if brand and brand not in FRIDGE_DATA:
+    if brand and brand not in fridge_lookup.data:
         raise HTTPException(status_code=400, detail="잘못된 브랜드입니다")
 
-    models = fridge_lookup.search_models(
-        brand=brand,
-        max_width=max_width
+    def compute():
+        models = fridge_lookup.search_models(
+            brand=brand,
+            max_width=max_width
+        )
+
+        # 카테고리 필터
+        if category:
+            models = [m for m in models if m.get("category") == category]
+
+        return {"models": models, "count": len(models)}
+
+    return await single_flight.do(
+        "fridge_models",
+        canonical_key([brand, category, max_width]),
+        lambda: run_in_threadpool(compute)
     )
 
-    # 카테고리 필터
-    if category:
-        models = [m for m in models if m.get("category") == category]
 
-    return {"models": models, "count": len(models)}
+@router.get("/fridge/autocomplete")
+async def autocomplete_fridge_models(
+    q: str = Query(..., min_length=1, max_length=50, description="입력 중인 검색어"),
+    limit: int = Query(8, ge=1, le=20, description="최대 제안 수")
+):
+    """냉장고 모델 자동완성 (접두어 우선, 띄어쓰기/오타 허용)"""
+    suggestions = fridge_lookup.autocomplete(q, limit)
+    return {"query": q, "suggestions": suggestions, "count": len(suggestions)}
 
 
 @router.get("/fridge/model/{model_id}")
@@ -71,19 +131,99 @@ async def get_fridge_model(model_id: str):
     return {"model": model}
 
 
+@router.get("/fridge/model/{model_id}/walls")
+async def get_fridge_model_walls(model_id: str):
+    """모델이 설치 가능한 벽 너비/높이 구간 (쇼룸 역조회)"""
+    ranges = fridge_lookup.wall_ranges(model_id)
+
+    if not ranges:
+        raise HTTPException(status_code=404, detail="모델을 찾을 수 없습니다")
+
+    return ranges
+
+
+@router.get("/fridge/compatible")
+async def get_compatible_fridges(
+    total_width: float = Query(..., gt=0, description="벽 너비 (mm)"),
+    total_height: Optional[float] = Query(None, gt=0, description="벽 높이 (mm)"),
+    include_tall: bool = Query(False, description="키큰장 포함"),
+    optimal_only: bool = Query(False, description="잔여 4~10mm 모델만")
+):
+    """벽에 맞는 냉장고 모델 (호환 맵 구간 조회)"""
+    models = fridge_lookup.compatible_models(total_width, total_height, include_tall, optimal_only)
+    return {"models": models, "count": len(models)}
+
+
 @router.post("/fridge/recommend")
 async def recommend_fridge(request: FridgeDesignRequest):
     """공간에 맞는 냉장고 추천"""
-    recommendations = fridge_lookup.recommend_for_space(
+    def compute():
+        recommendations = fridge_lookup.recommend_for_space(
+            total_width=request.total_width,
+            total_height=request.total_height or 2300,
+            brand=request.brand,
+            include_tall=request.include_tall,
+            top_k=request.top_k
+        )
+
+        return {
+            "recommendations": recommendations,
+            "count": len(recommendations)
+        }
+
+    return await single_flight.do(
+        "fridge_recommend",
+        canonical_key(request.model_dump()),
+        lambda: run_in_threadpool(compute)
+    )
+
+
+@router.post("/fridge/recommend/batch")
+async def recommend_fridge_batch(request: FridgeBatchRecommendRequest):
+    """여러 벽에 대한 냉장고 일괄 추천 (대량 견적용)"""
+    if request.brand and request.brand not in fridge_lookup.data:
+        raise HTTPException(status_code=400, detail="잘못된 브랜드입니다")
+
+    # 벽 × 모델 행렬 계산은 스레드풀에서 (이벤트 루프 차단 방지)
+    results = await run_in_threadpool(
+        fridge_lookup.recommend_for_walls,
+        walls=[wall.model_dump() for wall in request.walls],
+        brand=request.brand,
+        include_tall=request.include_tall,
+        top_k=request.top_k
+    )
+
+    return {
+        "results": [
+            {"total_width": wall.total_width, "total_height": wall.total_height, "recommendations": recs}
+            for wall, recs in zip(request.walls, results)
+        ],
+        "count": len(results)
+    }
+
+
+@router.post("/fridge/recommend/combo")
+async def recommend_fridge_combo(request: FridgeComboRequest):
+    """벽 채움 조합 추천 (냉장고 1~3대 + 키큰장/홈카페장)"""
+    if request.brand and request.brand not in fridge_lookup.data:
+        raise HTTPException(status_code=400, detail="잘못된 브랜드입니다")
+
+    # 조합 탐색은 스레드풀에서 (이벤트 루프 차단 방지)
+    combinations = await run_in_threadpool(
+        fridge_lookup.recommend_combinations,
         total_width=request.total_width,
-        total_height=request.total_height or 2300,
+        total_height=request.total_height,
         brand=request.brand,
-        include_tall=request.include_tall
+        include_tall=request.include_tall,
+        include_homecafe=request.include_homecafe,
+        max_appliances=request.max_appliances,
+        max_cabinets=request.max_cabinets,
+        top_k=request.top_k
     )
 
     return {
-        "recommendations": recommendations,
-        "count": len(recommendations)
+        "combinations": combinations,
+        "count": len(combinations)
     }
 
 
@@ -125,17 +265,64 @@ async def calculate_sink_upper(
     return result
 
 
+def _sweep_positions(
+    fixed: Optional[float],
+    position_range: Optional[PositionRange],
+    name: str,
+    range_name: str
+) -> List[float]:
+    """고정 위치 또는 범위 → 위치 목록"""
+    if position_range is None:
+        if fixed is None:
+            raise HTTPException(status_code=400, detail=f"{name} 또는 {range_name}가 필요합니다")
+        return [fixed]
+
+    if position_range.end < position_range.start:
+        raise HTTPException(status_code=400, detail=f"{range_name} 범위가 잘못되었습니다")
+
+    count = int((position_range.end - position_range.start) / position_range.step + 1e-9) + 1
+    if count > MAX_SWEEP_POSITIONS:
+        raise HTTPException(status_code=400, detail=f"{name} 위치가 너무 많습니다 (최대 {MAX_SWEEP_POSITIONS}개)")
+    return [position_range.start + i * position_range.step for i in range(count)]
+
+
+@router.post("/sink/upper/sweep")
+async def sweep_sink_upper(request: SinkUpperSweepRequest):
+    """
+    싱크대 상부장 스윕 계산
+
+    - 환풍구/분배기 위치 범위의 모든 레이아웃을 한 번에 반환
+    - 같은 레이아웃은 위치 구간(intervals)으로 병합, layouts 인덱스로 참조
+    """
+    vent_positions = _sweep_positions(request.vent_position, request.vent_range, "vent_position", "vent_range")
+    distributor_starts = _sweep_positions(request.distributor_start, request.distributor_range, "distributor_start", "distributor_range")
+
+    if len(vent_positions) * len(distributor_starts) > MAX_SWEEP_POSITIONS:
+        raise HTTPException(status_code=400, detail=f"위치 조합이 너무 많습니다 (최대 {MAX_SWEEP_POSITIONS}개)")
+
+    return calculator.sweep_upper_section(
+        effective_width=request.effective_width,
+        vent_positions=vent_positions,
+        distributor_starts=distributor_starts,
+        upper_height=request.upper_height
+    )
+
+
 @router.post("/optimize")
 async def optimize_layout(
     effective_width: float,
     fixed_modules: List[dict] = None,
-    section: str = "lower"
+    section: str = "lower",
+    solver: Literal["exact", "greedy"] = Query("exact", description="exact | greedy"),
+    top_k: int = Query(3, ge=1, le=20, description="대안 개수 (exact)")
 ):
     """모듈 레이아웃 최적화"""
     result = optimizer.optimize_layout(
         effective_width=effective_width,
         fixed_modules=fixed_modules,
-        section=section
+        section=section,
+        solver=solver,
+        top_k=top_k
     )
 
     suggestions = optimizer.suggest_improvements(result)
@@ -144,3 +331,88 @@ async def optimize_layout(
         **result,
         "suggestions": suggestions
     }
+
+
+def _get_layout(layout_id: str) -> IncrementalLayout:
+    """편집 레이아웃 조회"""
+    layout = layouts.get(layout_id)
+    if layout is None:
+        raise HTTPException(status_code=404, detail="레이아웃을 찾을 수 없습니다")
+    layouts.move_to_end(layout_id)
+    return layout
+
+
+@router.post("/layout")
+async def create_layout(request: LayoutCreateRequest):
+    """
+    드래그 편집용 레이아웃 생성
+
+    이후 /layout/{layout_id}/delta 로 변경분만 보내면 인접 빈 공간만 다시 계산
+    """
+    try:
+        layout = IncrementalLayout(
+            effective_width=request.effective_width,
+            fixed_modules=request.fixed_modules,
+            section=request.section,
+            door_width=request.door_width,
+            optimizer=optimizer
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    layout_id = str(uuid.uuid4())
+    layouts[layout_id] = layout
+    while len(layouts) > MAX_LAYOUTS:
+        layouts.popitem(last=False)
+
+    return {"layout_id": layout_id, **layout.snapshot()}
+
+
+@router.get("/layout/{layout_id}")
+async def get_layout(layout_id: str):
+    """편집 레이아웃 전체 조회"""
+    return {"layout_id": layout_id, **_get_layout(layout_id).snapshot()}
+
+
+@router.post("/layout/{layout_id}/delta")
+async def apply_layout_delta(layout_id: str, request: LayoutDeltaRequest):
+    """
+    고정 모듈 변경 적용 (insert / move / remove / reoptimize)
+
+    - 변경된 모듈만 diff(added/updated/removed)로 반환
+    - 겹치면 적용하지 않고 applied=false, overlaps 반환
+    - 벽(0 ~ effective_width)을 벗어나면 적용하지 않고 applied=false, out_of_bounds=true 반환
+    """
+    layout = _get_layout(layout_id)
+
+    try:
+        if request.op == "insert":
+            if not request.module:
+                raise HTTPException(status_code=400, detail="module이 필요합니다")
+            return layout.insert(request.module)
+
+        if request.op == "reoptimize":
+            return layout.reoptimize()
+
+        if not request.module_id:
+            raise HTTPException(status_code=400, detail="module_id가 필요합니다")
+
+        if request.op == "remove":
+            return layout.remove(request.module_id)
+
+        if request.x is None:
+            raise HTTPException(status_code=400, detail="x가 필요합니다")
+        return layout.move(request.module_id, request.x, request.width)
+
+    except KeyError:
+        raise HTTPException(status_code=404, detail="모듈을 찾을 수 없습니다")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.delete("/layout/{layout_id}")
+async def delete_layout(layout_id: str):
+    """편집 레이아웃 삭제"""
+    if layouts.pop(layout_id, None) is None:
+        raise HTTPException(status_code=404, detail="레이아웃을 찾을 수 없습니다")
+    return {"message": "레이아웃이 삭제되었습니다", "layout_id": layout_id}
@@ -1,3 +1,14 @@
 from .dimension_calc import DimensionCalculator
+from .distribution_table import DistributionTable, get_distribution_table
+from .batch_calc import BatchCalculator
+from .calc_cache import CalculationCache, get_calc_cache
 from .module_optimizer import ModuleOptimizer
+from .layout_index import IncrementalLayout
 from .fridge_lookup import FridgeLookup
+from .fridge_index import FridgeCatalogIndex
+from .fridge_columns import FridgeColumns
+from .fridge_search import FridgeSearchIndex
+from .fridge_catalog import FridgeCatalog, CatalogSnapshot, get_fridge_catalog
+from .fridge_combo import search_combinations
+from .fridge_compat import FridgeCompatibilityMap
+from .single_flight import SingleFlight, get_single_flight
@@ -0,0 +1,175 @@
+"""
+일괄 치수 계산 도구 - NumPy 벡터화 모듈 분배
+"""
+from typing import List, Dict, Sequence
+
+import numpy as np
+
+from .dimension_calc import DimensionCalculator
+
+
+class BatchCalculator:
+    """
+    여러 공간의 모듈 분배를 한 번에 계산
+
+    DimensionCalculator.find_best_door_width / select_best 와 같은 후보 탐색을
+    (공간 × 도어 개수 × 너비 후보) 배열로 계산한다. 결과는 스칼라 계산과 동일하다.
+    """
+
+    CHUNK_SIZE = 4096  # 한 번에 처리할 공간 개수 (메모리 제한)
+
+    def __init__(self, calculator: DimensionCalculator = None):
+        # 상수는 계산기(공유 스냅샷)에서 매번 읽어 재로드를 반영
+        self.calc = calculator or DimensionCalculator()
+
+    @property
+    def door_target(self) -> float:
+        return self.calc.door_target
+
+    @property
+    def door_max(self) -> float:
+        return self.calc.door_max
+
+    @property
+    def door_min(self) -> float:
+        return self.calc.door_min
+
+    @property
+    def min_remainder(self) -> float:
+        return self.calc.min_remainder
+
+    @property
+    def max_remainder(self) -> float:
+        return self.calc.max_remainder
+
+    def distribute(self, total_spaces: Sequence[float]) -> Dict[str, List]:
+        """
+        일괄 모듈 분배
+
+        Returns:
+            컬럼형 결과 {"door_width": [...], "door_count": [...], "remaining": [...], "is_optimal": [...]}
+        """
+        spaces = np.asarray(total_spaces, dtype=np.float64).reshape(-1)
+
+        door_width = np.zeros(spaces.shape, dtype=np.float64)
+        door_count = np.zeros(spaces.shape, dtype=np.int64)
+        is_optimal = np.zeros(spaces.shape, dtype=bool)
+
+        for start in range(0, len(spaces), self.CHUNK_SIZE):
+            chunk = slice(start, start + self.CHUNK_SIZE)
+            w, c, p = self._distribute_chunk(spaces[chunk])
+            door_width[chunk] = w
+            door_count[chunk] = c
+            is_optimal[chunk] = p
+
+        # 100mm 미만은 분배하지 않으므로 잔여 0
+        remaining = np.where(spaces >= 100, spaces - door_width * door_count, 0.0)
+
+        return {
+            "door_width": door_width.tolist(),
+            "door_count": door_count.tolist(),
+            "remaining": remaining.tolist(),
+            "is_optimal": is_optimal.tolist()
+        }
+
+    def _distribute_chunk(self, spaces: np.ndarray):
+        """공간 배열 하나에 대한 (도어 너비, 도어 개수, 최적 여부)"""
+        n = len(spaces)
+        door_width = np.zeros(n, dtype=np.float64)
+        door_count = np.zeros(n, dtype=np.int64)
+        is_optimal = np.zeros(n, dtype=bool)
+
+        # 100mm 미만은 분배하지 않음
+        active = spaces >= 100
+        if not active.any():
+            return door_width, door_count, is_optimal
+        t = spaces[active]
+
+        # 도어 개수 범위 설정 (select_best와 동일)
+        min_count = np.maximum(1, np.floor(t / self.door_max + 0.999)).astype(np.int64)
+        max_door_count = np.floor(t / self.door_min).astype(np.int64)
+        base_count = np.round(t / self.door_target).astype(np.int64)
+        max_count = np.minimum(max_door_count, np.maximum(base_count + 3, min_count + 5))
+
+        span = int(max(1, (max_count - min_count + 1).max()))
+        counts = min_count[:, None] + np.arange(span)[None, :]        # (m, k)
+        in_range = counts <= max_count[:, None]
+        safe_counts = np.where(in_range, counts, 1)
+
+        width, primary, valid = self._best_door_width(t, safe_counts)
+        valid &= in_range
+
+        # 정렬 키: is_primary 우선 → target_diff → gap → 도어 개수 순
+        gap = t[:, None] - width * safe_counts
+        target_diff = np.abs(width - self.door_target)
+        has_primary = (valid & primary).any(axis=1)
+        cand = valid & (primary == has_primary[:, None])
+        cand = self._keep_min(cand, target_diff)
+        cand = self._keep_min(cand, gap)
+
+        found = cand.any(axis=1)
+        pick = np.argmax(cand, axis=1)
+        rows = np.arange(len(t))
+
+        best_width = width[rows, pick]
+        best_count = safe_counts[rows, pick]
+        best_primary = primary[rows, pick] & found
+
+        # 후보 없음 → 강제 계산
+        if not found.all():
+            forced = ~found
+            ideal_count = base_count[forced]
+            count = np.maximum(min_count[forced], np.minimum(max_door_count[forced], ideal_count))
+            w = np.trunc(t[forced] / count / 2) * 2
+            w = np.maximum(self.door_min, np.minimum(self.door_max, w))
+            best_width[forced] = w
+            best_count[forced] = count
+
+        door_width[active] = best_width
+        door_count[active] = best_count
+        is_optimal[active] = best_primary
+        return door_width, door_count, is_optimal
+
+    def _best_door_width(self, t: np.ndarray, counts: np.ndarray):
+        """
+        find_best_door_width 벡터화
+
+        Returns:
+            (width, is_primary, valid) - 각각 (m, k) 배열
+        """
+        raw = t[:, None] / counts
+        in_limits = (raw <= self.door_max) & (raw >= self.door_min)
+
+        # 후보: 10단위 내림/올림 (우선순위 1), 짝수 내림/올림 (우선순위 2)
+        cands = np.stack([
+            (raw // 10) * 10,
+            ((raw + 9) // 10) * 10,
+            (raw // 2) * 2,
+            ((raw + 1) // 2) * 2,
+        ], axis=-1)                                                 # (m, k, 4)
+        priority = np.array([1, 1, 2, 2])
+
+        gap = t[:, None, None] - cands * counts[:, :, None]
+        ok = (cands >= self.door_min) & (cands <= self.door_max) & (gap >= 0)
+        primary = ok & (gap >= self.min_remainder) & (gap <= self.max_remainder)
+        secondary = ok & (gap < self.min_remainder)
+
+        has_primary = primary.any(axis=-1)
+        cand = np.where(has_primary[..., None], primary, secondary)
+        cand = self._keep_min(cand, np.broadcast_to(priority, cand.shape))
+        cand = self._keep_min(cand, gap)
+
+        valid = in_limits & cand.any(axis=-1)
+        pick = np.argmax(cand, axis=-1)
+        width = np.take_along_axis(cands, pick[..., None], axis=-1)[..., 0]
+
+        # 선택된 너비의 잔여 공간이 4~10mm인지 다시 판정
+        best_gap = t[:, None] - width * counts
+        is_primary = (best_gap >= self.min_remainder) & (best_gap <= self.max_remainder)
+        return width, is_primary, valid
+
+    @staticmethod
+    def _keep_min(mask: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """마지막 축에서 mask 중 values가 최소인 위치만 남김"""
+        masked = np.where(mask, values, np.inf)
+        return mask & (masked == masked.min(axis=-1, keepdims=True))
@@ -0,0 +1,140 @@
+"""
+치수 계산 결과 캐시 - 입력값과 상수 지문 기반 LRU 캐시
+"""
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import wraps
+from typing import Dict, Any, Optional, Hashable
+
+
+class CalculationCache:
+    """
+    크기 제한 LRU 캐시 (스레드 안전)
+
+    - 키: (메서드명, 정규화된 입력, 상수 지문)
+    - 적중/실패/제거 횟수 집계
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """캐시 조회 (없으면 None)"""
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        """캐시 저장 (초과분은 오래된 순으로 제거)"""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self) -> int:
+        """전체 캐시 삭제 (상수 변경 시), 삭제된 항목 수 반환"""
+        with self._lock:
+            count = len(self._data)
+            self._data.clear()
+            return count
+
+    def resize(self, maxsize: int):
+        """캐시 크기 변경"""
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._data) > max(0, maxsize):
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 통계"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0
+            }
+
+
+def constants_fingerprint(*values: Any) -> str:
+    """계산 상수 지문 (상수가 바뀌면 캐시 키가 달라짐)"""
+    return hashlib.sha1(repr(values).encode("utf-8")).hexdigest()[:12]
+
+
+def _canonical(value: Any) -> Any:
+    """캐시 키용 입력값 정규화 - 정수/실수를 같은 키로 (계산에는 원래 값 사용)"""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return float(value)
+    return value
+
+
+def _clone(result: Any) -> Any:
+    """결과 복사 (호출자가 결과를 수정해도 캐시가 오염되지 않도록)"""
+    if isinstance(result, dict):
+        return {k: _clone(v) for k, v in result.items()}
+    if isinstance(result, list):
+        return [_clone(v) for v in result]
+    return result
+
+
+def cached_calculation(method):
+    """
+    DimensionCalculator 메서드 캐시 데코레이터
+
+    인스턴스에 cache가 없으면 그대로 계산한다.
+    """
+    name = method.__name__
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        cache = self.cache
+        if cache is None:
+            return method(self, *args, **kwargs)
+
+        key = (
+            name,
+            tuple(_canonical(a) for a in args),
+            tuple(sorted((k, _canonical(v)) for k, v in kwargs.items())),
+            self.fingerprint
+        )
+        cached = cache.get(key)
+        if cached is not None:
+            return _clone(cached)
+
+        result = method(self, *args, **kwargs)
+        cache.put(key, _clone(result))
+        return result
+
+    return wrapper
+
+
+# 공유 캐시 (라우터/최적화 도구/에이전트의 계산기 인스턴스가 함께 사용)
+_shared_cache: Optional[CalculationCache] = None
+
+
+def get_calc_cache() -> CalculationCache:
+    """프로세스 공유 계산 캐시 (크기: CALC_CACHE_SIZE 환경 변수)"""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = CalculationCache(maxsize=int(os.getenv("CALC_CACHE_SIZE", "4096")))
+    return _shared_cache
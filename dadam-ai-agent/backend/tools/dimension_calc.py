@@ -1,22 +1,173 @@
 """
 치수 계산 도구 - 기존 JavaScript 로직을 Python으로 마이그레이션
 """
-from typing import List, Dict, Any, Optional, Tuple
-from data.constants import (
-    DOOR_TARGET_WIDTH, DOOR_MAX_WIDTH, DOOR_MIN_WIDTH,
-    MIN_REMAINDER, MAX_REMAINDER, CATEGORY_DOOR_RULES
-)
+from collections import OrderedDict
+import json
+import importlib
+import threading
+from typing import List, Dict, Any, Optional, Tuple, Callable
+from data import constants
+from .calc_cache import cached_calculation, constants_fingerprint, get_calc_cache
+
+
+class CalcConstants:
+    """계산 상수 스냅샷 (생성 후 수정하지 않고 재로드 시 통째로 교체)"""
+
+    def __init__(self):
+        self.door_target = constants.DOOR_TARGET_WIDTH
+        self.door_max = constants.DOOR_MAX_WIDTH
+        self.door_min = constants.DOOR_MIN_WIDTH
+        self.min_remainder = constants.MIN_REMAINDER
+        self.max_remainder = constants.MAX_REMAINDER
+        self.category_rules = constants.CATEGORY_DOOR_RULES
+        self.fingerprint = constants_fingerprint(
+            self.door_target, self.door_max, self.door_min,
+            self.min_remainder, self.max_remainder,
+            self.category_rules
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """상수 조회 응답"""
+        return {
+            "door_target_width": self.door_target,
+            "door_max_width": self.door_max,
+            "door_min_width": self.door_min,
+            "min_remainder": self.min_remainder,
+            "max_remainder": self.max_remainder,
+            "fingerprint": self.fingerprint
+        }
+
+
+# 프로세스 공유 상수 (모든 DimensionCalculator 인스턴스가 같은 스냅샷을 본다)
+_constants: Optional[CalcConstants] = None
+
+
+def get_constants() -> CalcConstants:
+    """현재 계산 상수"""
+    global _constants
+    if _constants is None:
+        _constants = CalcConstants()
+    return _constants
+
+
+def reload_constants(reread: bool = False) -> Dict[str, Any]:
+    """
+    계산 상수 재로드 (모든 계산기 인스턴스에 반영)
+
+    - reread: data/constants.py 파일을 다시 읽음
+    - 공유 계산 캐시를 비우고, 공유 분배 테이블이 있으면 새 상수로 다시 만든다
+      (재생성 중에는 지문이 달라 테이블 조회를 건너뛰고 직접 계산)
+    """
+    global _constants
+    if reread:
+        importlib.reload(constants)
+    _constants = CalcConstants()
+    removed = get_calc_cache().invalidate()
+
+    # distribution_table이 이 모듈을 import하므로 지연 import
+    from .distribution_table import rebuild_distribution_table
+    table_rebuilt = rebuild_distribution_table()
+
+    return {"fingerprint": _constants.fingerprint, "removed": removed, "table_rebuilt": table_rebuilt}
+
+
+def _pack_2d_1d(door_count: int, door_width: float) -> List[Dict[str, Any]]:
+    """일반 분배: 도어개수/2 → 몫*2D, 나머지*1D"""
+    modules = []
+
+    # 2D 모듈 (몫 개)
+    for i in range(door_count // 2):
+        modules.append({
+            "width": door_width * 2,
+            "is_2d": True,
+            "door_count": 2
+        })
+
+    # 1D 모듈 (나머지 개)
+    if door_count % 2 > 0:
+        modules.append({
+            "width": door_width,
+            "is_2d": False,
+            "door_count": 1
+        })
+
+    return modules
+
+
+def _pack_single_door(door_count: int, door_width: float) -> List[Dict[str, Any]]:
+    """냉장고장 상부장: 모든 모듈을 1D로 생성"""
+    return [
+        {"width": door_width, "is_2d": False, "door_count": 1}
+        for _ in range(door_count)
+    ]
+
+
+# 패킹 전략 (후보 탐색 결과 → 모듈 구성)
+# fields: 결과에 추가되는 표시 필드
+PACKING_STRATEGIES = {
+    "2d_1d": {"pack": _pack_2d_1d, "fields": {}},
+    "single_door": {"pack": _pack_single_door, "fields": {"is_single_door_mode": True}},
+}
 
 
 class DimensionCalculator:
     """가구 치수 계산 도구"""
 
-    def __init__(self):
-        self.door_target = DOOR_TARGET_WIDTH
-        self.door_max = DOOR_MAX_WIDTH
-        self.door_min = DOOR_MIN_WIDTH
-        self.min_remainder = MIN_REMAINDER
-        self.max_remainder = MAX_REMAINDER
+    SEARCH_CACHE_SIZE = 1024  # 공간별 후보 탐색 결과 보관 개수
+
+    def __init__(self, lookup_table=None, cache=None):
+        """
+        Args:
+            lookup_table: 사전 계산된 분배 테이블 (tools.distribution_table.DistributionTable, 선택)
+            cache: 계산 결과 캐시 (tools.calc_cache.CalculationCache, 선택)
+        """
+        self.lookup_table = lookup_table
+        self.cache = cache
+        self._search_cache: "OrderedDict[Tuple[float, str], List[Dict[str, Any]]]" = OrderedDict()
+        # 에이전트 도구 워커 등 여러 스레드가 같은 인스턴스를 쓰므로 보관소 접근은 잠금
+        self._search_lock = threading.Lock()
+
+    # 상수는 공유 스냅샷에서 읽음 (재로드가 모든 인스턴스에 바로 반영)
+    @property
+    def calc_constants(self) -> CalcConstants:
+        return get_constants()
+
+    @property
+    def door_target(self) -> float:
+        return get_constants().door_target
+
+    @property
+    def door_max(self) -> float:
+        return get_constants().door_max
+
+    @property
+    def door_min(self) -> float:
+        return get_constants().door_min
+
+    @property
+    def min_remainder(self) -> float:
+        return get_constants().min_remainder
+
+    @property
+    def max_remainder(self) -> float:
+        return get_constants().max_remainder
+
+    @property
+    def fingerprint(self) -> str:
+        return get_constants().fingerprint
+
+    def reload_constants(self, reread: bool = False) -> Dict[str, Any]:
+        """
+        상수 변경 반영 (모듈 함수 reload_constants와 같음, 모든 인스턴스에 적용)
+        - 지문이 바뀌므로 이전 캐시 항목은 더 이상 조회되지 않음
+        - 공유 캐시도 명시적으로 비움
+        """
+        with self._search_lock:
+            self._search_cache.clear()
+        result = reload_constants(reread)
+        if self.cache is not None:
+            self.cache.invalidate()
+        return result
 
     def find_best_door_width(self, total_space: float, door_count: int) -> Optional[float]:
         """
@@ -85,19 +236,22 @@ class DimensionCalculator:
 
         return None
 
-    def distribute_modules(self, total_space: float) -> Dict[str, Any]:
+    def search_candidates(self, total_space: float) -> List[Dict[str, Any]]:
         """
-        모듈 균등 분배
-        - 도어개수/2 → 몫*2D, 나머지*1D
+        후보 탐색 (공간당 1회)
+        - 도어 개수별 최적 너비를 구해 순위순으로 반환
+        - 정렬: is_primary 우선 → target_diff 작은 순 → gap 작은 순
+        - 결과는 공간별로 보관되어 여러 패킹 전략이 함께 사용 (읽기 전용)
         """
-        if total_space < 100:
-            return {"modules": [], "door_width": 0, "door_count": 0, "remaining": 0}
+        key = (total_space, self.fingerprint)
+        with self._search_lock:
+            ranked = self._search_cache.get(key)
+            if ranked is not None:
+                self._search_cache.move_to_end(key)
+                return ranked
 
         # 도어 개수 범위 설정
-        min_count = max(1, int(total_space / self.door_max + 0.999))
-        max_door_count = int(total_space / self.door_min)
-        base_count = round(total_space / self.door_target)
-        max_count = min(max_door_count, max(base_count + 3, min_count + 5))
+        min_count, max_door_count, max_count = self._count_range(total_space)
 
         all_results = []
 
@@ -116,124 +270,114 @@ class DimensionCalculator:
                     "is_primary": is_primary
                 })
 
-        # 정렬: is_primary 우선 → target_diff 작은 순 → gap 작은 순
         all_results.sort(key=lambda x: (not x["is_primary"], x["target_diff"], x["gap"]))
 
-        if all_results:
-            best = all_results[0]
-        else:
-            # 강제 계산
-            ideal_count = round(total_space / self.door_target)
-            count = max(min_count, min(max_door_count, ideal_count))
-            width = int(total_space / count / 2) * 2
-            width = max(self.door_min, min(self.door_max, width))
-            best = {
-                "door_count": count,
-                "door_width": width,
-                "gap": total_space - (width * count)
-            }
-
-        door_count = best["door_count"]
-        door_width = best["door_width"]
-        quotient = door_count // 2
-        remainder = door_count % 2
-
-        modules = []
-
-        # 2D 모듈 (몫 개)
-        for i in range(quotient):
-            modules.append({
-                "width": door_width * 2,
-                "is_2d": True,
-                "door_count": 2
-            })
-
-        # 1D 모듈 (나머지 개)
-        if remainder > 0:
-            modules.append({
-                "width": door_width,
-                "is_2d": False,
-                "door_count": 1
-            })
-
-        return {
-            "modules": modules,
-            "door_width": door_width,
-            "door_count": door_count,
-            "remaining": total_space - (door_width * door_count),
-            "is_optimal": best.get("is_primary", False)
-        }
-
-    def distribute_modules_single_door(self, total_space: float) -> Dict[str, Any]:
-        """
-        냉장고장 상부장 전용 모듈 분배
-        - 가로너비 분배규칙 미적용
-        - 모듈 하나에 도어 하나만 생성 (모두 1D)
-        """
-        if total_space < 100:
-            return {"modules": [], "door_width": 0, "door_count": 0, "remaining": 0}
+        with self._search_lock:
+            self._search_cache[key] = all_results
+            self._search_cache.move_to_end(key)
+            while len(self._search_cache) > self.SEARCH_CACHE_SIZE:
+                self._search_cache.popitem(last=False)
+        return all_results
 
-        # 도어 개수 범위 설정
+    def _count_range(self, total_space: float) -> Tuple[int, int, int]:
+        """도어 개수 범위 (min_count, max_door_count, max_count)"""
         min_count = max(1, int(total_space / self.door_max + 0.999))
         max_door_count = int(total_space / self.door_min)
         base_count = round(total_space / self.door_target)
         max_count = min(max_door_count, max(base_count + 3, min_count + 5))
+        return min_count, max_door_count, max_count
 
-        all_results = []
+    def select_best(self, total_space: float) -> Dict[str, Any]:
+        """
+        최적 도어 개수/너비 선택
+        - 사전 계산 테이블이 있으면 조회 (정수 mm만 해당)
+        - 후보 탐색 결과의 1순위
+        - 조건을 만족하는 후보가 없으면 강제 계산
+        """
+        if self.lookup_table is not None:
+            # 테이블이 다른 상수로 만들어졌으면 None
+            best = self.lookup_table.lookup(total_space, self.fingerprint)
+            if best is not None:
+                return best
+
+        ranked = self.search_candidates(total_space)
+        if ranked:
+            return ranked[0]
+
+        # 강제 계산
+        min_count, max_door_count, _ = self._count_range(total_space)
+        ideal_count = round(total_space / self.door_target)
+        count = max(min_count, min(max_door_count, ideal_count))
+        width = int(total_space / count / 2) * 2
+        width = max(self.door_min, min(self.door_max, width))
+        return {
+            "door_count": count,
+            "door_width": width,
+            "gap": total_space - (width * count)
+        }
 
-        for count in range(min_count, max_count + 1):
-            width = self.find_best_door_width(total_space, count)
-            if width is not None:
-                gap = total_space - (width * count)
-                target_diff = abs(width - self.door_target)
-                is_primary = self.min_remainder <= gap <= self.max_remainder
+    def packing_for(self, category: str = None, is_upper: bool = False) -> str:
+        """
+        카테고리 규칙(CATEGORY_DOOR_RULES)에 맞는 패킹 전략 이름
+        - 상부장 + upper_single_door_per_module: 모듈당 1도어
+        - 그 외: 2D+1D
+        """
+        rules = self.calc_constants.category_rules.get(category, {}) if category else {}
+        if is_upper and rules.get("upper_single_door_per_module", False):
+            return "single_door"
+        return "2d_1d"
 
-                all_results.append({
-                    "door_count": count,
-                    "door_width": width,
-                    "gap": gap,
-                    "target_diff": target_diff,
-                    "is_primary": is_primary
-                })
+    def distribute(self, total_space: float, packing: str = "2d_1d") -> Dict[str, Any]:
+        """
+        패킹 전략을 적용한 모듈 분배
 
-        # 정렬: is_primary 우선 → target_diff 작은 순 → gap 작은 순
-        all_results.sort(key=lambda x: (not x["is_primary"], x["target_diff"], x["gap"]))
+        Args:
+            total_space: 전체 공간 (mm)
+            packing: PACKING_STRATEGIES 키 ("2d_1d" | "single_door")
+        """
+        strategy = PACKING_STRATEGIES[packing]
 
-        if all_results:
-            best = all_results[0]
-        else:
-            # 강제 계산
-            ideal_count = round(total_space / self.door_target)
-            count = max(min_count, min(max_door_count, ideal_count))
-            width = int(total_space / count / 2) * 2
-            width = max(self.door_min, min(self.door_max, width))
-            best = {
-                "door_count": count,
-                "door_width": width,
-                "gap": total_space - (width * count)
-            }
+        if total_space < 100:
+            return {"modules": [], "door_width": 0, "door_count": 0, "remaining": 0}
 
+        best = self.select_best(total_space)
         door_count = best["door_count"]
         door_width = best["door_width"]
 
-        # 냉장고장 상부장: 모든 모듈을 1D로 생성
-        modules = []
-        for i in range(door_count):
-            modules.append({
-                "width": door_width,
-                "is_2d": False,
-                "door_count": 1
-            })
-
         return {
-            "modules": modules,
+            "modules": strategy["pack"](door_count, door_width),
             "door_width": door_width,
             "door_count": door_count,
             "remaining": total_space - (door_width * door_count),
             "is_optimal": best.get("is_primary", False),
-            "is_single_door_mode": True  # 단일 도어 모드 표시
+            **strategy["fields"]
         }
 
+    def distribute_many(self, total_space: float, packings: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        같은 공간에 여러 패킹 전략 적용 (후보 탐색은 1회)
+        예: 냉장고장 상부장(single_door) + 하부장(2d_1d)
+        """
+        return {packing: self.distribute(total_space, packing) for packing in packings}
+
+    @cached_calculation
+    def distribute_modules(self, total_space: float) -> Dict[str, Any]:
+        """
+        모듈 균등 분배
+        - 도어개수/2 → 몫*2D, 나머지*1D
+        """
+        return self.distribute(total_space, "2d_1d")
+
+    @cached_calculation
+    def distribute_modules_single_door(self, total_space: float) -> Dict[str, Any]:
+        """
+        냉장고장 상부장 전용 모듈 분배
+        - 가로너비 분배규칙 미적용
+        - 모듈 하나에 도어 하나만 생성 (모두 1D)
+        """
+        return self.distribute(total_space, "single_door")
+
+    @cached_calculation
     def distribute_modules_for_category(
         self,
         total_space: float,
@@ -245,14 +389,7 @@ class DimensionCalculator:
         - 냉장고장 상부장: 모듈당 1도어만 생성
         - 그 외: 일반 분배규칙 적용
         """
-        # 냉장고장 상부장 특별 규칙 확인
-        if category == "fridge" and is_upper:
-            fridge_rules = CATEGORY_DOOR_RULES.get("fridge", {})
-            if fridge_rules.get("upper_single_door_per_module", False):
-                return self.distribute_modules_single_door(total_space)
-
-        # 일반 분배규칙 적용
-        return self.distribute_modules(total_space)
+        return self.distribute(total_space, self.packing_for(category, is_upper))
 
     def calc_effective_space(
         self,
@@ -273,6 +410,7 @@ class DimensionCalculator:
             return "success"  # 0~10mm
         return "info"  # 11~15mm
 
+    @cached_calculation
     def calculate_upper_section(
         self,
         effective_width: float,
@@ -285,6 +423,20 @@ class DimensionCalculator:
         - 후드장: 환풍구 중앙 정렬
         - 기준상부장: 개수대 중앙 정렬 (2D)
         """
+        return self._upper_section(
+            effective_width, distributor_start, vent_position, upper_height,
+            self.distribute_modules
+        )
+
+    def _upper_section(
+        self,
+        effective_width: float,
+        distributor_start: float,
+        vent_position: float,
+        upper_height: float,
+        distribute: Callable[[float], Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """상부장 계산 본체 (distribute: 하위 공간 분배 함수)"""
         hood_width = 800
         sink_width = 1000
 
@@ -295,11 +447,11 @@ class DimensionCalculator:
         # 후드 위치
         hood_x = max(0, min(vent_position - hood_width / 2, effective_width - hood_width))
 
-        # 후드 제외 공간에서 도어 계산
+        # 후드 제외 공간에서 도어 너비 계산 (모듈 구성은 불필요)
         space_exclude_hood = effective_width - hood_width
-        result = self.distribute_modules(space_exclude_hood)
+        door_width = self.select_best(space_exclude_hood)["door_width"] if space_exclude_hood >= 100 else 0
 
-        base_width = result["door_width"] * 2
+        base_width = door_width * 2
         base_x = sink_center - (base_width / 2)
         base_x = max(0, min(base_x, effective_width - base_width))
 
@@ -308,7 +460,7 @@ class DimensionCalculator:
         # 좌측 공간
         left_space = min(hood_x, base_x)
         if left_space > 100:
-            left_modules = self.distribute_modules(left_space)
+            left_modules = distribute(left_space)
             for m in left_modules["modules"]:
                 modules.append({
                     **m,
@@ -332,7 +484,7 @@ class DimensionCalculator:
             middle_start = hood_x + hood_width
             middle_space = base_x - middle_start
             if middle_space > 100:
-                middle_modules = self.distribute_modules(middle_space)
+                middle_modules = distribute(middle_space)
                 for m in middle_modules["modules"]:
                     modules.append({
                         **m,
@@ -367,7 +519,7 @@ class DimensionCalculator:
             middle_start = base_x + base_width
             middle_space = hood_x - middle_start
             if middle_space > 100:
-                middle_modules = self.distribute_modules(middle_space)
+                middle_modules = distribute(middle_space)
                 for m in middle_modules["modules"]:
                     modules.append({
                         **m,
@@ -390,7 +542,7 @@ class DimensionCalculator:
         right_start = max(hood_x + hood_width, base_x + base_width)
         right_space = effective_width - right_start
         if right_space > 100:
-            right_modules = self.distribute_modules(right_space)
+            right_modules = distribute(right_space)
             for m in right_modules["modules"]:
                 modules.append({
                     **m,
@@ -404,7 +556,80 @@ class DimensionCalculator:
 
         return {
             "modules": modules,
-            "door_width": result["door_width"],
+            "door_width": door_width,
             "total_used": total_used,
             "remaining": effective_width - total_used
         }
+
+    def sweep_upper_section(
+        self,
+        effective_width: float,
+        vent_positions: List[float],
+        distributor_starts: List[float],
+        upper_height: float = 720
+    ) -> Dict[str, Any]:
+        """
+        상부장 계산 일괄 스윕 (슬라이더 드래그용)
+        - 환풍구 위치 × 분배기 시작 위치 모든 조합의 레이아웃 계산
+        - 같은 결과는 위치 구간으로 병합
+        - 하위 공간 분배는 스윕 내에서 공간별 1회만 계산
+
+        Returns:
+            {"layouts": [고유 레이아웃], "intervals": [{vent/distributor 구간, layout 인덱스}]}
+        """
+        memo: Dict[float, Dict[str, Any]] = {}
+
+        def distribute(space: float) -> Dict[str, Any]:
+            if space not in memo:
+                memo[space] = self.distribute_modules(space)
+            return memo[space]
+
+        layouts: List[Dict[str, Any]] = []
+        layout_index: Dict[str, int] = {}
+        intervals: List[Dict[str, Any]] = []
+        open_intervals: Dict[Tuple[float, float, int], Dict[str, Any]] = {}
+
+        for distributor_start in distributor_starts:
+            # 환풍구 축으로 같은 결과 병합
+            row: List[Dict[str, Any]] = []
+            for vent_position in vent_positions:
+                layout = self._upper_section(
+                    effective_width, distributor_start, vent_position, upper_height, distribute
+                )
+                key = json.dumps(layout, sort_keys=True, ensure_ascii=False)
+                idx = layout_index.get(key)
+                if idx is None:
+                    idx = layout_index[key] = len(layouts)
+                    layouts.append(layout)
+
+                if row and row[-1]["layout"] == idx:
+                    row[-1]["vent_end"] = vent_position
+                else:
+                    row.append({"vent_start": vent_position, "vent_end": vent_position, "layout": idx})
+
+            # 이전 분배기 위치와 같은 구간이면 분배기 축으로 병합
+            next_open = {}
+            for seg in row:
+                seg_key = (seg["vent_start"], seg["vent_end"], seg["layout"])
+                interval = open_intervals.get(seg_key)
+                if interval is None:
+                    interval = {
+                        "vent_start": seg["vent_start"],
+                        "vent_end": seg["vent_end"],
+                        "distributor_start": distributor_start,
+                        "distributor_end": distributor_start,
+                        "layout": seg["layout"]
+                    }
+                    intervals.append(interval)
+                else:
+                    interval["distributor_end"] = distributor_start
+                next_open[seg_key] = interval
+            open_intervals = next_open
+
+        return {
+            "effective_width": effective_width,
+            "position_count": len(vent_positions) * len(distributor_starts),
+            "layouts": layouts,
+            "intervals": intervals,
+            "subspace_count": len(memo)
+        }
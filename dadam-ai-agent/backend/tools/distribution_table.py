@@ -0,0 +1,128 @@
+"""
+모듈 분배 사전 계산 테이블 - 정수 mm 공간에 대한 O(1) 조회
+"""
+from array import array
+from typing import Dict, Any, Optional, Tuple
+
+from data.constants import DISTRIBUTION_TABLE_MIN, DISTRIBUTION_TABLE_MAX
+from .dimension_calc import DimensionCalculator
+
+# 플래그 비트
+FLAG_PRIMARY = 1   # 잔여 4~10mm 조건 만족
+FLAG_FORCED = 2    # 후보 없음 → 강제 계산 결과 (도어 너비 int)
+
+
+class DistributionTable:
+    """
+    정수 mm 공간별 최적 (도어 개수, 도어 너비, 플래그) 테이블
+
+    - 도어 너비/개수는 항상 정수이므로 array('H')로 압축 저장
+    - 잔여 공간은 조회 시 입력값으로 다시 계산 (입력 타입 유지)
+    - 상수 재로드 시 rebuild()로 새 배열을 만든 뒤 (지문, 배열) 묶음을 한 번에 교체
+    """
+
+    def __init__(
+        self,
+        min_space: int = DISTRIBUTION_TABLE_MIN,
+        max_space: int = DISTRIBUTION_TABLE_MAX,
+        calculator: DimensionCalculator = None
+    ):
+        self.min_space = min_space
+        self.max_space = max_space
+        self._state = self._build(calculator or DimensionCalculator())
+
+    def _build(self, calc: DimensionCalculator) -> Tuple[str, array, array, array]:
+        """(상수 지문, 도어 개수, 도어 너비, 플래그) 계산"""
+        fingerprint = calc.fingerprint
+        size = self.max_space - self.min_space + 1
+
+        door_counts = array("H", bytes(2 * size))
+        door_widths = array("H", bytes(2 * size))
+        flags = array("B", bytes(size))
+
+        for i in range(size):
+            best = calc.select_best(float(self.min_space + i))
+            door_counts[i] = best["door_count"]
+            door_widths[i] = int(best["door_width"])
+            if best.get("is_primary", False):
+                flags[i] = FLAG_PRIMARY
+            elif "is_primary" not in best:
+                flags[i] = FLAG_FORCED
+        return fingerprint, door_counts, door_widths, flags
+
+    def rebuild(self, calculator: DimensionCalculator = None):
+        """현재 상수로 다시 계산 (계산 중에는 기존 테이블로 조회)"""
+        self._state = self._build(calculator or DimensionCalculator())
+
+    @property
+    def fingerprint(self) -> str:
+        return self._state[0]
+
+    def lookup(self, total_space: float, fingerprint: str = None) -> Optional[Dict[str, Any]]:
+        """
+        사전 계산 결과 조회
+
+        Args:
+            fingerprint: 호출 측 상수 지문 (주면 테이블 지문과 다를 때 None)
+
+        Returns:
+            select_best와 같은 형식의 dict, 테이블 범위 밖이거나 정수가 아니면 None
+        """
+        table_fingerprint, door_counts, door_widths, flags = self._state
+        if fingerprint is not None and fingerprint != table_fingerprint:
+            return None
+
+        if isinstance(total_space, float):
+            if not total_space.is_integer():
+                return None
+        elif not isinstance(total_space, int):
+            return None
+
+        i = int(total_space) - self.min_space
+        if i < 0 or i >= len(flags):
+            return None
+
+        flag = flags[i]
+        door_count = door_counts[i]
+        if flag & FLAG_FORCED:
+            door_width = door_widths[i]
+            return {
+                "door_count": door_count,
+                "door_width": door_width,
+                "gap": total_space - (door_width * door_count)
+            }
+
+        door_width = float(door_widths[i])
+        return {
+            "door_count": door_count,
+            "door_width": door_width,
+            "gap": total_space - (door_width * door_count),
+            "is_primary": bool(flag & FLAG_PRIMARY)
+        }
+
+    def memory_bytes(self) -> int:
+        """테이블 메모리 사용량 (bytes)"""
+        return sum(
+            arr.itemsize * len(arr)
+            for arr in self._state[1:]
+        )
+
+
+# 공유 테이블 (최초 요청 시 생성)
+_shared_table: Optional[DistributionTable] = None
+
+
+def get_distribution_table() -> DistributionTable:
+    """프로세스 공유 분배 테이블"""
+    global _shared_table
+    if _shared_table is None:
+        _shared_table = DistributionTable()
+    return _shared_table
+
+
+def rebuild_distribution_table() -> bool:
+    """공유 테이블을 현재 상수로 다시 계산 (아직 만들어지지 않았으면 False)"""
+    if _shared_table is None:
+        return False
+    _shared_table.rebuild()
+    return True
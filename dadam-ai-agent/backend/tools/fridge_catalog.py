@@ -0,0 +1,274 @@
+"""
+냉장고 카탈로그 로더 - 외부 JSON/CSV 파일 감시 및 불변 스냅샷 교체
+
+파일 형식
+- JSON: FRIDGE_DATA와 같은 구조 {브랜드: {"name", "categories": {카테고리: [모델]}}}
+- CSV: brand, brand_name, category, id, name, w, h, d, type, line, side_gap, between_gap, units
+  (units는 "이름:너비|이름:너비", 비우면 모델 하나)
+"""
+import os
+import csv
+import copy
+import json
+import time
+import hashlib
+import threading
+from typing import Dict, Any, Optional
+
+from data.fridge_data import FRIDGE_DATA, FRIDGE_RULES
+from .fridge_index import FridgeCatalogIndex
+from .fridge_columns import FridgeColumns
+from .fridge_search import FridgeSearchIndex
+from .fridge_compat import FridgeCompatibilityMap
+
+REQUIRED_FIELDS = ("id", "name", "w", "h", "d", "type", "side_gap")
+NUMERIC_FIELDS = ("w", "h", "d", "side_gap")
+
+
+def _number(value: Any) -> float:
+    """CSV 숫자 (정수면 int 유지)"""
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+def parse_csv(text: str) -> Dict[str, Any]:
+    """CSV 카탈로그 → FRIDGE_DATA 구조"""
+    data: Dict[str, Any] = {}
+    for line_no, row in enumerate(csv.DictReader(text.splitlines()), start=2):
+        try:
+            model = {
+                "id": row["id"].strip(),
+                "name": row["name"].strip(),
+                "w": _number(row["w"]),
+                "h": _number(row["h"]),
+                "d": _number(row["d"]),
+                "type": row["type"].strip(),
+                "line": (row.get("line") or "").strip(),
+                "side_gap": _number(row["side_gap"]),
+                "between_gap": _number(row.get("between_gap") or 0),
+            }
+            units = (row.get("units") or "").strip()
+            if units:
+                model["units"] = [
+                    {"name": name.strip(), "w": _number(w)}
+                    for name, w in (u.rsplit(":", 1) for u in units.split("|"))
+                ]
+            else:
+                model["units"] = [{"name": model["name"], "w": model["w"]}]
+            brand = row["brand"].strip()
+            category = row["category"].strip()
+        except (KeyError, ValueError, AttributeError) as e:
+            raise ValueError(f"CSV {line_no}행 형식 오류: {e}") from e
+
+        brand_data = data.setdefault(brand, {"name": (row.get("brand_name") or brand).strip(), "categories": {}})
+        brand_data["categories"].setdefault(category, []).append(model)
+    return data
+
+
+def parse_catalog(text: str, fmt: str) -> Dict[str, Any]:
+    """카탈로그 파일 내용 파싱 + 필수 필드 검증"""
+    data = parse_csv(text) if fmt == "csv" else json.loads(text)
+    if not isinstance(data, dict) or not data:
+        raise ValueError("카탈로그가 비어 있습니다")
+
+    seen = set()
+    for brand, brand_data in data.items():
+        if not isinstance(brand_data, dict):
+            raise ValueError(f"{brand}: 브랜드 데이터는 객체여야 합니다")
+        categories = brand_data.get("categories", {})
+        if not isinstance(categories, dict):
+            raise ValueError(f"{brand}: categories는 객체여야 합니다")
+        for category, models in categories.items():
+            if not isinstance(models, list):
+                raise ValueError(f"{brand}/{category}: 모델 목록은 배열이어야 합니다")
+            for model in models:
+                if not isinstance(model, dict):
+                    raise ValueError(f"{brand}/{category}: 모델은 객체여야 합니다")
+                missing = [f for f in REQUIRED_FIELDS if f not in model]
+                if missing:
+                    raise ValueError(f"{brand}/{category} 모델 필드 누락: {', '.join(missing)}")
+                invalid = [
+                    f for f in NUMERIC_FIELDS
+                    if isinstance(model[f], bool) or not isinstance(model[f], (int, float))
+                ]
+                if invalid:
+                    raise ValueError(f"{brand}/{category} 모델 {model['id']} 숫자 필드 오류: {', '.join(invalid)}")
+                if model["id"] in seen:
+                    raise ValueError(f"중복 모델 ID: {model['id']}")
+                seen.add(model["id"])
+    return data
+
+
+class CatalogSnapshot:
+    """
+    카탈로그 불변 스냅샷 (데이터 + 조회 인덱스 + 호환 맵 일체)
+
+    생성 후에는 수정하지 않고 통째로 교체만 한다. 요청 처리 중에는
+    시작 시점의 스냅샷 하나만 참조하므로 교체 중에도 일관된 결과를 본다.
+    """
+
+    def __init__(self, data: Dict[str, Any], version: int = 1, source: str = "builtin", checksum: str = None):
+        started = time.perf_counter()
+        self.data = copy.deepcopy(data)
+        self.version = version
+        self.source = source
+        self.checksum = checksum or hashlib.sha1(
+            json.dumps(self.data, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()[:12]
+
+        self.index = FridgeCatalogIndex(self.data)
+        self.columns = FridgeColumns(self.index)
+        self.search_index = FridgeSearchIndex(
+            self.index, {brand: d.get("name", brand) for brand, d in self.data.items()}
+        )
+        self.compat = FridgeCompatibilityMap(self.index, FRIDGE_RULES)
+
+        self.loaded_at = time.time()
+        self.build_ms = round((time.perf_counter() - started) * 1000, 2)
+
+    def info(self) -> Dict[str, Any]:
+        """스냅샷 정보"""
+        return {
+            "version": self.version,
+            "source": self.source,
+            "checksum": self.checksum,
+            "model_count": len(self.index),
+            "brands": list(self.data.keys()),
+            "loaded_at": self.loaded_at,
+            "build_ms": self.build_ms
+        }
+
+
+class FridgeCatalog:
+    """
+    카탈로그 스냅샷 관리자
+
+    - 읽기: catalog.snapshot 참조 하나 (잠금 없음)
+    - 쓰기: 백그라운드 감시 스레드가 파일 변경 시 새 스냅샷을 만들어 참조 교체
+      (교체는 속성 대입 한 번이라 원자적, 재로드끼리만 잠금으로 직렬화)
+    """
+
+    def __init__(self, path: str = None, data: Dict[str, Any] = None, poll_interval: float = 2.0):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.last_error: Optional[str] = None
+        self.last_checked: Optional[float] = None
+        self._stat = None
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.snapshot = CatalogSnapshot(data or FRIDGE_DATA)
+        if path:
+            try:
+                self.reload()
+            except (OSError, ValueError) as e:
+                # 파일이 잘못되면 내장 카탈로그로 시작하고 다음 변경을 기다림
+                self.last_error = str(e)
+
+    def _file_stat(self):
+        stat = os.stat(self.path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        파일을 다시 읽어 스냅샷 교체
+
+        Returns:
+            교체 여부 (내용이 같으면 False)
+        Raises:
+            OSError, ValueError: 파일 읽기/파싱 실패 (기존 스냅샷 유지)
+        """
+        if not self.path:
+            return False
+
+        with self._reload_lock:
+            self.last_checked = time.time()
+            try:
+                self._stat = self._file_stat()
+                with open(self.path, "rb") as f:
+                    raw = f.read()
+                checksum = hashlib.sha1(raw).hexdigest()[:12]
+                if not force and checksum == self.snapshot.checksum:
+                    self.last_error = None
+                    return False
+
+                fmt = "csv" if self.path.lower().endswith(".csv") else "json"
+                data = parse_catalog(raw.decode("utf-8-sig"), fmt)
+                snapshot = CatalogSnapshot(
+                    data,
+                    version=self.snapshot.version + 1,
+                    source=self.path,
+                    checksum=checksum
+                )
+            except (OSError, ValueError) as e:
+                self.last_error = str(e)
+                raise
+            except Exception as e:
+                # 검증을 통과했지만 인덱스 구축에 실패한 경우도 파일 오류로 취급
+                self.last_error = f"카탈로그 처리 실패: {e!r}"
+                raise ValueError(self.last_error) from e
+
+            self.snapshot = snapshot
+            self.last_error = None
+            return True
+
+    def check(self) -> bool:
+        """파일 변경(mtime/크기) 확인 후 변경 시 재로드"""
+        try:
+            if self._file_stat() == self._stat:
+                self.last_checked = time.time()
+                return False
+            return self.reload()
+        except (OSError, ValueError) as e:
+            self.last_error = str(e)
+            return False
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.check()
+            except Exception as e:
+                # 예상 못 한 오류에도 감시 스레드는 유지
+                self.last_error = f"카탈로그 확인 실패: {e!r}"
+
+    def start(self):
+        """파일 감시 시작 (경로가 없으면 무시)"""
+        if not self.path or (self._thread and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="fridge-catalog-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """파일 감시 중지"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.poll_interval + 1)
+            self._thread = None
+
+    def status(self) -> Dict[str, Any]:
+        """카탈로그 상태 (버전, 로드 시각 등)"""
+        return {
+            **self.snapshot.info(),
+            "path": self.path,
+            "watching": bool(self._thread and self._thread.is_alive()),
+            "poll_interval": self.poll_interval,
+            "last_checked": self.last_checked,
+            "last_error": self.last_error
+        }
+
+
+# 공유 카탈로그 (라우터/에이전트의 FridgeLookup이 함께 사용)
+_shared_catalog: Optional[FridgeCatalog] = None
+
+
+def get_fridge_catalog() -> FridgeCatalog:
+    """프로세스 공유 카탈로그 (FRIDGE_CATALOG_PATH가 없으면 내장 데이터)"""
+    global _shared_catalog
+    if _shared_catalog is None:
+        _shared_catalog = FridgeCatalog(
+            path=os.getenv("FRIDGE_CATALOG_PATH") or None,
+            poll_interval=float(os.getenv("FRIDGE_CATALOG_POLL_SEC", "2"))
+        )
+    return _shared_catalog
@@ -0,0 +1,118 @@
+"""
+냉장고 카탈로그 컬럼형 뷰 - NumPy 배열 기반 벡터화 필터/점수 계산
+"""
+from typing import List, Dict, Optional, Sequence
+
+import numpy as np
+
+from .fridge_index import FridgeCatalogIndex
+
+
+class FridgeColumns:
+    """
+    카탈로그의 struct-of-arrays 뷰 (레코드 번호 = FridgeCatalogIndex 번호)
+
+    - width, height, depth, side_gap, between_gap, unit_count: 모델별 수치 배열
+    - type_code, brand_code: 코드 배열 (types / brands 목록의 인덱스)
+    """
+
+    def __init__(self, index: FridgeCatalogIndex):
+        records = index.records
+
+        self.brands: List[str] = sorted({r["brand"] for r in records})
+        self.types: List[str] = sorted({r["type"] for r in records})
+        brand_codes = {b: i for i, b in enumerate(self.brands)}
+        type_codes = {t: i for i, t in enumerate(self.types)}
+
+        self.width = np.array([r["w"] for r in records], dtype=np.float64)
+        self.height = np.array([r["h"] for r in records], dtype=np.float64)
+        self.depth = np.array([r["d"] for r in records], dtype=np.float64)
+        self.side_gap = np.array([r["side_gap"] for r in records], dtype=np.float64)
+        self.between_gap = np.array([r.get("between_gap", 0) for r in records], dtype=np.float64)
+        self.unit_count = np.array([len(r.get("units", [])) for r in records], dtype=np.int32)
+        self.type_code = np.array([type_codes[r["type"]] for r in records], dtype=np.int16)
+        self.brand_code = np.array([brand_codes[r["brand"]] for r in records], dtype=np.int16)
+
+        # 파생 컬럼
+        self.needed_width = self.width + self.side_gap * 2
+
+        # 점수 보너스 (_calc_score와 같은 순서로 더함)
+        builtin = type_codes.get("builtin", -1)
+        self.builtin_bonus = np.where(self.type_code == builtin, 15.0, 0.0)
+        self.multi_unit_bonus = np.where(self.unit_count >= 2, 10.0, 0.0)
+
+    def __len__(self) -> int:
+        return len(self.width)
+
+    def brand_mask(self, brand: Optional[str]) -> np.ndarray:
+        """브랜드 필터 (None이면 전체)"""
+        if not brand:
+            return np.ones(len(self), dtype=bool)
+        if brand not in self.brands:
+            return np.zeros(len(self), dtype=bool)
+        return self.brand_code == self.brands.index(brand)
+
+    def scores(self, remaining: np.ndarray) -> np.ndarray:
+        """
+        FridgeLookup._calc_score 벡터화
+        remaining은 (모델,) 또는 (벽, 모델) 배열
+        """
+        # 구간별 점수를 넓은 구간부터 덮어씀 (중첩 np.where보다 임시 배열이 적음)
+        score = 100 - (remaining - 50) / 10
+        np.putmask(score, remaining <= 50, 100.0 + 10)
+        np.putmask(score, remaining <= 20, 100.0 + 20)
+        np.putmask(score, (remaining >= 4) & (remaining <= 10), 100.0 + 30)
+        score += self.builtin_bonus
+        score += self.multi_unit_bonus
+        np.maximum(score, 0, out=score)
+        np.putmask(score, remaining < 0, 0.0)
+        return score
+
+    def fit_matrix(
+        self,
+        total_widths: Sequence[float],
+        total_heights: Sequence[float],
+        brand: str = None,
+        include_tall: bool = False
+    ) -> Dict[str, np.ndarray]:
+        """
+        벽 × 모델 적합 행렬
+
+        Returns:
+            {"remaining": (벽, 모델), "fits": (벽, 모델) bool, "score": (벽, 모델)}
+            적합하지 않은 칸의 score는 -inf
+        """
+        widths = np.asarray(total_widths, dtype=np.float64).reshape(-1, 1)
+        heights = np.asarray(total_heights, dtype=np.float64).reshape(-1, 1)
+
+        # 마감 공간 (좌우 각 60mm) + 키큰장 공간
+        fridge_space = widths - 120 - (600 if include_tall else 0)
+        remaining = fridge_space - self.needed_width
+
+        fits = (
+            (remaining >= 0)
+            & (self.height <= heights - 100)      # 상부장 최소 공간
+            & self.brand_mask(brand)
+        )
+        score = np.where(fits, self.scores(remaining), -np.inf)
+        return {"remaining": remaining, "fits": fits, "score": score}
+
+    def top_k(self, score: np.ndarray, fits: np.ndarray, k: int) -> List[List[int]]:
+        """
+        행별 상위 k개 레코드 번호
+        - 정렬: 점수 내림차순 → 카탈로그 순서 (recommend_for_space와 동일)
+        """
+        score = np.atleast_2d(score)
+        fits = np.atleast_2d(fits)
+
+        # k번째 점수 이상만 후보로 남긴 뒤 (동점 포함) 행별 정렬
+        if score.shape[1] > k:
+            kth = -np.partition(-score, k - 1, axis=-1)[:, k - 1:k]
+            fits = fits & (score >= kth)
+
+        results = []
+        for row in range(score.shape[0]):
+            cols = np.flatnonzero(fits[row])
+            order = cols[np.lexsort((cols, -score[row, cols]))][:k]
+            results.append([int(c) for c in order])
+        return results
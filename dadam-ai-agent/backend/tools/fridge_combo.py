@@ -0,0 +1,103 @@
+"""
+냉장고 조합 탐색 - 정렬 너비 배열 투 포인터 / 중간 만남 탐색
+"""
+from typing import Callable, Sequence, Tuple
+
+import numpy as np
+
+# visit(잔여 공간, 정렬 위치 조합) → False면 현재 분기 중단
+Visit = Callable[[float, Tuple[int, ...]], bool]
+# window() → (최소 잔여, 최대 잔여)
+Window = Callable[[], Tuple[float, float]]
+
+
+def _visit_pairs(
+    widths: np.ndarray,
+    lo: int,
+    target: float,
+    prefix: Tuple[int, ...],
+    visit: Visit,
+    window: Window
+):
+    """
+    widths[lo:]에서 합이 target 이하인 2개 조합 (j < k)
+
+    j마다 k의 범위를 [target - w_j - 최대 잔여, target - w_j - 최소 잔여]로 좁힌다.
+    j가 커질수록 남는 폭이 줄어드는 투 포인터 구조를 searchsorted로 한 번에 계산.
+    """
+    if lo >= len(widths) - 1:
+        return
+    min_rem, max_rem = window()
+    if min_rem > max_rem:
+        return
+
+    js = np.arange(lo, len(widths) - 1)
+    rest = target - widths[js]
+    keep = rest >= widths[js]              # k > j 이므로 w_k ≥ w_j
+    js, rest = js[keep], rest[keep]
+    if not len(js):
+        return
+
+    his = np.searchsorted(widths, rest - min_rem, side="right") - 1
+    los = np.maximum(np.searchsorted(widths, rest - max_rem, side="left"), js + 1)
+    valid = np.flatnonzero(his >= los)
+
+    # 최소 잔여가 작은 j부터
+    order = valid[np.argsort(rest[valid] - widths[his[valid]], kind="stable")]
+    for t in order:
+        j, r, k_hi, k_lo = int(js[t]), float(rest[t]), int(his[t]), int(los[t])
+        if r - widths[k_hi] > window()[1]:
+            break
+        for k in range(k_hi, k_lo - 1, -1):
+            if not visit(r - float(widths[k]), prefix + (j, k)):
+                break
+
+
+def search_combinations(
+    widths: Sequence[float],
+    target: float,
+    max_items: int,
+    visit: Visit,
+    window: Window = lambda: (0, float("inf"))
+):
+    """
+    합이 target 이하인 1~max_items(최대 3)개 조합 탐색
+
+    - 1개: 오른쪽 끝(가장 넓은 것)부터
+    - 2개: 투 포인터 (j별 k 범위)
+    - 3개: 가장 작은 항목 i를 고정하고 나머지 2개를 투 포인터 (중간 만남), 넓은 i부터
+    - window(): 지금까지 결과로 보아 의미 있는 (최소, 최대) 잔여 공간 (범위 가지치기, 비면 탐색 종료)
+
+    Args:
+        widths: 오름차순 정렬된 필요 너비
+        target: 채울 공간
+        max_items: 최대 항목 수
+        visit: 조합 방문 콜백
+    """
+    widths = np.asarray(widths, dtype=np.float64)
+    if target < 0 or not len(widths):
+        return
+
+    for p in range(int(np.searchsorted(widths, target - window()[0], side="right")) - 1, -1, -1):
+        if not visit(target - float(widths[p]), (p,)):
+            break
+
+    if max_items >= 2:
+        _visit_pairs(widths, 0, target, (), visit, window)
+
+    if max_items >= 3 and len(widths) >= 3:
+        # 잔여가 작은 조합을 먼저 찾도록 넓은 i부터 (창이 빨리 좁혀짐)
+        widest_pair = float(widths[-1] + widths[-2])
+        top = min(int(np.searchsorted(widths, target / 3, side="right")), len(widths) - 2)
+        for i in range(top - 1, -1, -1):
+            min_rem, max_rem = window()
+            if min_rem > max_rem:
+                break
+            rest = target - float(widths[i])
+            # 남은 2개 합의 범위 [가장 좁은 두 개, 가장 넓은 두 개]가 창과 겹치지 않으면 건너뜀
+            # (i가 작아질수록 rest가 커지므로 가장 넓은 두 개로도 모자라면 종료)
+            if widest_pair < rest - max_rem:
+                break
+            if float(widths[i + 1] + widths[i + 2]) > rest - min_rem:
+                continue
+            _visit_pairs(widths, i + 1, rest, (i,), visit, window)
@@ -0,0 +1,106 @@
+"""
+냉장고 호환 맵 - 모델별 설치 가능한 벽 너비/높이 구간 (카탈로그 로드 시 1회 계산)
+"""
+from bisect import bisect_left, bisect_right
+from typing import List, Dict, Any, Optional
+
+from .fridge_index import FridgeCatalogIndex
+
+FINISH_SPACE = 120      # 마감 공간 (좌우 각 60mm)
+UPPER_MIN_SPACE = 100   # 상부장 최소 공간
+OPTIMAL_MIN = 4         # 최적 잔여 공간 (4~10mm)
+OPTIMAL_MAX = 10
+LAYOUT_MAX_REMAINING = 50   # calculate_fridge_layout 유효 잔여 공간
+TALL_ROOM = 500             # 키큰장 추가 가능 잔여 공간
+
+
+class _Intervals:
+    """
+    시작점 정렬 구간 목록 (모든 구간의 길이가 같음)
+
+    - span이 None이면 [start, ∞)
+    - 구간 찌르기(stabbing) 조회: start ∈ [x - span, x] 범위를 bisect
+    """
+
+    def __init__(self, starts: List[float], span: Optional[float]):
+        self.span = span
+        self.order = sorted(range(len(starts)), key=lambda n: starts[n])
+        self.starts = [starts[n] for n in self.order]
+
+    def stab(self, x: float) -> List[int]:
+        """x를 포함하는 구간의 레코드 번호"""
+        hi = bisect_right(self.starts, x)
+        lo = bisect_left(self.starts, x - self.span) if self.span is not None else 0
+        return self.order[lo:hi]
+
+
+class FridgeCompatibilityMap:
+    """
+    모델별 벽 너비 구간 (recommend_for_space / calculate_fridge_layout 산식)
+
+    - fits: 잔여 공간 ≥ 0
+    - optimal: 잔여 공간 4~10mm
+    - room_for_tall: 잔여 공간 ≥ 500mm (키큰장 추가 가능)
+    - layout_valid: calculate_fridge_layout 잔여 공간 0~50mm
+    - *_with_tall: 키큰장(EL_W)을 함께 설치할 때
+    - min_height: 상부장 최소 공간을 남기는 최소 벽 높이
+    """
+
+    KINDS = {
+        # 종류: (키큰장 포함, 잔여 하한, 구간 길이, 레이아웃 너비 기준)
+        "fits": (False, 0, None, False),
+        "optimal": (False, OPTIMAL_MIN, OPTIMAL_MAX - OPTIMAL_MIN, False),
+        "room_for_tall": (False, TALL_ROOM, None, False),
+        "layout_valid": (False, 0, LAYOUT_MAX_REMAINING, True),
+        "fits_with_tall": (True, 0, None, False),
+        "optimal_with_tall": (True, OPTIMAL_MIN, OPTIMAL_MAX - OPTIMAL_MIN, False),
+        "layout_valid_with_tall": (True, 0, LAYOUT_MAX_REMAINING, True),
+    }
+
+    def __init__(self, index: FridgeCatalogIndex, rules: Dict[str, Any]):
+        self.index = index
+        self.tall_width = rules["EL_W"]
+
+        # calculate_fridge_layout의 냉장고 총 너비 (유닛 + 유닛 사이 간격 + 측면 여유)
+        self.layout_width = []
+        for record in index.records:
+            units = record.get("units", [{"name": record["name"], "w": record["w"]}])
+            width = record["side_gap"] * 2 + sum(u["w"] for u in units)
+            if len(units) > 1:
+                width += record.get("between_gap", 0) * (len(units) - 1)
+            self.layout_width.append(width)
+
+        self.min_height = [r["h"] + UPPER_MIN_SPACE for r in index.records]
+
+        self.ranges: Dict[str, List[Dict[str, Optional[float]]]] = {}
+        self.intervals: Dict[str, _Intervals] = {}
+        for kind, (with_tall, min_remaining, span, layout) in self.KINDS.items():
+            widths = self.layout_width if layout else index.needed
+            extra = FINISH_SPACE + (self.tall_width if with_tall else 0) + min_remaining
+            starts = [extra + width for width in widths]
+            self.ranges[kind] = [
+                {"min_width": s, "max_width": s + span if span is not None else None} for s in starts
+            ]
+            self.intervals[kind] = _Intervals(starts, span)
+
+    def models_for_wall(self, total_width: float, total_height: float = None, kind: str = "fits") -> List[int]:
+        """벽에 맞는 레코드 번호 (카탈로그 순서)"""
+        matches = self.intervals[kind].stab(total_width)
+        if total_height is not None:
+            matches = [n for n in matches if self.min_height[n] <= total_height]
+        return sorted(matches)
+
+    def walls_for_model(self, n: int) -> Dict[str, Any]:
+        """모델이 맞는 벽 너비/높이 구간"""
+        record = self.index.records[n]
+        return {
+            "model_id": record["id"],
+            "name": record["name"],
+            "brand": record["brand"],
+            "category": record["category"],
+            "needed_width": self.index.needed[n],
+            "layout_width": self.layout_width[n],
+            "min_height": self.min_height[n],
+            "tall_width": self.tall_width,
+            "width_ranges": {kind: dict(ranges[n]) for kind, ranges in self.ranges.items()},
+        }
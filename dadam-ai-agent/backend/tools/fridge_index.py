@@ -0,0 +1,93 @@
+"""
+냉장고 카탈로그 인덱스 - ID 해시, 너비 정렬 배열, 브랜드/타입/라인 포스팅 리스트
+"""
+from bisect import bisect_left, bisect_right
+from typing import List, Dict, Any, Optional, Iterable
+
+
+class FridgeCatalogIndex:
+    """
+    카탈로그 로드 시 1회 구축하는 조회용 인덱스
+
+    - records: 카탈로그 순서의 모델 레코드 ({**model, "brand", "category"}), 읽기 전용
+    - 조회 결과는 레코드 번호(카탈로그 순서) 목록
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        self.records: List[Dict[str, Any]] = []
+        self.by_id: Dict[str, int] = {}
+        self.by_brand: Dict[str, List[int]] = {}
+        self.by_type: Dict[str, List[int]] = {}
+        self.by_line: Dict[str, List[int]] = {}
+        self.by_category: Dict[str, List[int]] = {}
+
+        for brand, brand_data in data.items():
+            for category, models in brand_data["categories"].items():
+                for model in models:
+                    n = len(self.records)
+                    self.records.append({**model, "brand": brand, "category": category})
+                    self.by_id.setdefault(model["id"], n)
+                    self.by_brand.setdefault(brand, []).append(n)
+                    self.by_type.setdefault(model["type"], []).append(n)
+                    self.by_line.setdefault(model.get("line", ""), []).append(n)
+                    self.by_category.setdefault(category, []).append(n)
+
+        # 너비 정렬 배열 (bisect 범위 조회)
+        self.width_order = sorted(range(len(self.records)), key=lambda n: self.records[n]["w"])
+        self.widths = [self.records[n]["w"] for n in self.width_order]
+
+        # 필요 너비 (측면 여유 포함) 정렬 배열
+        self.needed = [r["w"] + r["side_gap"] * 2 for r in self.records]
+        self.needed_order = sorted(range(len(self.records)), key=lambda n: self.needed[n])
+        self.needed_widths = [self.needed[n] for n in self.needed_order]
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def get(self, model_id: str) -> Optional[Dict[str, Any]]:
+        """모델 ID → 레코드"""
+        n = self.by_id.get(model_id)
+        return self.records[n] if n is not None else None
+
+    def width_range(self, min_width: float = None, max_width: float = None) -> List[int]:
+        """min_width ≤ w ≤ max_width 인 레코드 번호 (너비 순)"""
+        lo = bisect_left(self.widths, min_width) if min_width else 0
+        hi = bisect_right(self.widths, max_width) if max_width else len(self.widths)
+        return self.width_order[lo:hi]
+
+    def needed_at_most(self, limit: float) -> List[int]:
+        """필요 너비 ≤ limit 인 레코드 번호 (필요 너비 순)"""
+        return self.needed_order[:bisect_right(self.needed_widths, limit)]
+
+    def select(
+        self,
+        brand: str = None,
+        fridge_type: str = None,
+        line: str = None,
+        min_width: float = None,
+        max_width: float = None
+    ) -> List[int]:
+        """
+        조건 교집합 (카탈로그 순서)
+        - 가장 짧은 포스팅 리스트부터 교집합 → 필요한 레코드만 확인
+        """
+        postings: List[Iterable[int]] = []
+        if brand:
+            postings.append(self.by_brand.get(brand, []))
+        if fridge_type:
+            postings.append(self.by_type.get(fridge_type, []))
+        if line:
+            postings.append(self.by_line.get(line, []))
+        if min_width or max_width:
+            postings.append(self.width_range(min_width, max_width))
+
+        if not postings:
+            return list(range(len(self.records)))
+
+        postings.sort(key=len)
+        result = set(postings[0])
+        for posting in postings[1:]:
+            if not result:
+                break
+            result.intersection_update(posting)
+        return sorted(result)
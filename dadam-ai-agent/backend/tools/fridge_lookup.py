@@ -1,50 +1,84 @@
 """
 냉장고 모델 조회 도구
 """
+import heapq
+import itertools
 from typing import List, Dict, Any, Optional
 from data.fridge_data import FRIDGE_DATA, FRIDGE_RULES, get_fridge_model, get_recommended_fridge
+from .fridge_index import FridgeCatalogIndex
+from .fridge_columns import FridgeColumns
+from .fridge_search import FridgeSearchIndex
+from .fridge_catalog import FridgeCatalog, CatalogSnapshot, get_fridge_catalog
+from .fridge_combo import search_combinations
 
 
 class FridgeLookup:
     """냉장고 모델 조회 및 추천 도구"""
 
-    def __init__(self):
-        self.data = FRIDGE_DATA
+    COLUMNAR_MIN_MODELS = 256  # 이 이상이면 추천을 벡터 연산으로 계산
+    WALL_CHUNK_SIZE = 256      # 일괄 추천 시 한 번에 계산할 벽 개수 (벽 × 모델 행렬 메모리 제한)
+
+    def __init__(self, data: Dict[str, Any] = None, catalog: FridgeCatalog = None):
+        """
+        Args:
+            data: 고정 카탈로그 데이터 (지정 시 전용 카탈로그)
+            catalog: 카탈로그 관리자 (기본: 공유 카탈로그, 파일 변경 시 스냅샷 교체)
+        """
         self.rules = FRIDGE_RULES
+        self.catalog = catalog or (FridgeCatalog(data=data) if data else get_fridge_catalog())
+
+    # 현재 스냅샷 (메서드마다 시작 시 한 번만 읽어 요청 중 일관성 유지)
+    @property
+    def snapshot(self) -> CatalogSnapshot:
+        return self.catalog.snapshot
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        return self.catalog.snapshot.data
+
+    @property
+    def index(self) -> FridgeCatalogIndex:
+        return self.catalog.snapshot.index
+
+    @property
+    def columns(self) -> FridgeColumns:
+        return self.catalog.snapshot.columns
+
+    @property
+    def search_index(self) -> FridgeSearchIndex:
+        return self.catalog.snapshot.search_index
 
     def get_brands(self) -> List[str]:
         """브랜드 목록 조회"""
-        return list(self.data.keys())
+        return list(self.snapshot.data.keys())
 
     def get_categories(self, brand: str) -> List[str]:
         """브랜드별 카테고리 조회"""
-        if brand not in self.data:
+        data = self.snapshot.data
+        if brand not in data:
             return []
-        return list(self.data[brand]["categories"].keys())
+        return list(data[brand]["categories"].keys())
 
     def get_models(self, brand: str, category: str = None) -> List[Dict]:
         """모델 목록 조회"""
-        if brand not in self.data:
+        data = self.snapshot.data
+        if brand not in data:
             return []
 
         if category:
-            return self.data[brand]["categories"].get(category, [])
+            return data[brand]["categories"].get(category, [])
 
         # 전체 모델
         models = []
-        for cat_name, cat_models in self.data[brand]["categories"].items():
+        for cat_name, cat_models in data[brand]["categories"].items():
             for model in cat_models:
                 models.append({**model, "category": cat_name})
         return models
 
     def get_model_by_id(self, model_id: str) -> Optional[Dict]:
         """모델 ID로 조회"""
-        for brand in self.data:
-            for category, models in self.data[brand]["categories"].items():
-                for model in models:
-                    if model["id"] == model_id:
-                        return {**model, "brand": brand, "category": category}
-        return None
+        record = self.snapshot.index.get(model_id)
+        return dict(record) if record else None
 
     def search_models(
         self,
@@ -54,59 +88,93 @@ class FridgeLookup:
         max_width: float = None,
         fridge_type: str = None
     ) -> List[Dict]:
-        """모델 검색"""
-        results = []
-        brands = [brand] if brand else self.data.keys()
+        """
+        모델 검색
 
-        for b in brands:
-            if b not in self.data:
-                continue
+        - 검색어가 있으면 n-gram 인덱스로 퍼지 검색 (띄어쓰기/오타 허용), 관련도 순
+        - 검색어가 없으면 카탈로그 순
+        """
+        snap = self.snapshot
+        if brand and brand not in snap.data:
+            return []
+
+        matches = snap.index.select(
+            brand=brand,
+            fridge_type=fridge_type,
+            min_width=min_width,
+            max_width=max_width
+        )
+
+        if query:
+            allowed = set(matches)
+            matches = [n for n, _ in snap.search_index.search(query) if n in allowed]
 
-            for cat_name, models in self.data[b]["categories"].items():
-                for model in models:
-                    # 너비 필터
-                    if min_width and model["w"] < min_width:
-                        continue
-                    if max_width and model["w"] > max_width:
-                        continue
-
-                    # 타입 필터
-                    if fridge_type and model["type"] != fridge_type:
-                        continue
-
-                    # 쿼리 검색
-                    if query:
-                        query_lower = query.lower()
-                        if not any([
-                            query_lower in model["name"].lower(),
-                            query_lower in model["id"].lower(),
-                            query_lower in cat_name.lower()
-                        ]):
-                            continue
-
-                    results.append({
-                        **model,
-                        "brand": b,
-                        "category": cat_name
-                    })
+        return [dict(snap.index.records[n]) for n in matches]
 
+    def autocomplete(self, query: str, limit: int = 8) -> List[Dict[str, Any]]:
+        """모델 자동완성 (접두어 우선 → 퍼지)"""
+        snap = self.snapshot
+        results = []
+        for n, score in snap.search_index.autocomplete(query, limit):
+            record = snap.index.records[n]
+            results.append({
+                "id": record["id"],
+                "name": record["name"],
+                "brand": record["brand"],
+                "category": record["category"],
+                "score": round(score, 3)
+            })
         return results
 
+    def compatible_models(
+        self,
+        total_width: float,
+        total_height: float = None,
+        include_tall: bool = False,
+        optimal_only: bool = False
+    ) -> List[Dict]:
+        """
+        벽에 맞는 모델 (호환 맵 구간 조회, 카탈로그 순서)
+
+        Args:
+            optimal_only: 잔여 공간 4~10mm 모델만
+        """
+        snap = self.snapshot
+        kind = "optimal" if optimal_only else "fits"
+        if include_tall:
+            kind += "_with_tall"
+        return [
+            dict(snap.index.records[n])
+            for n in snap.compat.models_for_wall(total_width, total_height, kind)
+        ]
+
+    def wall_ranges(self, model_id: str) -> Optional[Dict[str, Any]]:
+        """모델이 맞는 벽 너비/높이 구간 (역조회)"""
+        snap = self.snapshot
+        n = snap.index.by_id.get(model_id)
+        return snap.compat.walls_for_model(n) if n is not None else None
+
     def recommend_for_space(
         self,
         total_width: float,
         total_height: float = 2300,
         brand: str = None,
-        include_tall: bool = False
+        include_tall: bool = False,
+        top_k: int = 5
     ) -> List[Dict]:
         """
         공간에 맞는 냉장고 추천
 
+        - 카탈로그가 크면 컬럼형 뷰로 전체 필터/점수를 벡터 연산
+        - 작으면 필요 너비 인덱스를 훑으며 상위 k개 힙 유지
+        - 추천 필드(상부장 높이 등)는 최종 k개에만 계산
+
         Args:
             total_width: 전체 너비 (mm)
             total_height: 전체 높이 (mm)
             brand: 선호 브랜드
             include_tall: 키큰장 포함 여부
+            top_k: 추천 개수
         """
         # 마감 공간 (좌우 각 60mm)
         finish_space = 120
@@ -116,48 +184,268 @@ class FridgeLookup:
         tall_space = 600 if include_tall else 0
         fridge_space = available - tall_space
 
-        recommendations = []
-        brands = [brand] if brand else self.data.keys()
+        snap = self.snapshot
+        if brand and brand not in snap.data:
+            return []
+
+        if top_k <= 0:
+            return []
+
+        if len(snap.index) >= self.COLUMNAR_MIN_MODELS:
+            matrix = snap.columns.fit_matrix([total_width], [total_height], brand, include_tall)
+            ranked = snap.columns.top_k(matrix["score"], matrix["fits"], top_k)[0]
+        else:
+            ranked = self._rank_heap(snap.index, fridge_space, total_width, total_height, brand, top_k)
+
+        return [
+            self._build_recommendation(snap.index, n, fridge_space, total_width, total_height, include_tall)
+            for n in ranked
+        ]
+
+    def recommend_for_walls(
+        self,
+        walls: List[Dict[str, float]],
+        brand: str = None,
+        include_tall: bool = False,
+        top_k: int = 5
+    ) -> List[List[Dict]]:
+        """
+        여러 벽에 대한 일괄 추천 (벽 × 모델 점수 행렬, WALL_CHUNK_SIZE개 벽씩)
+
+        Args:
+            walls: [{"total_width": ..., "total_height": ...}]
+        """
+        snap = self.snapshot
+        if not walls or top_k <= 0 or (brand and brand not in snap.data):
+            return [[] for _ in walls]
+
+        widths = [w["total_width"] for w in walls]
+        heights = [w.get("total_height") or 2300 for w in walls]
+        ranked = []
+        for start in range(0, len(walls), self.WALL_CHUNK_SIZE):
+            chunk = slice(start, start + self.WALL_CHUNK_SIZE)
+            matrix = snap.columns.fit_matrix(widths[chunk], heights[chunk], brand, include_tall)
+            ranked.extend(snap.columns.top_k(matrix["score"], matrix["fits"], top_k))
 
-        for b in brands:
-            if b not in self.data:
+        tall_space = 600 if include_tall else 0
+        return [
+            [
+                self._build_recommendation(snap.index, n, width - 120 - tall_space, width, height, include_tall)
+                for n in row
+            ]
+            for row, width, height in zip(ranked, widths, heights)
+        ]
+
+    def recommend_combinations(
+        self,
+        total_width: float,
+        total_height: float = 2300,
+        brand: str = None,
+        include_tall: bool = False,
+        include_homecafe: bool = False,
+        max_appliances: int = 3,
+        max_cabinets: int = 2,
+        top_k: int = 5
+    ) -> List[Dict]:
+        """
+        벽 채움 조합 추천 (냉장고/김치냉장고 1~3대 + 키큰장/홈카페장)
+
+        - 장 구성(키큰장 n개, 홈카페장 m개)마다 남는 폭을 정렬 너비 배열에서 조합 탐색
+        - 점수: 조합 내 모델별 _calc_score(잔여 공간) 평균
+        - 정렬: 점수 → 잔여 공간 → 장 수 → 모델 수 (장 수가 같으면 키큰장 우선)
+
+        Args:
+            include_tall: 키큰장(EL장) 1개 이상 포함
+            include_homecafe: 홈카페장 1개 이상 포함
+            max_appliances: 최대 냉장고 수 (1~3)
+            max_cabinets: 최대 장 수 (필수 장 포함)
+        """
+        snap = self.snapshot
+        if brand and brand not in snap.data:
+            return []
+        if top_k <= 0:
+            return []
+
+        index = snap.index
+        effective = total_width - 120   # 마감 공간 (좌우 각 60mm)
+        max_model_h = total_height - 100  # 상부장 최소 공간
+        brand_set = set(index.by_brand.get(brand, [])) if brand else None
+
+        # 점수는 잔여 공간과 (빌트인, 멀티 유닛) 여부로만 정해지므로 구분별 대표 레코드로 계산
+        def model_class(n):
+            return index.records[n]["type"] == "builtin", len(index.records[n].get("units", [])) >= 2
+
+        # 후보 모델 (필요 너비 오름차순)
+        # 필요 너비와 구분이 같은 모델은 조합 안에서 바꿔도 점수/잔여가 같으므로 묶음별 앞쪽
+        # (max_appliances + top_k - 1)개만 남김 → 잘린 모델이 든 조합마다 같은 점수의 조합이 top_k개 이상 남음
+        per_bucket = max_appliances + top_k - 1
+        buckets: Dict[tuple, int] = {}
+        candidates = []
+        for n in index.needed_order:
+            if index.records[n]["h"] > max_model_h or (brand_set is not None and n not in brand_set):
                 continue
+            bucket = (index.needed[n], model_class(n))
+            if buckets.get(bucket, 0) < per_bucket:
+                buckets[bucket] = buckets.get(bucket, 0) + 1
+                candidates.append(n)
+        widths = [index.needed[n] for n in candidates]
+        classes = [model_class(n) for n in candidates]
+        representative = {c: index.records[n] for c, n in zip(classes, candidates)}
+        model_scores: Dict[tuple, float] = {}
+
+        def model_score(remaining, cls):
+            key = (remaining, cls)
+            if key not in model_scores:
+                model_scores[key] = self._calc_score(remaining, representative[cls], total_width)
+            return model_scores[key]
+
+        # 장 구성: 장 수가 적은 순 → 키큰장 우선
+        min_tall, min_cafe = int(include_tall), int(include_homecafe)
+        configs = sorted(
+            ((n_tall, n_cafe)
+             for n_tall in range(min_tall, max(min_tall, max_cabinets - min_cafe) + 1)
+             for n_cafe in range(min_cafe, max(min_cafe, max_cabinets - n_tall) + 1)),
+            key=lambda c: (c[0] + c[1], c[1])
+        )
+
+        # (점수, -잔여, -장 수, -모델 수, -발견 순서, ...) 최소 힙 → heap[0]이 k번째
+        # 장 구성 → 모델 수 순으로 탐색하므로 점수/잔여가 같으면 먼저 찾은 조합이 우선
+        heap: List[tuple] = []
+        bound = [(0, float("inf"))]   # 이길 수 있는 잔여 공간 범위 (힙이 차면 갱신)
+        order = itertools.count()
+
+        for n_tall, n_cafe in configs:
+            cabinet_width = n_tall * self.rules["EL_W"] + n_cafe * self.rules["HOMECAFE_W"]
+
+            def visit(remaining, positions, n_tall=n_tall, n_cafe=n_cafe):
+                if remaining > bound[0][1]:
+                    return False
+                if remaining < bound[0][0]:
+                    return True
+                score = sum(model_score(remaining, classes[p]) for p in positions) / len(positions)
+                entry = (score, -remaining, -(n_tall + n_cafe), -len(positions), -next(order),
+                         [candidates[p] for p in positions], n_tall, n_cafe)
+                if len(heap) < top_k:
+                    heapq.heappush(heap, entry)
+                elif entry[:5] > heap[0][:5]:
+                    heapq.heapreplace(heap, entry)
+                else:
+                    return True
+                if len(heap) == top_k:
+                    bound[0] = self._remaining_window(heap[0][0], -heap[0][1])
+                return True
+
+            search_combinations(widths, effective - cabinet_width, max_appliances, visit, lambda: bound[0])
+
+        return [
+            self._build_combination(index, ordinals, n_tall, n_cafe, effective, total_height, score)
+            for score, *_, ordinals, n_tall, n_cafe in sorted(heap, key=lambda e: e[:5], reverse=True)
+        ]
+
+    def _build_combination(
+        self,
+        index: FridgeCatalogIndex,
+        ordinals: List[int],
+        n_tall: int,
+        n_cafe: int,
+        effective: float,
+        total_height: float,
+        score: float
+    ) -> Dict[str, Any]:
+        """조합 추천 결과 레코드 생성"""
+        appliances = [{**index.records[n], "needed_width": index.needed[n]} for n in ordinals]
+        cabinets = (
+            [{"type": "tall", "name": "키큰장", "width": self.rules["EL_W"]}] * n_tall
+            + [{"type": "homecafe", "name": "홈카페장", "width": self.rules["HOMECAFE_W"]}] * n_cafe
+        )
+        appliance_width = sum(a["needed_width"] for a in appliances)
+        cabinet_width = sum(c["width"] for c in cabinets)
+        remaining = effective - appliance_width - cabinet_width
 
-            for cat_name, models in self.data[b]["categories"].items():
-                for model in models:
-                    # 냉장고 필요 너비 (측면 여유 포함)
-                    needed_width = model["w"] + (model["side_gap"] * 2)
-
-                    # 높이 체크
-                    if model["h"] > total_height - 100:  # 상부장 최소 공간
-                        continue
-
-                    if needed_width <= fridge_space:
-                        remaining = fridge_space - needed_width
-
-                        # 상부장 높이 계산
-                        molding_h = self.rules["MOLDING_H"]
-                        top_gap = self.rules["TOP_GAP"]
-                        upper_h = min(
-                            self.rules["MAX_UPPER_H"],
-                            total_height - model["h"] - top_gap - molding_h
-                        )
-
-                        recommendations.append({
-                            **model,
-                            "brand": b,
-                            "category": cat_name,
-                            "needed_width": needed_width,
-                            "remaining_space": remaining,
-                            "can_add_tall": remaining >= 500 and not include_tall,
-                            "recommended_upper_h": upper_h,
-                            "score": self._calc_score(remaining, model, total_width)
-                        })
-
-        # 점수순 정렬
-        recommendations.sort(key=lambda x: x["score"], reverse=True)
-
-        return recommendations[:5]
+        # 상부장 높이는 가장 높은 모델 기준
+        upper_h = min(
+            self.rules["MAX_UPPER_H"],
+            total_height - max(a["h"] for a in appliances) - self.rules["TOP_GAP"] - self.rules["MOLDING_H"]
+        )
+
+        return {
+            "appliances": appliances,
+            "cabinets": [dict(c) for c in cabinets],
+            "appliance_width": appliance_width,
+            "cabinet_width": cabinet_width,
+            "used_width": appliance_width + cabinet_width,
+            "remaining_space": remaining,
+            "is_optimal": 4 <= remaining <= 10,
+            "recommended_upper_h": upper_h,
+            "score": score
+        }
+
+    def _rank_heap(
+        self,
+        index: FridgeCatalogIndex,
+        fridge_space: float,
+        total_width: float,
+        total_height: float,
+        brand: Optional[str],
+        top_k: int
+    ) -> List[int]:
+        """
+        상위 k개 레코드 번호 (힙)
+        - 잔여 공간이 작은 순으로 훑다가 점수 상한이 k번째 점수보다 낮아지면 중단
+        """
+        brand_set = set(index.by_brand.get(brand, [])) if brand else None
+        max_model_h = total_height - 100  # 상부장 최소 공간
+
+        # (점수, -카탈로그 번호) 최소 힙 → 같은 점수면 카탈로그 앞쪽 우선
+        heap: List[tuple] = []
+        fits = index.needed_at_most(fridge_space)
+        for n in reversed(fits):
+            remaining = fridge_space - index.needed[n]
+            if len(heap) == top_k and self._score_upper_bound(remaining) < heap[0][0]:
+                break
+
+            if brand_set is not None and n not in brand_set:
+                continue
+            record = index.records[n]
+            if record["h"] > max_model_h:
+                continue
+
+            entry = (self._calc_score(remaining, record, total_width), -n)
+            if len(heap) < top_k:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+
+        return [-neg_n for _, neg_n in sorted(heap, reverse=True)]
+
+    def _build_recommendation(
+        self,
+        index: FridgeCatalogIndex,
+        n: int,
+        fridge_space: float,
+        total_width: float,
+        total_height: float,
+        include_tall: bool
+    ) -> Dict[str, Any]:
+        """추천 결과 레코드 생성"""
+        record = index.records[n]
+        needed_width = index.needed[n]
+        remaining = fridge_space - needed_width
+
+        # 상부장 높이 계산
+        upper_h = min(
+            self.rules["MAX_UPPER_H"],
+            total_height - record["h"] - self.rules["TOP_GAP"] - self.rules["MOLDING_H"]
+        )
+
+        return {
+            **record,
+            "needed_width": needed_width,
+            "remaining_space": remaining,
+            "can_add_tall": remaining >= 500 and not include_tall,
+            "recommended_upper_h": upper_h,
+            "score": self._calc_score(remaining, record, total_width)
+        }
 
     def _calc_score(self, remaining: float, model: dict, total_width: float) -> float:
         """추천 점수 계산"""
@@ -187,6 +475,49 @@ class FridgeLookup:
 
         return max(0, score)
 
+    def _score_upper_bound(self, remaining: float) -> float:
+        """
+        잔여 공간이 remaining 이상인 모델이 받을 수 있는 최대 점수 (_calc_score 기준)
+        - 잔여 10mm 이하: 130 + 보너스 최대 25
+        - 그 외 잔여가 클수록 감소
+        """
+        if remaining <= 10:
+            base = 130
+        elif remaining <= 20:
+            base = 120
+        elif remaining <= 50:
+            base = 110
+        else:
+            base = 100 - (remaining - 50) / 10
+        return max(0, base + 25)
+
+    def _max_remaining_for(self, score: float) -> float:
+        """점수 상한(_score_upper_bound)이 score 이상인 최대 잔여 공간"""
+        if score <= 0:
+            return float("inf")
+        if score > 155:
+            return -1
+        if score > 145:
+            return 10
+        if score > 135:
+            return 20
+        if score > 125:
+            return 50
+        return 50 + (125 - score) * 10
+
+    def _remaining_window(self, score: float, remaining: float) -> tuple:
+        """
+        (score, remaining) 결과를 이길 수 있는 잔여 공간 범위 (최소, 최대)
+
+        - 점수 상한이 score보다 크거나
+        - 상한이 score와 같고 잔여 공간이 remaining보다 작음 (평균 점수 부동소수 오차 허용)
+        - 잔여 4mm 미만은 최적 구간(4~10mm)이 아니라 상한이 145
+        """
+        above = self._max_remaining_for(score + 1e-6)
+        at_least = self._max_remaining_for(score - 1e-9)
+        min_remaining = 4 if score - 1e-9 > 145 else 0
+        return min_remaining, max(above, min(at_least, remaining - 1e-9))
+
     def calculate_fridge_layout(
         self,
         model_id: str,
@@ -0,0 +1,193 @@
+"""
+냉장고 모델 검색 인덱스 - 문자 n-gram / 접두어 기반 퍼지 검색
+"""
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+from typing import List, Dict, Tuple
+
+from .fridge_index import FridgeCatalogIndex
+
+# 검색 필드별 가중치 (모델명 > ID > 카테고리 > 유닛 > 브랜드)
+FIELD_WEIGHTS = {
+    "name": 1.0,
+    "id": 0.9,
+    "category": 0.8,
+    "unit": 0.7,
+    "brand": 0.6,
+}
+
+_STRIP = re.compile(r"[\s\-_/()&+.,]+")
+
+
+def normalize(text: str) -> str:
+    """검색용 정규화 - NFKC, 소문자, 공백/구분자 제거 ("김치 냉장고" == "김치냉장고")"""
+    return _STRIP.sub("", unicodedata.normalize("NFKC", text).lower())
+
+
+def _grams(text: str) -> List[str]:
+    """문자 n-gram (한 글자면 unigram, 그 외 bigram)"""
+    if len(text) <= 1:
+        return [text] if text else []
+    return list(dict.fromkeys(text[i:i + 2] for i in range(len(text) - 1)))
+
+
+class FridgeSearchIndex:
+    """
+    카탈로그 검색 인덱스 (카탈로그 로드 시 1회 구축)
+
+    - n-gram 포스팅: gram → [(레코드 번호, 필드 번호)]
+    - 접두어 배열: 정렬된 (용어, 레코드 번호, 필드 번호) - bisect 접두어 조회
+    - 질의는 질의 gram의 포스팅만 확인하므로 카탈로그 크기에 비례하지 않음
+    """
+
+    def __init__(self, index: FridgeCatalogIndex, brand_names: Dict[str, str] = None):
+        self.index = index
+        self.fields: List[Tuple[int, str, str]] = []      # (레코드 번호, 필드명, 정규화 텍스트)
+        self.field_grams: List[int] = []                  # 필드별 gram 개수
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+        self.unigrams: Dict[str, List[int]] = defaultdict(list)
+        terms: List[Tuple[str, int]] = []
+
+        for n, record in enumerate(index.records):
+            values = [
+                ("name", record["name"]),
+                ("id", record["id"]),
+                ("category", record["category"]),
+                ("brand", record["brand"]),
+            ]
+            if brand_names and brand_names.get(record["brand"]):
+                values.append(("brand", brand_names[record["brand"]]))
+            values.extend(("unit", u["name"]) for u in record.get("units", []))
+
+            for field, raw in dict.fromkeys(values):
+                text = normalize(raw)
+                if not text:
+                    continue
+                f = len(self.fields)
+                self.fields.append((n, field, text))
+
+                grams = _grams(text)
+                self.field_grams.append(len(grams))
+                for gram in grams:
+                    self.postings[gram].append(f)
+                for ch in set(text):
+                    self.unigrams[ch].append(f)
+
+                # 접두어 용어: 필드 전체 + 공백 단위 토큰
+                terms.append((text, f))
+                for token in raw.split():
+                    token = normalize(token)
+                    if token and token != text:
+                        terms.append((token, f))
+
+        terms.sort()
+        self.terms = [t for t, _ in terms]
+        self.term_fields = [f for _, f in terms]
+
+    def _score_term(self, q: str, min_score: float) -> Dict[int, float]:
+        """
+        정규화된 검색어 하나의 레코드별 점수
+
+        점수 = 필드 가중치 × (Dice 유사도 + 부분 문자열 1.0 + 접두어 0.5)
+        부분 문자열이 일치하는 필드는 min_score와 관계없이 항상 포함된다.
+        """
+        q_grams = _grams(q)
+        postings = self.unigrams if len(q) == 1 else self.postings
+
+        # 질의 gram이 나타나는 필드만 집계
+        matched: Dict[int, int] = defaultdict(int)
+        for gram in q_grams:
+            for f in postings.get(gram, ()):
+                matched[f] += 1
+
+        best: Dict[int, float] = {}
+        for f, common in matched.items():
+            n, field, text = self.fields[f]
+            n_field = 1 if len(q) == 1 else self.field_grams[f]
+            score = 2 * common / (len(q_grams) + n_field)
+            if q in text:
+                score += 1.0
+                if text.startswith(q):
+                    score += 0.5
+            elif score < min_score:
+                continue
+            score *= FIELD_WEIGHTS[field]
+            if score > best.get(n, 0):
+                best[n] = score
+        return best
+
+    def search(self, query: str, limit: int = None, min_score: float = 0.3) -> List[Tuple[int, float]]:
+        """
+        퍼지 검색
+
+        - 검색어 전체 점수와 띄어쓰기 단위 토큰 평균 점수 중 큰 값
+          ("김치 냉장고"는 "김치냉장고"로도, "김치" + "냉장고"로도 비교)
+
+        Returns:
+            [(레코드 번호, 점수)] 점수 내림차순 → 카탈로그 순서
+        """
+        q = normalize(query or "")
+        if not q:
+            # 구분자만 있는 검색어 ("+", "-" 등)는 정규화하면 비므로 원문 부분 문자열 비교
+            return self._substring(query) if query else []
+
+        scores = self._score_term(q, min_score)
+
+        tokens = [t for t in dict.fromkeys(normalize(t) for t in query.split()) if t]
+        if len(tokens) > 1:
+            combined: Dict[int, float] = defaultdict(float)
+            for token in tokens:
+                for n, score in self._score_term(token, min_score).items():
+                    combined[n] += score / len(tokens)
+            for n, score in combined.items():
+                if score >= min_score and score > scores.get(n, 0):
+                    scores[n] = score
+
+        ranked = sorted(scores.items(), key=lambda x: (-x[1], x[0]))
+        return ranked[:limit] if limit else ranked
+
+    def _substring(self, query: str) -> List[Tuple[int, float]]:
+        """원문 부분 문자열 검색 (모델명/ID/카테고리, 대소문자 무시), 카탈로그 순서"""
+        q = query.lower()
+        return [
+            (n, FIELD_WEIGHTS["name"])
+            for n, record in enumerate(self.index.records)
+            if q in record["name"].lower() or q in record["id"].lower() or q in record["category"].lower()
+        ]
+
+    def prefix(self, query: str, limit: int = 10) -> List[Tuple[int, float]]:
+        """
+        접두어 검색 (정렬 용어 배열 bisect)
+
+        Returns:
+            [(레코드 번호, 필드 가중치)] 가중치 내림차순 → 카탈로그 순서
+        """
+        q = normalize(query or "")
+        if not q:
+            return []
+
+        best: Dict[int, float] = {}
+        i = bisect_left(self.terms, q)
+        while i < len(self.terms) and self.terms[i].startswith(q):
+            n, field, _ = self.fields[self.term_fields[i]]
+            weight = FIELD_WEIGHTS[field]
+            if weight > best.get(n, 0):
+                best[n] = weight
+            i += 1
+
+        ranked = sorted(best.items(), key=lambda x: (-x[1], x[0]))
+        return ranked[:limit]
+
+    def autocomplete(self, query: str, limit: int = 8) -> List[Tuple[int, float]]:
+        """자동완성 - 접두어 일치 우선, 부족하면 퍼지 결과로 채움"""
+        results = [(n, 2.0 + w) for n, w in self.prefix(query, limit)]
+        if len(results) < limit:
+            seen = {n for n, _ in results}
+            for n, score in self.search(query):
+                if n not in seen:
+                    results.append((n, score))
+                    if len(results) >= limit:
+                        break
+        return results
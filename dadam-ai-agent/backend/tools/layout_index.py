@@ -0,0 +1,297 @@
+"""
+증분 레이아웃 도구 - 드래그 편집용 고정 모듈 구간 인덱스
+"""
+from bisect import bisect_left
+from typing import List, Dict, Any, Optional, Tuple
+
+from .module_optimizer import ModuleOptimizer
+
+
+class FixedModuleIndex:
+    """
+    고정 모듈 구간 인덱스 (시작 위치 정렬 배열 + bisect)
+
+    모듈끼리 겹치지 않는 상태를 유지하므로 시작 위치 순서가 곧 구간 순서다.
+    """
+
+    def __init__(self):
+        self._starts: List[float] = []
+        self._ids: List[str] = []
+        self.modules: Dict[str, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _position(self, module_id: str) -> int:
+        """모듈의 정렬 위치"""
+        x = self.modules[module_id]["x"]
+        i = bisect_left(self._starts, x)
+        while self._ids[i] != module_id:
+            i += 1
+        return i
+
+    def find_overlaps(self, x: float, width: float, exclude: str = None) -> List[str]:
+        """[x, x + width) 구간과 겹치는 모듈 ID"""
+        end = x + width
+        overlaps = []
+
+        # 왼쪽에서 시작해 x를 넘어오는 모듈 (겹침이 없으므로 최대 1개)
+        i = bisect_left(self._starts, x)
+        if i > 0:
+            prev_id = self._ids[i - 1]
+            prev = self.modules[prev_id]
+            if prev_id != exclude and prev["x"] + prev["width"] > x:
+                overlaps.append(prev_id)
+
+        # 구간 안에서 시작하는 모듈
+        while i < len(self._starts) and self._starts[i] < end:
+            if self._ids[i] != exclude:
+                overlaps.append(self._ids[i])
+            i += 1
+
+        return overlaps
+
+    def insert(self, module: Dict[str, Any]):
+        """모듈 추가 (겹침 검사는 호출 전에 수행)"""
+        i = bisect_left(self._starts, module["x"])
+        self._starts.insert(i, module["x"])
+        self._ids.insert(i, module["id"])
+        self.modules[module["id"]] = module
+
+    def remove(self, module_id: str) -> Dict[str, Any]:
+        """모듈 제거"""
+        i = self._position(module_id)
+        del self._starts[i]
+        del self._ids[i]
+        return self.modules.pop(module_id)
+
+    def prev_id(self, module_id: str) -> Optional[str]:
+        """왼쪽 이웃 모듈 ID (없으면 None = 벽)"""
+        i = self._position(module_id)
+        return self._ids[i - 1] if i > 0 else None
+
+    def prev_of_position(self, x: float) -> Optional[str]:
+        """위치 x 바로 왼쪽의 모듈 ID"""
+        i = bisect_left(self._starts, x)
+        return self._ids[i - 1] if i > 0 else None
+
+    def gap_after(self, module_id: Optional[str], effective_width: float) -> Tuple[float, float]:
+        """모듈(None = 좌측 벽) 오른쪽 빈 공간 (start, end)"""
+        if module_id is None:
+            start = 0
+            i = 0
+        else:
+            module = self.modules[module_id]
+            start = module["x"] + module["width"]
+            i = self._position(module_id) + 1
+        end = self._starts[i] if i < len(self._starts) else effective_width
+        return start, end
+
+    def ordered(self) -> List[Dict[str, Any]]:
+        """x 순서의 모듈 목록"""
+        return [self.modules[i] for i in self._ids]
+
+    def gap_keys(self) -> List[Optional[str]]:
+        """모든 빈 공간 키 (왼쪽 모듈 ID, 첫 공간은 None)"""
+        return [None] + list(self._ids)
+
+
+class IncrementalLayout:
+    """
+    드래그 편집용 상태 유지 레이아웃
+
+    - 공통 도어 너비는 생성/재최적화 시 ModuleOptimizer.solve_gaps로 결정
+    - 고정 모듈 추가/이동/삭제 시 인접 빈 공간만 다시 채우고 변경분(diff)만 반환
+    """
+
+    def __init__(
+        self,
+        effective_width: float,
+        fixed_modules: List[Dict] = None,
+        section: str = "lower",
+        door_width: float = None,
+        optimizer: ModuleOptimizer = None
+    ):
+        self.effective_width = effective_width
+        self.section = section
+        self.optimizer = optimizer or ModuleOptimizer()
+        self.index = FixedModuleIndex()
+        self.fills: Dict[Optional[str], List[Dict[str, Any]]] = {}
+        self.remainders: Dict[Optional[str], float] = {}
+        self._next_fixed = 0  # 기본 ID 번호 (삭제 후에도 재사용하지 않음)
+
+        for module in sorted(fixed_modules or [], key=lambda m: m.get("x", 0)):
+            module = self._normalize(module, self._default_id())
+            if not self._within_wall(module["x"], module["width"]):
+                raise ValueError(f"고정 모듈이 벽 밖에 있습니다: {module['id']}")
+            overlaps = self.index.find_overlaps(module["x"], module["width"])
+            if overlaps:
+                raise ValueError(f"고정 모듈이 겹칩니다: {module['id']} ↔ {', '.join(overlaps)}")
+            self.index.insert(module)
+
+        calc = self.optimizer.calc
+        if door_width is not None and not calc.door_min <= door_width <= calc.door_max:
+            raise ValueError(
+                f"도어 너비는 {calc.door_min:g}~{calc.door_max:g}mm 범위여야 합니다: {door_width:g}"
+            )
+
+        self.door_width = door_width or self._solve_door_width()
+        for key in self.index.gap_keys():
+            self._fill(key)
+
+    @staticmethod
+    def _normalize(module: Dict[str, Any], default_id: str) -> Dict[str, Any]:
+        """고정 모듈 필드 정리"""
+        return {
+            **module,
+            "id": str(module.get("id") or default_id),
+            "x": module.get("x", 0),
+            "width": module.get("width", 0),
+            "is_fixed": True
+        }
+
+    def _default_id(self) -> str:
+        """다음 기본 고정 모듈 ID (fixed-N, 단조 증가)"""
+        while True:
+            module_id = f"fixed-{self._next_fixed}"
+            self._next_fixed += 1
+            if module_id not in self.index.modules:
+                return module_id
+
+    def _within_wall(self, x: float, width: float) -> bool:
+        """0 ≤ x, x + width ≤ 유효 공간"""
+        return width > 0 and x >= 0 and x + width <= self.effective_width
+
+    def _solve_door_width(self) -> float:
+        """현재 빈 공간 전체에 대한 최적 공통 도어 너비"""
+        widths = []
+        for key in self.index.gap_keys():
+            start, end = self.index.gap_after(key, self.effective_width)
+            if end - start >= 100:
+                widths.append(end - start)
+
+        alternatives = self.optimizer.solve_gaps(widths, top_k=1)
+        if alternatives:
+            return alternatives[0]["door_width"]
+        return self.optimizer.calc.distribute_modules(self.effective_width)["door_width"] or 450
+
+    def _fill(self, key: Optional[str]) -> List[Dict[str, Any]]:
+        """빈 공간 하나를 모듈로 채움"""
+        start, end = self.index.gap_after(key, self.effective_width)
+        width = end - start
+        count = int(width // self.door_width) if width >= 100 else 0
+
+        modules = self.optimizer.place_modules(start, count, self.door_width, self.section)
+        prefix = key or "start"
+        for n, m in enumerate(modules):
+            m["id"] = f"{prefix}:{n}"
+
+        self.fills[key] = modules
+        self.remainders[key] = width - count * self.door_width
+        return modules
+
+    def _refill(self, keys) -> Dict[str, List]:
+        """지정한 빈 공간만 다시 채우고 변경분 계산"""
+        before: Dict[str, Dict[str, Any]] = {}
+        after: Dict[str, Dict[str, Any]] = {}
+
+        for key in keys:
+            for m in self.fills.pop(key, []):
+                before[m["id"]] = m
+            self.remainders.pop(key, None)
+            if key is None or key in self.index.modules:
+                for m in self._fill(key):
+                    after[m["id"]] = m
+
+        return {
+            "added": [m for mid, m in after.items() if mid not in before],
+            "updated": [m for mid, m in after.items() if mid in before and before[mid] != m],
+            "removed": [mid for mid in before if mid not in after]
+        }
+
+    def _result(self, diff: Dict[str, List], **extra) -> Dict[str, Any]:
+        """변경 결과 응답"""
+        return {
+            "applied": True,
+            **extra,
+            "diff": diff,
+            "door_width": self.door_width,
+            "remaining": self.remaining(),
+        }
+
+    def insert(self, module: Dict[str, Any]) -> Dict[str, Any]:
+        """고정 모듈 추가"""
+        module = self._normalize(module, module.get("id") or self._default_id())
+        if module["id"] in self.index.modules:
+            raise ValueError(f"이미 있는 모듈입니다: {module['id']}")
+
+        if not self._within_wall(module["x"], module["width"]):
+            return {"applied": False, "out_of_bounds": True}
+        overlaps = self.index.find_overlaps(module["x"], module["width"])
+        if overlaps:
+            return {"applied": False, "overlaps": overlaps}
+
+        prev_key = self.index.prev_of_position(module["x"])
+        self.index.insert(module)
+        diff = self._refill([prev_key, module["id"]])
+        return self._result(diff, fixed=[module])
+
+    def move(self, module_id: str, x: float, width: float = None) -> Dict[str, Any]:
+        """고정 모듈 이동 (너비 변경 포함)"""
+        if module_id not in self.index.modules:
+            raise KeyError(module_id)
+
+        module = self.index.modules[module_id]
+        width = module["width"] if width is None else width
+        if not self._within_wall(x, width):
+            return {"applied": False, "out_of_bounds": True}
+        overlaps = self.index.find_overlaps(x, width, exclude=module_id)
+        if overlaps:
+            return {"applied": False, "overlaps": overlaps}
+
+        # 이전 위치의 왼쪽 공간 + 자신의 오른쪽 공간
+        old_prev = self.index.prev_id(module_id)
+        self.index.remove(module_id)
+
+        moved = {**module, "x": x, "width": width}
+        new_prev = self.index.prev_of_position(x)
+        self.index.insert(moved)
+
+        # 이전 위치의 오른쪽 공간은 old_prev 공간으로 합쳐짐
+        diff = self._refill(dict.fromkeys([old_prev, new_prev, module_id]))
+        return self._result(diff, fixed=[moved])
+
+    def remove(self, module_id: str) -> Dict[str, Any]:
+        """고정 모듈 삭제"""
+        if module_id not in self.index.modules:
+            raise KeyError(module_id)
+
+        prev_key = self.index.prev_id(module_id)
+        self.index.remove(module_id)
+        diff = self._refill([prev_key, module_id])
+        return self._result(diff, removed_fixed=[module_id])
+
+    def reoptimize(self) -> Dict[str, Any]:
+        """공통 도어 너비를 다시 구하고 전체 빈 공간 재계산 (드래그 종료 시)"""
+        self.door_width = self._solve_door_width()
+        diff = self._refill(list(self.fills.keys()))
+        return self._result(diff)
+
+    def remaining(self) -> float:
+        """전체 잔여 공간"""
+        return sum(self.remainders.values())
+
+    def snapshot(self) -> Dict[str, Any]:
+        """전체 레이아웃 (optimize_layout과 같은 형식)"""
+        modules = self.index.ordered()
+        for filled in self.fills.values():
+            modules.extend(filled)
+        modules.sort(key=lambda m: m.get("x", 0))
+
+        remaining = self.remaining()
+        return {
+            "modules": modules,
+            "door_width": self.door_width,
+            "remaining": remaining,
+            "is_optimal": 4 <= remaining <= 10
+        }
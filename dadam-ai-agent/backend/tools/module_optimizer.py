@@ -3,20 +3,29 @@
 """
 from typing import List, Dict, Any, Optional
 from .dimension_calc import DimensionCalculator
-from data.constants import DOOR_TARGET_WIDTH, DOOR_MAX_WIDTH, DOOR_MIN_WIDTH
+from .distribution_table import get_distribution_table
+from .calc_cache import get_calc_cache
+
+
+SOLVERS = ("exact", "greedy")
 
 
 class ModuleOptimizer:
     """모듈 배치 최적화 도구"""
 
     def __init__(self):
-        self.calc = DimensionCalculator()
+        self.calc = DimensionCalculator(
+            lookup_table=get_distribution_table(),
+            cache=get_calc_cache()
+        )
 
     def optimize_layout(
         self,
         effective_width: float,
         fixed_modules: List[Dict] = None,
-        section: str = "lower"
+        section: str = "lower",
+        solver: str = "exact",
+        top_k: int = 3
     ) -> Dict[str, Any]:
         """
         고정 모듈 주변 빈 공간을 최적 모듈로 채움
@@ -25,7 +34,15 @@ class ModuleOptimizer:
             effective_width: 유효 공간 너비
             fixed_modules: 고정 모듈 리스트 [{"x": 시작위치, "width": 너비, ...}]
             section: "upper" | "lower"
+            solver: "exact" (공통 도어 너비 전역 최적) | "greedy" (기존 방식)
+            top_k: exact 모드 대안 개수
+
+        Raises:
+            ValueError: 알 수 없는 solver
         """
+        if solver not in SOLVERS:
+            raise ValueError(f"알 수 없는 solver입니다: {solver} (exact | greedy)")
+
         if not fixed_modules:
             # 고정 모듈 없으면 전체 공간 분배
             result = self.calc.distribute_modules(effective_width)
@@ -50,30 +67,10 @@ class ModuleOptimizer:
 
         # 고정 모듈 정렬
         sorted_fixed = sorted(fixed_modules, key=lambda m: m.get("x", 0))
+        gaps = self._find_gaps(effective_width, sorted_fixed)
 
-        # 빈 공간(Gap) 계산
-        gaps = []
-        cursor = 0
-
-        for fixed in sorted_fixed:
-            fixed_x = fixed.get("x", 0)
-            fixed_w = fixed.get("width", 0)
-
-            if fixed_x > cursor:
-                gaps.append({
-                    "start": cursor,
-                    "end": fixed_x,
-                    "width": fixed_x - cursor
-                })
-            cursor = fixed_x + fixed_w
-
-        # 마지막 공간
-        if cursor < effective_width:
-            gaps.append({
-                "start": cursor,
-                "end": effective_width,
-                "width": effective_width - cursor
-            })
+        if solver == "exact":
+            return self._optimize_exact(gaps, sorted_fixed, section, top_k)
 
         # 전체 빈 공간의 도어 너비 통일 계산
         total_gap_width = sum(g["width"] for g in gaps if g["width"] >= 100)
@@ -82,7 +79,7 @@ class ModuleOptimizer:
             base_result = self.calc.distribute_modules(total_gap_width)
             unified_door_width = base_result["door_width"]
         else:
-            unified_door_width = DOOR_TARGET_WIDTH
+            unified_door_width = self.calc.door_target
 
         # 각 Gap을 모듈로 채우기
         all_modules = []
@@ -119,6 +116,189 @@ class ModuleOptimizer:
             "is_optimal": 4 <= total_remaining <= 10
         }
 
+    def _find_gaps(self, effective_width: float, sorted_fixed: List[Dict]) -> List[Dict[str, float]]:
+        """고정 모듈 사이 빈 공간(Gap) 계산"""
+        gaps = []
+        cursor = 0
+
+        for fixed in sorted_fixed:
+            fixed_x = fixed.get("x", 0)
+            fixed_w = fixed.get("width", 0)
+
+            if fixed_x > cursor:
+                gaps.append({
+                    "start": cursor,
+                    "end": fixed_x,
+                    "width": fixed_x - cursor
+                })
+            cursor = fixed_x + fixed_w
+
+        # 마지막 공간
+        if cursor < effective_width:
+            gaps.append({
+                "start": cursor,
+                "end": effective_width,
+                "width": effective_width - cursor
+            })
+
+        return gaps
+
+    def solve_gaps(self, gap_widths: List[float], top_k: int = 3) -> List[Dict[str, Any]]:
+        """
+        여러 빈 공간에 대한 공통 도어 너비 전역 최적화
+
+        공통 너비 w가 정해지면 각 Gap의 잔여는 도어 개수 floor(g / w)에서 최소(≥0)가 되고
+        도어를 하나 줄이면 잔여가 w(≥350mm)만큼 늘어나므로, 최적해는
+        (후보 너비 × Gap) 전수 평가로 정확히 구해진다. 어떤 Gap도 넘치지 않는다.
+
+        정렬:
+            1. 도어를 하나도 넣을 수 없는 Gap 수가 적은 순
+            2. 전체 잔여 4~10mm 우선 → 목표 너비(450mm)에 가까운 순
+            3. 그 외: 전체 잔여 작은 순 → 목표 너비에 가까운 순
+            4. 10단위 너비 우선
+
+        Args:
+            gap_widths: 채울 빈 공간 너비 목록 (100mm 이상)
+            top_k: 반환할 대안 개수
+
+        Returns:
+            [{"door_width", "door_counts", "remainders", "remaining", "infeasible_gaps", "is_optimal"}]
+            infeasible_gaps: 도어를 넣을 수 없는 (공통 너비보다 좁은) Gap 수
+        """
+        if not gap_widths:
+            return []
+
+        # 호출 중 재로드돼도 한 스냅샷 기준으로 계산
+        c = self.calc.calc_constants
+
+        # 후보 너비: 최소~최대 도어 너비의 짝수 (find_best_door_width 후보와 같은 단위)
+        first = c.door_min + (c.door_min % 2)
+        candidates = range(int(first), int(c.door_max) + 1, 2)
+
+        scored = []
+        for width in candidates:
+            counts = []
+            remainders = []
+            infeasible = 0
+            for g in gap_widths:
+                count = int(g // width)
+                counts.append(count)
+                remainders.append(g - count * width)
+                if count < 1:
+                    infeasible += 1
+
+            total = sum(remainders)
+            in_window = c.min_remainder <= total <= c.max_remainder
+            target_diff = abs(width - c.door_target)
+            key = (
+                infeasible,
+                not in_window,
+                target_diff if in_window else total,
+                total if in_window else target_diff,
+                0 if width % 10 == 0 else 1
+            )
+            scored.append((key, width, counts, remainders, total, infeasible, in_window))
+
+        scored.sort(key=lambda x: x[0])
+
+        return [
+            {
+                "door_width": width,
+                "door_counts": counts,
+                "remainders": remainders,
+                "remaining": total,
+                "infeasible_gaps": infeasible,
+                "is_optimal": infeasible == 0 and in_window
+            }
+            for _, width, counts, remainders, total, infeasible, in_window in scored[:max(1, top_k)]
+        ]
+
+    def _optimize_exact(
+        self,
+        gaps: List[Dict[str, float]],
+        sorted_fixed: List[Dict],
+        section: str,
+        top_k: int
+    ) -> Dict[str, Any]:
+        """전역 최적 공통 도어 너비로 모든 Gap 채우기"""
+        fill_gaps = [g for g in gaps if g["width"] >= 100]
+        small_remaining = sum(g["width"] for g in gaps if g["width"] < 100)
+
+        alternatives = self.solve_gaps([g["width"] for g in fill_gaps], top_k)
+
+        all_modules = []
+        if alternatives:
+            best = alternatives[0]
+            door_width = best["door_width"]
+            for gap, count in zip(fill_gaps, best["door_counts"]):
+                all_modules.extend(self.place_modules(gap["start"], count, door_width, section))
+            total_remaining = best["remaining"] + small_remaining
+        else:
+            door_width = self.calc.door_target
+            total_remaining = small_remaining
+
+        # 고정 모듈 추가
+        for fixed in sorted_fixed:
+            all_modules.append({
+                **fixed,
+                "is_fixed": True
+            })
+
+        # x 위치로 정렬
+        all_modules.sort(key=lambda m: m.get("x", 0))
+
+        # 100mm 미만 빈 공간까지 더한 잔여로 최적 여부 다시 판정 (대안도 같은 기준)
+        c = self.calc.calc_constants
+        adjusted = []
+        for alt in alternatives:
+            remaining = alt["remaining"] + small_remaining
+            adjusted.append({
+                **alt,
+                "remaining": remaining,
+                "is_optimal": alt["infeasible_gaps"] == 0 and c.min_remainder <= remaining <= c.max_remainder
+            })
+
+        return {
+            "modules": all_modules,
+            "door_width": door_width,
+            "remaining": total_remaining,
+            "is_optimal": c.min_remainder <= total_remaining <= c.max_remainder,
+            "alternatives": adjusted
+        }
+
+    def place_modules(
+        self,
+        start_x: float,
+        door_count: int,
+        door_width: float,
+        section: str
+    ) -> List[Dict[str, Any]]:
+        """도어 개수만큼 2D/1D 모듈 배치 (도어개수/2 → 몫*2D, 나머지*1D)"""
+        label = "상부" if section == "upper" else "하부"
+        modules = []
+        x = start_x
+
+        for _ in range(door_count // 2):
+            modules.append({
+                "type": "storage",
+                "name": f"{label}장(2D)",
+                "x": x,
+                "width": door_width * 2,
+                "is_2d": True
+            })
+            x += door_width * 2
+
+        if door_count % 2 > 0:
+            modules.append({
+                "type": "storage",
+                "name": f"{label}장(1D)",
+                "x": x,
+                "width": door_width,
+                "is_2d": False
+            })
+
+        return modules
+
     def _fill_gap(
         self,
         start_x: float,
@@ -133,11 +313,11 @@ class ModuleOptimizer:
 
         # 도어 제약 확인
         actual_door_width = door_width
-        if door_width < DOOR_MIN_WIDTH:
-            door_count = max(1, int(width / DOOR_MIN_WIDTH))
+        if door_width < self.calc.door_min:
+            door_count = max(1, int(width / self.calc.door_min))
             actual_door_width = width / door_count
-        elif door_width > DOOR_MAX_WIDTH:
-            door_count = int(width / DOOR_MAX_WIDTH + 0.999)
+        elif door_width > self.calc.door_max:
+            door_count = int(width / self.calc.door_max + 0.999)
             actual_door_width = width / door_count
 
         quotient = door_count // 2
@@ -181,7 +361,7 @@ class ModuleOptimizer:
         """현재 레이아웃 개선 제안"""
         suggestions = []
         remaining = current_layout.get("remaining", 0)
-        door_width = current_layout.get("door_width", DOOR_TARGET_WIDTH)
+        door_width = current_layout.get("door_width", self.calc.door_target)
         modules = current_layout.get("modules", [])
 
         # 잔여 공간 체크
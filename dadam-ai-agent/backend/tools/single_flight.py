@@ -0,0 +1,84 @@
+"""
+동시 요청 병합 (single-flight) - 같은 계산이 진행 중이면 새로 시작하지 않고 결과를 기다림
+
+- 키: (이름공간, 정규화된 요청). 진행 중인 동안만 공유하고 완료되면 바로 제거 (결과 캐시 아님)
+- 실행은 별도 태스크로 돌려, 기다리던 요청 하나가 취소돼도 나머지 요청은 결과를 받는다
+- 예외도 기다리던 요청 모두에게 그대로 전달
+- 이벤트 루프 스레드에서만 호출 (락 없음)
+"""
+import os
+import json
+import asyncio
+from typing import Dict, Any, Callable, Awaitable, Hashable, Optional, Tuple
+
+
+def canonical_key(value: Any) -> str:
+    """요청 본문/파라미터 정규화 JSON (키 정렬)"""
+    return json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+class SingleFlight:
+    """진행 중인 동일 요청 병합 + 이름공간별 실행/병합 횟수 집계"""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._calls: Dict[Tuple[str, Hashable], asyncio.Future] = {}
+        self.executions: Dict[str, int] = {}
+        self.coalesced: Dict[str, int] = {}
+
+    async def do(self, namespace: str, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        key에 해당하는 계산이 진행 중이면 그 결과를, 아니면 fn()을 실행해 결과 반환
+
+        반환값은 기다린 요청들이 공유하므로 읽기 전용으로 다룬다.
+        """
+        if not self.enabled:
+            return await fn()
+
+        call_key = (namespace, key)
+        task = self._calls.get(call_key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[call_key] = task
+            task.add_done_callback(lambda done: self._finish(call_key, done))
+            self.executions[namespace] = self.executions.get(namespace, 0) + 1
+        else:
+            self.coalesced[namespace] = self.coalesced.get(namespace, 0) + 1
+
+        return await asyncio.shield(task)
+
+    def _finish(self, call_key: Tuple[str, Hashable], task: asyncio.Future):
+        if self._calls.get(call_key) is task:
+            del self._calls[call_key]
+        # 기다리던 요청이 모두 취소된 경우 미확인 예외 경고 방지
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        """병합 통계 (coalesced = 새로 실행하지 않고 진행 중인 결과를 받은 요청 수)"""
+        namespaces = sorted(set(self.executions) | set(self.coalesced))
+        return {
+            "enabled": self.enabled,
+            "in_flight": len(self._calls),
+            "executions": sum(self.executions.values()),
+            "coalesced": sum(self.coalesced.values()),
+            "routes": {
+                name: {
+                    "executions": self.executions.get(name, 0),
+                    "coalesced": self.coalesced.get(name, 0)
+                }
+                for name in namespaces
+            }
+        }
+
+
+# 공유 인스턴스 (라우터 간 공유)
+_shared: Optional[SingleFlight] = None
+
+
+def get_single_flight() -> SingleFlight:
+    """프로세스 공유 요청 병합기 (SINGLE_FLIGHT=false면 병합 없이 바로 실행)"""
+    global _shared
+    if _shared is None:
+        _shared = SingleFlight(enabled=os.getenv("SINGLE_FLIGHT", "true").lower() in ("1", "true", "yes"))
+    return _shared